@@ -0,0 +1,574 @@
+# %%
+# Motor "lockstep" por lotes para TacoRescue.
+# Mantiene B partidas a la vez como arreglos apilados de numpy y aplica las
+# mismas reglas que tacosim con RandomPolicy sobre la dimensión del
+# lote, de modo que una evaluación Monte Carlo no requiere un TacoRescueModel
+# de Python por partida. En el tablero de 8x6 corre unas 13k-15k partidas/s
+# en un núcleo con lotes de 10000 (lo logrado, no las decenas de miles que
+# se buscaban); el resto del tiempo es costo fijo de numpy por llamada.
+#
+# Convenciones de índices (iguales al modelo original):
+#   fire         (B, W, H)     -> fire[b, x, y]
+#   poi          (B, W, H)     -> poi[b, x, y]
+#   walls        (B, H, W, 4)  -> walls[b, y, x, pared]
+#   walls_damage (B, W, H, 4)  -> walls_damage[b, x, y, pared]
+#   doors        (B, H, W, 4)  -> doors[b, y, x, pared] (puerta en esa arista)
+# Paredes: [arriba (dy=+1), derecha (dx=+1), abajo (dy=-1), izquierda (dx=-1)]
+
+import time
+
+import numpy as np
+
+# Mapas compartidos con tacosim.TacoRescueModel
+from tacosim.maps import default_map
+
+# %%
+# Direcciones en el mismo orden que usan los agentes y el fuego:
+# (0, 1), (0, -1), (1, 0), (-1, 0)
+DX = np.array([0, 0, 1, -1])
+DY = np.array([1, -1, 0, 0])
+WALL = np.array([0, 2, 1, 3])
+OPP = np.array([2, 0, 3, 1])
+
+
+# Cuenta, por fila del lote, cuántas entradas de 'b' cumplen 'mask'
+def _count(b, mask, n):
+  return np.bincount(b, weights=mask, minlength=n).astype(np.int32)
+
+
+# %%
+class TacoRescueBatch:
+  def __init__(self, batch_size, width=8, height=6, players=6, seed=None, max_steps=None, metrics=None,
+               board_map=None):
+    if board_map is None:
+      if (width, height) != (8, 6):
+        raise ValueError(f"No hay mapa para un tablero de {width}x{height}; "
+                         "pasa board_map=tacosim.maps.load_map(...)")
+      board_map = default_map()
+    self.board_map = board_map
+    width, height = board_map.width, board_map.height
+    self.width = width
+    self.height = height
+    self.players = players
+    self.max_steps = max_steps
+    self.rng = np.random.default_rng(seed)
+
+    B, W, H = batch_size, width, height
+    self.size = B
+    self.steps = 0
+    self.current_index = 0
+
+    # Identificador de la partida que ocupa cada fila; las filas de partidas
+    # terminadas se compactan para no seguir pagando su costo.
+    self.ids = np.arange(B)
+    self.alive = np.ones(B, dtype=bool)
+    self.remaining = B
+
+    walls = board_map.walls.astype(np.int8)
+    self.walls = np.repeat(walls[None], B, axis=0)
+    # Espejo de aristas abiertas con el lote como último eje (4, W, H, B);
+    # se mantiene junto con 'walls' en _remove_walls y lo usa el flashover.
+    self.open = np.ascontiguousarray((self.walls == 0).transpose(3, 2, 1, 0))
+    self.walls_damage = np.zeros((B, W, H, 4), dtype=np.int8)
+
+    doors = np.zeros((H, W, 4), dtype=bool)
+    for (x1, y1, x2, y2) in board_map.doors_pos:
+      d = self._direction(x2 - x1, y2 - y1)
+      doors[y1, x1, WALL[d]] = True
+      doors[y2, x2, OPP[d]] = True
+    self.doors = np.repeat(doors[None], B, axis=0)
+
+    fire = np.zeros((W, H), dtype=np.int8)
+    for (x, y) in board_map.fire_pos:
+      fire[x, y] = 2
+    self.fire = np.repeat(fire[None], B, axis=0)
+
+    poi = np.zeros((W, H), dtype=np.int8)
+    for (x, y) in board_map.victims:
+      poi[x, y] = 1
+    for (x, y) in board_map.false_alarms:
+      poi[x, y] = 2
+    self.poi = np.repeat(poi[None], B, axis=0)
+
+    # Contadores por partida
+    self.damage = np.zeros(B, dtype=np.int32)
+    self.rescued_count = np.zeros(B, dtype=np.int32)
+    self.lost_victims = np.zeros(B, dtype=np.int32)
+    self.victims_count = np.full(B, board_map.total_victims - len(board_map.victims), dtype=np.int32)
+    self.false_alarms_count = np.full(B, board_map.total_false_alarms - len(board_map.false_alarms),
+                                      dtype=np.int32)
+    self.victims_on_board = np.zeros(B, dtype=np.int32)
+    self.poi_count = np.full(B, len(board_map.victims) + len(board_map.false_alarms), dtype=np.int32)
+
+    # Agentes: posición, AP y si cargan víctima
+    self.pos = np.zeros((B, players, 2), dtype=np.int32)
+    start = board_map.start_entries
+    for i in range(players):
+      self.pos[:, i] = board_map.entries[start[i % len(start)]]
+    self.AP = np.zeros((B, players), dtype=np.int32)
+    self.carrying = np.zeros((B, players), dtype=bool)
+
+    # Tablas derivadas del mapa: entradas y entrada más cercana por celda
+    self.is_entry = np.zeros((W, H), dtype=bool)
+    for (x, y) in board_map.entries:
+      self.is_entry[x, y] = True
+    self.nearest_entry = np.array(board_map.nearest_entry, dtype=np.int32)
+
+    # Resultados por partida (se llenan al terminar cada una)
+    self.results = {
+      "rescued": np.zeros(B, dtype=np.int32),
+      "lost": np.zeros(B, dtype=np.int32),
+      "damage": np.zeros(B, dtype=np.int32),
+      "steps": np.zeros(B, dtype=np.int32),
+      "finished": np.zeros(B, dtype=bool),
+    }
+    self._finish()
+
+    # Instrumentación opcional por fase (tacosim.metrics.Metrics)
+    self.metrics = None
+    if metrics is not None:
+      metrics.instrument_batch(self)
+
+  # Método que devuelve el índice de dirección para (dx, dy)
+  @staticmethod
+  def _direction(dx, dy):
+    for d in range(4):
+      if DX[d] == dx and DY[d] == dy:
+        return d
+    raise ValueError(f"Dirección inválida: {(dx, dy)}")
+
+  # Método que quita paredes (o puertas) de las aristas (b, y, x, w)
+  def _remove_walls(self, b, y, x, w):
+    self.walls[b, y, x, w] = 0
+    self.open[w, x, y, b] = True
+
+  # Método que indica qué partidas siguen en juego
+  def running(self):
+    return self.remaining > 0
+
+  # Método que evalúa end_game en todas las partidas a la vez
+  def end_game(self):
+    return (self.damage >= 24) | (self.rescued_count >= 7) | (self.lost_victims >= 4)
+
+  # Método que guarda los resultados de las partidas terminadas. Las filas
+  # terminadas se siguen simulando (sin efecto en los resultados) hasta que
+  # son al menos una cuarta parte del lote; entonces se compacta.
+  def _finish(self, force=False):
+    over = self.end_game()
+    done = self.alive & (over | force)
+    if done.any():
+      ids = self.ids[done]
+      self.results["rescued"][ids] = self.rescued_count[done]
+      self.results["lost"][ids] = self.lost_victims[done]
+      self.results["damage"][ids] = self.damage[done]
+      self.results["steps"][ids] = self.steps
+      self.results["finished"][ids] = over[done]
+      self.alive &= ~done
+      self.remaining -= int(done.sum())
+
+    if self.remaining * 4 > self.size * 3:
+      return
+    keep = self.alive
+    self.open = np.ascontiguousarray(self.open[..., keep])
+    for name in ("ids", "alive", "walls", "walls_damage", "doors", "fire", "poi", "damage",
+                 "rescued_count", "lost_victims", "victims_count", "false_alarms_count",
+                 "victims_on_board", "poi_count", "pos", "AP", "carrying"):
+      setattr(self, name, getattr(self, name)[keep])
+    self.size = self.remaining
+
+  # %%
+  # --- Fuego ---
+
+  # Método que coloca fuego en las celdas (b, x, y); las víctimas se pierden
+  # y las celdas se marcan en 'burned' para noquear agentes al final.
+  def _place_fire(self, b, x, y, burned):
+    if len(b) == 0:
+      return
+    cell = (b * self.width + x) * self.height + y
+    self.fire.reshape(-1)[cell] = 2
+    poi = self.poi.reshape(-1)
+    found = poi[cell]
+    if found.any():
+      n = self.size
+      self.lost_victims += _count(b, found == 1, n)
+      self.false_alarms_count -= _count(b, found == 2, n)
+      self.poi_count -= _count(b, found != 0, n)
+      poi[cell] = 0
+    burned.reshape(-1)[cell] = True
+
+  # Método que verifica, para cada fila, si (x, y) es adyacente a fuego
+  def _adjacent_to_fire(self, b, x, y):
+    W, H = self.width, self.height
+    fire, walls = self.fire.reshape(-1), self.walls.reshape(-1)
+    result = np.zeros(len(b), dtype=bool)
+    for d in range(4):
+      nx, ny = x + DX[d], y + DY[d]
+      ok = (nx >= 0) & (nx < W) & (ny >= 0) & (ny < H)
+      ok &= walls[((b * H + y) * W + x) * 4 + WALL[d]] == 0
+      result |= ok & (fire.take((b * W + nx) * H + ny, mode="clip") == 2)
+    return result
+
+  # Método que daña paredes/puertas desde (x, y) hacia d con las reglas del modelo.
+  # Devuelve True donde la onda puede continuar ("continue").
+  def _damage_wall(self, b, x, y, d):
+    W, H = self.width, self.height
+    w, o = WALL[d], OPP[d]
+    nx, ny = x + DX[d], y + DY[d]
+    edge = ((b * H + y) * W + x) * 4 + w
+    wall = self.walls.reshape(-1)[edge] == 1
+
+    # Puertas: se destruyen; la onda sigue sólo si estaban abiertas
+    doors = self.doors.reshape(-1)
+    door = doors[edge]
+    if door.any():
+      i = np.flatnonzero(door)
+      bd, xd, yd, nxd, nyd = b[i], x[i], y[i], nx[i], ny[i]
+      self._remove_walls(bd, yd, xd, w)
+      self._remove_walls(bd, nyd, nxd, o)
+      doors[edge[i]] = False
+      doors[((bd * H + nyd) * W + nxd) * 4 + o] = False
+
+    # Paredes: acumulan daño (2 golpes -> se destruye)
+    hit = wall & ~door
+    if hit.any():
+      damage = self.walls_damage.reshape(-1)
+      i = np.flatnonzero(hit)
+      bw, xw, yw, nxw, nyw = b[i], x[i], y[i], nx[i], ny[i]
+      idx = ((bw * W + xw) * H + yw) * 4 + w
+      damage[idx] += 1
+      self.damage[bw] += 1
+      i = np.flatnonzero(damage[idx] == 2)
+      self._remove_walls(bw[i], yw[i], xw[i], w)
+
+      # También daña la pared opuesta en la celda vecina
+      i = np.flatnonzero((nxw >= 0) & (nxw < W) & (nyw >= 0) & (nyw < H))
+      bw, nxw, nyw = bw[i], nxw[i], nyw[i]
+      i = np.flatnonzero(self.walls.reshape(-1)[((bw * H + nyw) * W + nxw) * 4 + o] == 1)
+      bw, nxw, nyw = bw[i], nxw[i], nyw[i]
+      idx = ((bw * W + nxw) * H + nyw) * 4 + o
+      damage[idx] += 1
+      i = np.flatnonzero(damage[idx] >= 2)
+      self._remove_walls(bw[i], nyw[i], nxw[i], o)
+
+    return ~wall
+
+  # Método que propaga la onda expansiva en línea recta para cada fila.
+  # No hace falta revisar la pared de la celda anterior: la onda sólo avanza
+  # cuando _damage_wall devolvió "continue", es decir, cuando no había pared.
+  def _shockwave(self, b, x, y, d, burned):
+    W, H = self.width, self.height
+    fire = self.fire.reshape(-1)
+    while len(b):
+      inb = (x >= 0) & (x < W) & (y >= 0) & (y < H)
+      if not inb.all():
+        i = np.flatnonzero(inb)
+        b, x, y = b[i], x[i], y[i]
+        if not len(b):
+          break
+
+      # Vacío o humo -> fuego y se detiene
+      calm = fire[(b * W + x) * H + y] != 2
+      if calm.any():
+        i = np.flatnonzero(calm)
+        self._place_fire(b[i], x[i], y[i], burned)
+        i = np.flatnonzero(~calm)
+        b, x, y = b[i], x[i], y[i]
+
+      # Fuego -> daña la siguiente pared y continúa si no hubo bloqueo
+      i = np.flatnonzero(self._damage_wall(b, x, y, d))
+      b, x, y = b[i], x[i] + DX[d], y[i] + DY[d]
+
+  # Método que maneja una explosión en (x, y) para cada fila
+  def _explosion(self, b, x, y, burned):
+    for d in range(4):
+      i = np.flatnonzero(self._damage_wall(b, x, y, d))
+      self._shockwave(b[i], x[i] + DX[d], y[i] + DY[d], d, burned)
+
+  # Método que aplica el flashover con la misma semántica que el recorrido
+  # secuencial del modelo (y exterior, x interior, actualizando en el lugar):
+  # los vecinos de arriba/derecha se leen del estado inicial y los de
+  # abajo/izquierda del estado ya actualizado. Se resuelve iterando hasta
+  # el punto fijo, que es único porque la dependencia sigue el orden del recorrido.
+  # Los desplazamientos se hacen con el lote como último eje (W, H, B) para
+  # que cada operación recorra memoria contigua.
+  def _flashover(self, burned):
+    fire = np.ascontiguousarray(self.fire.transpose(1, 2, 0))
+    smoke = fire == 1
+    burning = fire == 2
+
+    # Si no hay humo junto a fuego en ninguna partida no hay nada que hacer
+    near = np.zeros_like(smoke)
+    near[:, :-1] |= burning[:, 1:]
+    near[:-1, :] |= burning[1:, :]
+    near[:, 1:] |= burning[:, :-1]
+    near[1:, :] |= burning[:-1, :]
+    near &= smoke
+    if not near.any():
+      return
+    up, right, down, left = self.open
+
+    later = np.zeros_like(smoke)
+    later[:, :-1] |= up[:, :-1] & burning[:, 1:]
+    later[:-1, :] |= right[:-1, :] & burning[1:, :]
+    later &= smoke
+
+    ignite = later
+    while True:
+      lit = burning | ignite
+      new = later.copy()
+      new[:, 1:] |= down[:, 1:] & lit[:, :-1]
+      new[1:, :] |= left[1:, :] & lit[:-1, :]
+      new &= smoke
+      if np.array_equal(new, ignite):
+        break
+      ignite = new
+
+    n, H = self.size, self.height
+    idx = np.flatnonzero(ignite)
+    xy, b = np.divmod(idx, n)
+    x, y = np.divmod(xy, H)
+    self._place_fire(b, x, y, burned)
+
+  # Método que noquea a los agentes que quedaron en celdas incendiadas
+  def _knock_out(self, burned):
+    rows = np.arange(self.size)[:, None]
+    hit = burned[rows, self.pos[..., 0], self.pos[..., 1]]
+    if not hit.any():
+      return
+    lost = (hit & self.carrying).sum(axis=1).astype(np.int32)
+    self.lost_victims += lost
+    self.victims_on_board -= lost
+    self.carrying &= ~hit
+    b, i = np.nonzero(hit)
+    self.pos[b, i] = self.nearest_entry[self.pos[b, i, 0], self.pos[b, i, 1]]
+
+  # Método que avanza el fuego en todas las partidas
+  def advance_fire(self):
+    n = self.size
+    W, H = self.width, self.height
+    b = np.arange(n)
+    x = self.rng.integers(0, W, n)
+    y = self.rng.integers(0, H, n)
+    cell = (b * W + x) * H + y
+    fire = self.fire.reshape(-1)
+    current = fire[cell]
+    burned = np.zeros(self.fire.shape, dtype=bool)
+
+    # Vacío -> humo (fuego si es adyacente a fuego)
+    i = np.flatnonzero(current == 0)
+    fire[cell[i]] = 1
+    adj = self._adjacent_to_fire(b[i], x[i], y[i])
+
+    # Humo -> fuego
+    i = np.concatenate([i[adj], np.flatnonzero(current == 1)])
+    self._place_fire(b[i], x[i], y[i], burned)
+
+    # Fuego -> explosión
+    i = np.flatnonzero(current == 2)
+    self._explosion(b[i], x[i], y[i], burned)
+
+    self._flashover(burned)
+    self._knock_out(burned)
+
+  # %%
+  # --- POI ---
+
+  # Método que repone POIs hasta tener 3 en cada partida
+  def replenish_poi(self):
+    while True:
+      need = ((self.poi_count + self.victims_on_board) < 3) & \
+             ~((self.victims_count <= 0) & (self.false_alarms_count <= 0))
+      if not need.any():
+        return
+      b = np.flatnonzero(need)
+      x = self.rng.integers(0, self.width, len(b))
+      y = self.rng.integers(0, self.height, len(b))
+
+      # Repetir si ya hay un POI en la posición
+      i = np.flatnonzero(self.poi[b, x, y] == 0)
+      b, x, y = b[i], x[i], y[i]
+
+      # Quitar humo/fuego previo a colocar el POI
+      self.fire[b, x, y] = 0
+
+      # Tipo de POI según lo que queda en la 'bolsa'
+      v = self.victims_count[b]
+      f = self.false_alarms_count[b]
+      draw = self.rng.random(len(b)) < v / np.maximum(v + f, 1)
+      victim = np.where(v <= 0, False, np.where(f <= 0, True, draw))
+      both = (v > 0) & (f > 0)
+      self.victims_count[b] -= both & victim
+      self.false_alarms_count[b] -= both & ~victim
+
+      self.poi[b, x, y] = np.where(victim, 1, 2)
+      self.poi_count[b] += 1
+
+  # %%
+  # --- Agentes (política aleatoria de TacoRescue.py) ---
+
+  # Método que ejecuta el turno del agente actual en todas las partidas.
+  # Se trabaja sobre vistas planas de los tableros y, en cada una de las 8
+  # opciones, sólo con las filas cuyo agente todavía tiene AP.
+  def agent_step(self):
+    n = self.size
+    W, H = self.width, self.height
+    a = self.current_index
+    fire, poi = self.fire.reshape(-1), self.poi.reshape(-1)
+    walls, doors = self.walls.reshape(-1), self.doors.reshape(-1)
+
+    ap = np.minimum(self.AP[:, a] + 4, 8)
+    px = self.pos[:, a, 0].copy()
+    py = self.pos[:, a, 1].copy()
+    carrying = self.carrying[:, a].copy()
+
+    # Si está sobre una víctima y no carga otra, la recoge
+    cell = (np.arange(n) * W + px) * H + py
+    pick = (poi[cell] == 1) & ~carrying & (fire[cell] != 2)
+    poi[cell[pick]] = 0
+    self.poi_count[pick] -= 1
+    self.victims_on_board[pick] += 1
+    carrying |= pick
+
+    options = self.rng.integers(0, 4, size=(n, 8))
+    for k in range(8):
+      r = np.flatnonzero(ap > 0)
+      if not len(r):
+        break
+      d = options[r, k]
+      x, y = px[r], py[r]
+      tx, ty = x + DX[d], y + DY[d]
+      left, load = ap[r], carrying[r]
+
+      # Costo de moverse: con víctima no se entra al fuego, y para entrar
+      # al fuego se necesita 1 AP extra. Las casillas fuera del tablero se
+      # leen recortadas y se descartan con 'valid'.
+      target = (r * W + tx) * H + ty
+      state = fire.take(target, mode="clip")
+      burning = state == 2
+      cost = np.where(load | burning, 2, 1)
+      valid = (tx >= 0) & (tx < W) & (ty >= 0) & (ty < H)
+      valid &= ~(burning & (load | (left < cost + 1)))
+
+      # Puerta cerrada: se abre (1 AP); pared: se daña (2 AP).
+      # En ambos casos el agente no se mueve en esta opción.
+      edge = ((r * H + y) * W + x) * 4 + WALL[d]
+      wall = valid & (walls[edge] == 1)
+      door = wall & doors[edge]
+      opened = door & (left >= 1)
+      if opened.any():
+        i = np.flatnonzero(opened)
+        self._remove_walls(r[i], y[i], x[i], WALL[d[i]])
+        self._remove_walls(r[i], ty[i], tx[i], OPP[d[i]])
+        left -= opened
+
+      hit = wall & ~door & (left >= 2)
+      if hit.any():
+        i = np.flatnonzero(hit)
+        self._agent_damage_wall(r[i], x[i], y[i], tx[i], ty[i], WALL[d[i]], OPP[d[i]])
+        left -= 2 * hit
+
+      # Movimiento
+      move = valid & ~wall & (left >= cost)
+      left -= cost * move
+      px[r] = np.where(move, tx, x)
+      py[r] = np.where(move, ty, y)
+
+      # Fuego: extinguir si es posible, si no convertir a humo.
+      # Humo: quitarlo si es posible.
+      ext = move & burning & (left >= 2)
+      to_smoke = move & burning & ~ext & (left >= 1)
+      clear = move & (state == 1) & (left >= 1)
+      left -= 2 * ext + to_smoke + clear
+      ap[r] = left
+
+      # Celda vacía: recoger víctima o revelar falsa alarma
+      found = np.where(move & (state == 0), poi.take(target, mode="clip"), 0)
+      pick = (found == 1) & ~load
+      reveal = pick | (found == 2)
+
+      # Entrada con víctima: se rescata
+      entry = self.is_entry.reshape(-1).take(tx * H + ty, mode="clip")
+      load |= pick
+      drop = move & entry & load
+      carrying[r] = load & ~drop
+      self.victims_on_board[r] += pick.astype(np.int32) - drop
+      self.rescued_count[r] += drop
+
+      i = np.flatnonzero(move)
+      fire[target[i]] = np.where(ext[i] | clear[i], 0, np.where(to_smoke[i], 1, state[i]))
+      if reveal.any():
+        i = np.flatnonzero(reveal)
+        poi[target[i]] = 0
+        self.poi_count[r[i]] -= 1
+
+    self.AP[:, a] = ap
+    self.pos[:, a, 0] = px
+    self.pos[:, a, 1] = py
+    self.carrying[:, a] = carrying
+
+  # Método que daña una pared desde la celda del agente (reglas del agente)
+  def _agent_damage_wall(self, b, x1, y1, x2, y2, w, o):
+    W, H = self.width, self.height
+    damage = self.walls_damage.reshape(-1)
+    idx = ((b * W + x1) * H + y1) * 4 + w
+    damage[idx] += 1
+    self.damage[b] += 1
+    i = np.flatnonzero(damage[idx] == 2)
+    self._remove_walls(b[i], y1[i], x1[i], w[i])
+
+    # También daña la pared opuesta en la celda vecina
+    i = np.flatnonzero(self.walls.reshape(-1)[((b * H + y2) * W + x2) * 4 + o] == 1)
+    b, x2, y2, o = b[i], x2[i], y2[i], o[i]
+    idx = ((b * W + x2) * H + y2) * 4 + o
+    damage[idx] += 1
+    i = np.flatnonzero(damage[idx] >= 2)
+    self._remove_walls(b[i], y2[i], x2[i], o[i])
+
+  # %%
+  # Método que ejecuta un paso en todas las partidas activas
+  def step(self):
+    if not self.running():
+      return
+    self.steps += 1
+    self.agent_step()
+    self.current_index = (self.current_index + 1) % self.players
+    self.advance_fire()
+    self.replenish_poi()
+
+    force = self.max_steps is not None and self.steps >= self.max_steps
+    self._finish(force=force)
+
+  # Método que juega todas las partidas hasta terminar y devuelve los resultados
+  def run(self):
+    while self.running():
+      self.step()
+    return self.results
+
+
+# %%
+# Método que corre 'games' partidas en lotes y reporta partidas por segundo
+def run_batch(games=10000, batch_size=10000, seed=None, max_steps=None, metrics=None, board_map=None):
+  rng = np.random.default_rng(seed)
+  results = []
+  start = time.perf_counter()
+  remaining = games
+  while remaining > 0:
+    size = min(batch_size, remaining)
+    batch = TacoRescueBatch(size, seed=rng.integers(2**63), max_steps=max_steps, metrics=metrics,
+                             board_map=board_map)
+    results.append(batch.run())
+    remaining -= size
+  elapsed = time.perf_counter() - start
+
+  merged = {k: np.concatenate([r[k] for r in results]) for k in results[0]}
+  merged["elapsed"] = elapsed
+  merged["games_per_second"] = games / elapsed if elapsed > 0 else float("inf")
+  return merged
+
+
+if __name__ == "__main__":
+  res = run_batch(games=20000, seed=0)
+  print(f"{len(res['steps'])} partidas en {res['elapsed']:.2f}s "
+        f"({res['games_per_second']:.0f} partidas/s)")
+  print(f"Rescatadas: {res['rescued'].mean():.2f} | Perdidas: {res['lost'].mean():.2f} | "
+        f"Daño: {res['damage'].mean():.2f} | Pasos: {res['steps'].mean():.1f}")
@@ -1,9 +1,43 @@
+import os
+
 from flask import Flask, jsonify, request
-import TacoRescueStrat
+from tacosim import TacoRescueModel
+from tacosim.gamelog import GameLogReader, GameLogWriter, list_games
+from tacosim.metrics import Metrics
+from tacosim.replay import frame_at
 
 app = Flask(__name__)
 
-model = TacoRescueStrat.TacoRescueModel()
+# Instrumentación por fase, solo si TACO_METRICS=1; se conserva entre reinicios
+metrics = Metrics() if os.environ.get("TACO_METRICS") == "1" else None
+
+# Directorio donde se guarda cada partida (TACO_LOG_DIR="" lo desactiva)
+LOG_DIR = os.environ.get("TACO_LOG_DIR", "games")
+
+# Presupuesto de planificación por paso en milisegundos (TACO_STEP_BUDGET_MS);
+# sin la variable los agentes planean sin límite
+STEP_BUDGET = (float(os.environ["TACO_STEP_BUDGET_MS"]) / 1000
+               if os.environ.get("TACO_STEP_BUDGET_MS") else None)
+
+def new_game():
+    """Crea un modelo nuevo y, si hay LOG_DIR, su registro en disco."""
+    # Semilla explícita: queda en el registro y permite repetir la partida
+    seed = int.from_bytes(os.urandom(4), "little")
+    game = TacoRescueModel(metrics=metrics, seed=seed, step_budget=STEP_BUDGET)
+    writer = GameLogWriter(LOG_DIR, game, seed=seed) if LOG_DIR else None
+    return game, writer
+
+# Partida en curso; se crea con la primera petición para que importar este
+# módulo solo defina la app (sin modelo ni archivos en LOG_DIR)
+model = None
+recorder = None
+
+def current_game():
+    """Regresa el modelo en curso y lo crea si todavía no hay uno."""
+    global model, recorder
+    if model is None:
+        model, recorder = new_game()
+    return model
 
 @app.route("/")
 def home():
@@ -19,42 +53,109 @@ def convert_keys(d):
 
 @app.route("/step", methods=["POST"])
 def step():
-    global model
+    global model, recorder
+    current_game()
     if model.end_game():
         print("Se acabo la simulación, reiniciando el modelo...")
-        model = TacoRescueStrat.TacoRescueModel()
+        if recorder is not None:
+            recorder.close()
+        model, recorder = new_game()
         return jsonify({"step": "Reinicado"})
     model.step()
-    return jsonify({"step": model.steps})
+    if recorder is not None:
+        recorder.record(model)
+    response = {"step": model.steps}
+    if model.step_budget is not None:
+        # Tiempo de planificación del turno y si se pasó del presupuesto
+        response["planning_ms"] = model.planning_time * 1000
+        response["overrun"] = model.planning_time > model.step_budget
+    return jsonify(response)
 
-@app.route("/state", methods=["GET"])
-def get_state():
-    """Regresa el estado actual de la simulación."""
+def serialize_state(model, since=None):
+    """Construye el diccionario de estado que consume Unity.
+
+    Con 'since' solo se incluyen los eventos con step >= since.
+    """
     state = {
         "step": model.steps,
         "agents": [
             {
                 "id": agent.id,
-                "x": agent.pos[0],
-                "y": agent.pos[1],
-                "carrying_victim": getattr(agent, "carrying_victim", False),
-                "AP": getattr(agent, "AP", False)
+                "x": x,
+                "y": y,
+                "carrying_victim": bool(carrying),
+                "AP": ap
             }
-            for i, agent in enumerate(model.schedule.agents)
+            for agent, (x, y, ap, carrying) in zip(model.grid.agents, model.grid.agent_rows().tolist())
         ],
-        "events": model.events,
+        "events": model.events.to_dicts(None if since is None else model.events.select(since=since)),
         "fire": model.fire.tolist(),
         "walls": model.walls.tolist(),
         "walls_damage": model.walls_damage.tolist(),
         "doors": model.doors,
-        "poi": model.poi_unknown,
+        # Ordenados por (x, y): el registro de partidas no guarda el orden
+        # interno del modelo y así /replay regresa lo mismo que /state
+        "poi": sorted(model.poi_unknown),
         "damage": model.damage,
         "rescued_count": model.rescued_count,
         "lost_victims": model.lost_victims
     }
-    return jsonify(convert_keys(state))
+    return convert_keys(state)
+
+@app.route("/state", methods=["GET"])
+def get_state():
+    """Regresa el estado actual de la simulación (?since=K para eventos desde el paso K)."""
+    since = request.args.get("since", type=int)
+    return jsonify(serialize_state(current_game(), since))
+
+@app.route("/games", methods=["GET"])
+def get_games():
+    """Lista las partidas guardadas en LOG_DIR."""
+    return jsonify({"games": list_games(LOG_DIR) if LOG_DIR else []})
+
+# Lectores de partidas terminadas (los archivos ya no cambian)
+_readers = {}
+
+def open_game(game_id):
+    """Regresa un lector de la partida, o None si no existe."""
+    if not LOG_DIR or game_id not in list_games(LOG_DIR):
+        return None
+    # La partida en curso se sigue escribiendo: se relee en cada consulta
+    if recorder is not None and game_id == recorder.game_id:
+        recorder.flush()
+        return GameLogReader(LOG_DIR, game_id)
+    if game_id not in _readers:
+        if len(_readers) >= 32:
+            _readers.pop(next(iter(_readers)))
+        _readers[game_id] = GameLogReader(LOG_DIR, game_id)
+    return _readers[game_id]
+
+@app.route("/replay/<game_id>/state", methods=["GET"])
+def get_replay_state(game_id):
+    """Estado de una partida guardada al final del paso ?step=K (por defecto el último)."""
+    reader = open_game(game_id)
+    if reader is None:
+        return jsonify({"error": f"Partida desconocida: {game_id}"}), 404
+    step = request.args.get("step", type=int)
+    if step is None:
+        step = reader.steps[-1]
+    if step < 0:
+        return jsonify({"error": "step debe ser >= 0"}), 400
+    state = serialize_state(frame_at(reader, step))
+    state["game"] = game_id
+    state["last_step"] = reader.steps[-1]
+    return jsonify(state)
+
+@app.route("/metrics", methods=["GET"])
+def get_metrics():
+    """Regresa contadores e histogramas por fase; ?reset=1 los reinicia."""
+    if metrics is None:
+        return jsonify({"enabled": False})
+    snapshot = metrics.snapshot()
+    if request.args.get("reset") == "1":
+        metrics.reset()
+    return jsonify({"enabled": True, **snapshot})
 
 if __name__ == "__main__":
-    import os
     port = int(os.environ.get("PORT", 5000))
     app.run(host="0.0.0.0", port=port)
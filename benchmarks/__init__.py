@@ -0,0 +1 @@
+# Benchmarks del simulador: ver benchmarks/run.py
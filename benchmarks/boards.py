@@ -0,0 +1,85 @@
+# Tableros para los benchmarks.
+# El motor solo trae el tablero de 8x6; para medir cómo escalan las rutas
+# calientes se repite ese tablero en mosaico hasta W x H (layout "tiled") o
+# se genera un edificio procedural con tacosim.mapgen (layout "generated",
+# donde min_room controla cuántos cuartos y paredes hay), y se enciende una
+# fracción fija de celdas, todo a partir de una semilla.
+import numpy as np
+
+from tacosim import TacoRescueModel
+from tacosim.mapgen import generate_map
+from tacosim.maps import BoardMap, default_map
+
+BASE_W, BASE_H = 8, 6
+
+
+# Mapa de W x H (múltiplos de 8 x 6) con el tablero base en mosaico. Las
+# paredes entre mosaicos se cierran de ambos lados y solo quedan las entradas
+# que caen en el perímetro exterior.
+def tiled_map(width, height):
+  if width % BASE_W or height % BASE_H:
+    raise ValueError(f"El tablero debe ser múltiplo de {BASE_W}x{BASE_H}: {width}x{height}")
+  base = default_map()
+  nx, ny = width // BASE_W, height // BASE_H
+  walls = np.tile(base.walls, (ny, nx, 1))
+  closed_x = np.maximum(walls[:, BASE_W - 1:-1:BASE_W, 1], walls[:, BASE_W::BASE_W, 3])
+  walls[:, BASE_W - 1:-1:BASE_W, 1] = closed_x
+  walls[:, BASE_W::BASE_W, 3] = closed_x
+  closed_y = np.maximum(walls[BASE_H - 1:-1:BASE_H, :, 0], walls[BASE_H::BASE_H, :, 2])
+  walls[BASE_H - 1:-1:BASE_H, :, 0] = closed_y
+  walls[BASE_H::BASE_H, :, 2] = closed_y
+
+  tiles = [(tx * BASE_W, ty * BASE_H) for ty in range(ny) for tx in range(nx)]
+  shift = lambda cells, ox, oy: [(x + ox, y + oy) for (x, y) in cells]
+  doors, entries, fire, victims, false_alarms = [], [], [], [], []
+  for ox, oy in tiles:
+    doors += [(x1 + ox, y1 + oy, x2 + ox, y2 + oy) for (x1, y1, x2, y2) in base.doors_pos]
+    entries += [(x, y) for (x, y) in shift(base.entries, ox, oy)
+                if x in (0, width - 1) or y in (0, height - 1)]
+    fire += shift(base.fire_pos, ox, oy)
+    victims += shift(base.victims, ox, oy)
+    false_alarms += shift(base.false_alarms, ox, oy)
+
+  n = len(tiles)
+  return BoardMap(width, height, walls, doors, entries, fire, victims, false_alarms,
+                  total_victims=base.total_victims * n,
+                  total_false_alarms=base.total_false_alarms * n,
+                  start_entries=base.start_entries if n == 1 else None)
+
+
+# Función que construye un modelo de W x H con una densidad inicial de fuego
+# (y opcionalmente de humo) dada; la misma semilla da el mismo tablero.
+def build_model(policy="strategic", width=8, height=6, fire_density=None, smoke_density=0.0, seed=0,
+                layout="tiled", min_room=3, backend="auto", planner="grid",
+                horizon=None, allocation="greedy", step_budget=None,
+                fire_risk=None):
+  if layout == "tiled":
+    board_map = tiled_map(width, height)
+  elif layout == "generated":
+    board_map = generate_map(width, height, seed=seed, min_room=min_room)
+  else:
+    raise ValueError(f"Layout desconocido: {layout!r}")
+  model = TacoRescueModel(policy=policy, seed=seed, board_map=board_map, backend=backend,
+                          planner=planner, horizon=horizon, allocation=allocation,
+                          step_budget=step_budget, fire_risk=fire_risk)
+
+  # Fuego: el del mapa, o una fracción aleatoria de
+  # celdas (sin POIs ni agentes) si se pide una densidad
+  if fire_density is not None:
+    model.fire[:] = 0
+    rng = np.random.default_rng(seed)
+    occupied = set(model.poi_unknown) | {a.pos for a in model.grid.agents}
+    free = [(x, y) for x in range(width) for y in range(height) if (x, y) not in occupied]
+    n_fire = int(round(fire_density * width * height))
+    n_smoke = int(round(smoke_density * width * height))
+    picked = rng.choice(len(free), size=min(n_fire + n_smoke, len(free)), replace=False)
+    for k, i in enumerate(picked):
+      x, y = free[i]
+      model.fire[x][y] = 2 if k < n_fire else 1
+    model.fire_front.rebuild()
+    model.connectivity.rebuild()
+    model.zobrist.rebuild()
+    if model.rooms is not None:
+      model.rooms.rebuild()
+
+  return model
@@ -0,0 +1,203 @@
+# Casos de benchmark de las rutas calientes del simulador.
+# Cada caso tiene un nombre, sus parámetros y un setup() que regresa la
+# función a medir. Los casos que modifican el modelo (mutates=True) se
+# reconstruyen antes de cada muestra; los demás se repiten sobre el mismo
+# modelo. Todo se construye con semillas fijas.
+from collections import namedtuple
+
+from tacosim.mcts import MCTSPolicy
+
+from .boards import build_model
+
+Case = namedtuple("Case", ["name", "params", "setup", "mutates"])
+
+SEED = 0
+POLICIES = ["random", "strategic"]
+SIZES = [(8, 6), (16, 12), (32, 24)]
+FIRE_DENSITIES = [0.1, 0.3]
+# Las partidas completas de la política estratégica crecen muy rápido con el
+# tablero; se limitan a tableros medianos y a un máximo de pasos.
+GAME_SIZES = [(8, 6), (16, 12)]
+GAME_MAX_STEPS = 100
+# Barrido sobre edificios procedurales: tamaño y complejidad (lado mínimo de
+# cuarto; más chico = más paredes y puertas)
+GEN_SIZES = [(16, 12), (32, 24), (64, 48)]
+GEN_ROOMS = [3, 6]
+GEN_DENSITY = 0.1
+# Presupuesto de planificación por paso (segundos) del caso con step_budget
+STEP_BUDGET = 0.002
+# Peso en AP del mapa de riesgo de fuego en los casos con fire_risk
+RISK_WEIGHT = 4.0
+# Presupuesto fijo de la política MCTS (iteraciones por turno)
+MCTS_ROLLOUTS = 16
+# Backend de kernels de los modelos (ver tacosim.kernels); lo fija make_cases
+_backend = "auto"
+
+
+def _board(policy, size, density, **kw):
+  width, height = size
+  return build_model(policy, width, height, fire_density=density, seed=SEED, backend=_backend, **kw)
+
+
+# Función que construye la lista de casos; quick=True deja solo el tablero
+# base con la primera densidad
+def make_cases(quick=False, backend="auto"):
+  global _backend
+  _backend = backend
+  sizes = SIZES[:1] if quick else SIZES
+  game_sizes = GAME_SIZES[:1] if quick else GAME_SIZES
+  densities = FIRE_DENSITIES[:1] if quick else FIRE_DENSITIES
+  cases = []
+
+  def add(name, setup, mutates, **params):
+    cases.append(Case(name, params, setup, mutates))
+
+  for policy in POLICIES:
+    for size in sizes:
+      for density in densities:
+        add("model.step", _setup_step(policy, size, density), True,
+            policy=policy, size=size, fire=density)
+    for size in game_sizes:
+      for density in densities:
+        add("model.game", _setup_game(policy, size, density), True,
+            policy=policy, size=size, fire=density)
+
+  # Un turno de MCTS en el tablero base (ver tacosim.mcts)
+  add("model.step", _setup_step(MCTSPolicy(rollouts=MCTS_ROLLOUTS), SIZES[0], densities[0]), True,
+      policy="mcts", rollouts=MCTS_ROLLOUTS, size=SIZES[0], fire=densities[0])
+  # Rutas con el mapa de riesgo de fuego (ver tacosim.risk)
+  add("model.step", _setup_step("strategic", SIZES[0], densities[0], fire_risk=RISK_WEIGHT), True,
+      policy="strategic", fire_risk=RISK_WEIGHT, size=SIZES[0], fire=densities[0])
+
+  for size in sizes:
+    for density in densities:
+      params = dict(size=size, fire=density)
+      add("agent.a_star", _setup_search(size, density, "a_star"), False, **params)
+      add("agent.shortest_cost", _setup_search(size, density, "shortest_cost"), False, **params)
+      add("agent.nearest_poi", _setup_agent(size, density, "nearest_poi"), False, **params)
+      add("agent.nearest_fire", _setup_agent(size, density, "nearest_fire"), False, **params)
+      add("model.flashover", _setup_flashover(size, density), True, **params)
+      add("model.explosion", _setup_explosion(size, density), True, **params)
+      add("render.get_grid", _setup_get_grid(size, density), False, **params)
+      add("risk.simulate", _setup_risk(size, density), False, **params)
+      add("app.state_json", _setup_state_json(size, density), False, **params)
+
+  # Edificios procedurales (solo en el barrido completo)
+  if not quick:
+    for size in GEN_SIZES:
+      for rooms in GEN_ROOMS:
+        params = dict(size=size, fire=GEN_DENSITY, layout="generated", rooms=rooms)
+        kw = dict(layout="generated", min_room=rooms)
+        add("agent.a_star", _setup_search(size, GEN_DENSITY, "a_star", **kw), False, **params)
+        add("model.flashover", _setup_flashover(size, GEN_DENSITY, **kw), True, **params)
+        add("app.state_json", _setup_state_json(size, GEN_DENSITY, **kw), False, **params)
+        add("model.step", _setup_step("strategic", size, GEN_DENSITY, **kw), True,
+            policy="strategic", **params)
+        # Planificador por cuartos (ver tacosim.rooms)
+        add("agent.a_star", _setup_search(size, GEN_DENSITY, "a_star", planner="rooms", **kw), False,
+            planner="rooms", **params)
+        add("model.step", _setup_step("strategic", size, GEN_DENSITY, planner="rooms", **kw), True,
+            policy="strategic", planner="rooms", **params)
+        # Selección de objetivos acotada a un turno de AP
+        add("model.step", _setup_step("strategic", size, GEN_DENSITY, horizon=1, **kw), True,
+            policy="strategic", horizon=1, **params)
+        # Reparto de POIs por ronda (ver tacosim.allocation)
+        add("model.step", _setup_step("strategic", size, GEN_DENSITY, allocation="hungarian", **kw),
+            True, policy="strategic", allocation="hungarian", **params)
+        # Planificación con presupuesto por paso
+        add("model.step", _setup_step("strategic", size, GEN_DENSITY, step_budget=STEP_BUDGET, **kw),
+            True, policy="strategic", step_budget=STEP_BUDGET, **params)
+
+  add("batch.run_batch", _setup_batch(games=500 if quick else 2000), True,
+      size=(8, 6), games=500 if quick else 2000)
+  return cases
+
+
+def _setup_step(policy, size, density, **kw):
+  def setup():
+    model = _board(policy, size, density, **kw)
+    return model.step
+  return setup
+
+
+def _setup_game(policy, size, density):
+  def setup():
+    model = _board(policy, size, density)
+    def run():
+      while not model.end_game() and model.steps < GAME_MAX_STEPS:
+        model.step()
+    return run
+  return setup
+
+
+# Ruta del primer agente a la esquina opuesta del tablero
+def _setup_search(size, density, method, **kw):
+  def setup():
+    model = _board("strategic", size, density, **kw)
+    agent = model.grid.agents[0]
+    goal = (size[0] - 1, size[1] - 1)
+    search = getattr(agent, method)
+    return lambda: search(agent.pos, goal)
+  return setup
+
+
+def _setup_agent(size, density, method):
+  def setup():
+    model = _board("strategic", size, density)
+    return getattr(model.grid.agents[0], method)
+  return setup
+
+
+# Tanto humo como fuego, para que el flashover tenga trabajo que hacer
+def _setup_flashover(size, density, **kw):
+  def setup():
+    model = _board("strategic", size, density, smoke_density=density, **kw)
+    return model.flashover
+  return setup
+
+
+# Explosión en el centro del tablero (incluye las ondas expansivas)
+def _setup_explosion(size, density):
+  def setup():
+    model = _board("strategic", size, density)
+    x, y = size[0] // 2, size[1] // 2
+    model.set_fire(x, y, 2)
+    return lambda: model.explosion(x, y)
+  return setup
+
+
+def _setup_get_grid(size, density):
+  def setup():
+    from tacosim import get_grid
+    model = _board("strategic", size, density)
+    return lambda: get_grid(model)
+  return setup
+
+
+# Mapa de riesgo de fuego recalculado desde cero (ver tacosim.risk)
+def _setup_risk(size, density):
+  def setup():
+    import numpy as np
+    model = _board("strategic", size, density, fire_risk=RISK_WEIGHT)
+    return lambda: model.risk.simulate(np.random.default_rng(SEED))
+  return setup
+
+
+# Serialización completa de /state (dict + JSON) tras unos pasos de juego
+def _setup_state_json(size, density, **kw):
+  def setup():
+    import app
+    model = _board("strategic", size, density, **kw)
+    for _ in range(10):
+      if model.end_game():
+        break
+      model.step()
+    return lambda: app.app.json.dumps(app.serialize_state(model))
+  return setup
+
+
+def _setup_batch(games):
+  def setup():
+    from TacoRescueBatch import run_batch
+    return lambda: run_batch(games=games, batch_size=games, seed=SEED)
+  return setup
@@ -0,0 +1,238 @@
+# Verificaciones de consistencia del simulador.
+#
+#   python -m benchmarks.checks               # todas
+#   python -m benchmarks.checks -k gamelog    # las que contienen 'gamelog'
+#   python -m benchmarks.checks --games 16    # más partidas por verificación
+#
+# Cada verificación juega partidas sembradas (las dos políticas, en el
+# tablero base y en un edificio generado) y compara una estructura rápida con
+# su referencia lenta; regresa cuántas comparaciones hizo y los desacuerdos.
+# Sale con código 1 si alguna falla.
+import argparse
+import itertools
+import sys
+import tempfile
+from collections import namedtuple
+
+import numpy as np
+
+from tacosim import TacoRescueModel
+from tacosim.allocation import UNREACHABLE, solve_assignment
+from tacosim.connectivity import Connectivity
+from tacosim.firefront import FireFront
+from tacosim.gamelog import GameLogReader, GameLogWriter, StateLayout
+from tacosim.rays import RayTable
+from tacosim.zobrist import state_hash
+
+from .boards import build_model
+
+Check = namedtuple("Check", ["name", "run"])
+
+POLICIES = ["random", "strategic"]
+# Edificio generado de las partidas de prueba (más paredes y puertas)
+GEN_SIZE = (16, 12)
+MAX_STEPS = 300
+# Matrices de solve_assignment por semilla y tamaño máximo (filas y columnas)
+ASSIGNMENT_MATRICES = 250
+ASSIGNMENT_SIZE = 6
+# Desacuerdos que se reportan por verificación
+MAX_REPORTED = 5
+
+
+# Función que regresa los modelos de las partidas de prueba: por semilla, las
+# dos políticas en el tablero base y en un edificio generado
+def _models(games):
+  for seed in range(games):
+    for policy in POLICIES:
+      yield f"{policy}/8x6/{seed}", TacoRescueModel(seed=seed, policy=policy)
+      width, height = GEN_SIZE
+      yield (f"{policy}/{width}x{height}/{seed}",
+             build_model(policy, width, height, seed=seed, layout="generated"))
+
+
+# Función que juega la partida y llama a compare(model) al inicio y después
+# de cada paso; compare regresa un mensaje si no coincide (None si sí). Se
+# detiene en el primer desacuerdo. Regresa (comparaciones, mensaje)
+def _play(model, compare):
+  count = 1
+  error = compare(model)
+  while error is None and not model.end_game() and model.steps < MAX_STEPS:
+    model.step()
+    count += 1
+    error = compare(model)
+  return count, None if error is None else f"paso {model.steps}: {error}"
+
+
+# Función que aplica compare paso a paso a todas las partidas de prueba
+def _per_step(games, compare):
+  count, errors = 0, []
+  for name, model in _models(games):
+    n, error = _play(model, compare)
+    count += n
+    if error is not None:
+      errors.append(f"{name} {error}")
+  return count, errors
+
+
+# Función que regresa las celdas de más y de menos de 'got' contra 'want'
+def _set_diff(got, want):
+  return f"de más {sorted(got - want)}, faltan {sorted(want - got)}"
+
+
+# GameLogWriter -> GameLogReader: cada paso se lee igual que se capturó
+# (por recorrido y por vector_at) y los eventos coinciden
+def check_gamelog(games):
+  count, errors = 0, []
+  with tempfile.TemporaryDirectory() as directory:
+    for name, model in _models(games):
+      layout = StateLayout.for_model(model)
+      expected = []
+      with GameLogWriter(directory, model, keyframe_interval=4) as writer:
+        expected.append((model.steps, layout.capture(model)))
+        while not model.end_game() and model.steps < MAX_STEPS:
+          model.step()
+          writer.record(model)
+          expected.append((model.steps, layout.capture(model)))
+
+      reader = GameLogReader(directory, writer.game_id)
+      states = [(step, vec.copy()) for step, vec in reader.iter_states()]
+      if [s for s, _ in states] != [s for s, _ in expected]:
+        errors.append(f"{name}: pasos {[s for s, _ in states]} != {[s for s, _ in expected]}")
+        continue
+      for (step, vec), (_, want) in zip(states, expected):
+        count += 1
+        if not np.array_equal(vec, want):
+          errors.append(f"{name} paso {step}: iter_states no coincide")
+          break
+        if not np.array_equal(reader.vector_at(step)[1], want):
+          errors.append(f"{name} paso {step}: vector_at no coincide")
+          break
+      if not np.array_equal(reader.events, model.events.data):
+        errors.append(f"{name}: los eventos no coinciden")
+      reader.close()
+  return count, errors
+
+
+# FireFront (fuego, humo y frontera) contra uno construido desde cero
+def check_fire_front(games):
+  def compare(model):
+    fresh = FireFront(model)
+    for name in ("fire", "smoke", "frontier"):
+      got, want = getattr(model.fire_front, name), getattr(fresh, name)
+      if got != want:
+        return f"fire_front.{name}: {_set_diff(got, want)}"
+    return None
+  return _per_step(games, compare)
+
+
+# RayTable (rayos lisos por celda y dirección) contra una construida desde cero
+def check_rays(games):
+  def compare(model):
+    got, want = model.rays.run, RayTable(model).run
+    if not np.array_equal(got, want):
+      d, x, y = (int(v) for v in np.argwhere(got != want)[0])
+      return f"rays.run[{d}][{x}, {y}] = {got[d, x, y]}, debería ser {want[d, x, y]}"
+    return None
+  return _per_step(games, compare)
+
+
+# Componentes de celdas sin fuego de un Connectivity: celda -> la menor
+# celda de su componente
+def _components(conn):
+  height = conn.model.grid.height
+  cells = [(x, y) for x in range(conn.model.grid.width) for y in range(height) if conn.passable[x][y]]
+  first = {}
+  for (x, y) in cells:
+    first.setdefault(conn._find(conn.node[x * height + y]), (x, y))
+  return {(x, y): first[conn._find(conn.node[x * height + y])] for (x, y) in cells}
+
+
+# Connectivity contra uno etiquetado desde cero: mismas celdas sin fuego y,
+# si el índice no está marcado como viejo, las mismas componentes
+def check_connectivity(games):
+  def compare(model):
+    conn, fresh = model.connectivity, Connectivity(model)
+    if conn.passable != fresh.passable:
+      return "connectivity.passable no coincide con model.fire"
+    if not conn.stale and _components(conn) != _components(fresh):
+      got, want = _components(conn), _components(fresh)
+      cell = next(c for c in want if got[c] != want[c])
+      return f"connectivity: {cell} está con {got[cell]}, debería estar con {want[cell]}"
+    return None
+  return _per_step(games, compare)
+
+
+# Función que regresa el costo mínimo de asignación probando todas las
+# permutaciones (cada fila o cada columna, la dimensión menor, se asigna)
+def _brute_force_assignment(cost):
+  n, m = len(cost), len(cost[0])
+  if n <= m:
+    return min(sum(cost[i][j] for i, j in enumerate(cols)) for cols in itertools.permutations(range(m), n))
+  return min(sum(cost[i][j] for j, i in enumerate(rows)) for rows in itertools.permutations(range(n), m))
+
+
+# solve_assignment contra fuerza bruta en matrices al azar de hasta
+# ASSIGNMENT_SIZE x ASSIGNMENT_SIZE, con empates y celdas UNREACHABLE
+def check_assignment(games):
+  rng = np.random.default_rng(0)
+  count, errors = 0, []
+  for _ in range(games * ASSIGNMENT_MATRICES):
+    n, m = (int(v) for v in rng.integers(1, ASSIGNMENT_SIZE + 1, size=2))
+    cost = rng.integers(0, 10, size=(n, m)).astype(float)
+    cost[rng.random((n, m)) < 0.15] = UNREACHABLE
+    cost = cost.tolist()
+    rows = solve_assignment(cost)
+    count += 1
+    cols = [j for j in rows if j is not None]
+    if len(rows) != n or len(cols) != min(n, m) or len(set(cols)) != len(cols):
+      errors.append(f"{n}x{m}: asignación inválida {rows} para {cost}")
+      continue
+    got = sum(cost[i][j] for i, j in enumerate(rows) if j is not None)
+    want = _brute_force_assignment(cost)
+    if got != want:
+      errors.append(f"{n}x{m}: costo {got}, el mínimo es {want} para {cost}")
+  return count, errors
+
+
+# Hash de Zobrist incremental contra el hash del estado capturado completo
+def check_zobrist(games):
+  def compare(model):
+    got = model.zobrist.value
+    want = state_hash(model.zobrist.layout.capture(model))
+    if got != want:
+      return f"zobrist.value {got:#018x}, debería ser {want:#018x}"
+    return None
+  return _per_step(games, compare)
+
+
+CHECKS = [
+  Check("gamelog", check_gamelog),
+  Check("fire_front", check_fire_front),
+  Check("rays", check_rays),
+  Check("connectivity", check_connectivity),
+  Check("assignment", check_assignment),
+  Check("zobrist", check_zobrist),
+]
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(description="Verificaciones de consistencia del simulador")
+  parser.add_argument("-k", "--filter", default=None, help="subcadena del nombre de la verificación")
+  parser.add_argument("--games", type=int, default=12, help="semillas por verificación")
+  args = parser.parse_args(argv)
+
+  failed = 0
+  for check in CHECKS:
+    if args.filter and args.filter not in check.name:
+      continue
+    count, errors = check.run(args.games)
+    status = "ok" if not errors else f"FALLA ({len(errors)})"
+    print(f"{check.name:20s} {count:7d} comparaciones  {status}", flush=True)
+    for error in errors[:MAX_REPORTED]:
+      print(f"  {error}")
+    failed += bool(errors)
+  return 1 if failed else 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
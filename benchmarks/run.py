@@ -0,0 +1,195 @@
+# Ejecuta los benchmarks y guarda los resultados en un historial JSON.
+#
+#   python -m benchmarks.run                 # todos los casos
+#   python -m benchmarks.run --quick         # solo el tablero de 8x6
+#   python -m benchmarks.run -k a_star       # casos cuyo nombre contiene 'a_star'
+#   python -m benchmarks.run --backend python  # sin kernels compilados
+#
+# Cada corrida se agrega a benchmarks/history.json con el commit actual y se
+# compara con la corrida anterior de la misma máquina y backend; los casos
+# cuya mediana empeora más que --threshold se marcan como regresión.
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from tacosim import kernels
+
+from .cases import make_cases
+
+DEFAULT_HISTORY = os.path.join(os.path.dirname(__file__), "history.json")
+# Tiempo mínimo por muestra al repetir casos que no modifican el modelo
+MIN_SAMPLE_TIME = 0.02
+
+
+# Llave estable de un caso: nombre[param=valor,...]
+def case_key(case):
+  params = ",".join(f"{k}={_fmt(v)}" for k, v in sorted(case.params.items()))
+  return f"{case.name}[{params}]"
+
+
+def _fmt(value):
+  if isinstance(value, tuple):
+    return "x".join(str(v) for v in value)
+  return str(value)
+
+
+# Función que mide un caso y regresa los tiempos por llamada (segundos).
+# Antes de medir se hace una llamada que se descarta (compilación de Numba,
+# cachés perezosas), y la calibración tampoco cuenta como muestra
+def measure(case, repeat):
+  times = []
+  if case.mutates:
+    case.setup()()
+    for _ in range(repeat):
+      fn = case.setup()
+      t0 = time.perf_counter()
+      fn()
+      times.append(time.perf_counter() - t0)
+    return times
+
+  fn = case.setup()
+  fn()
+  # Calibrar cuántas llamadas caben en una muestra (como timeit.autorange)
+  number = 1
+  while True:
+    t0 = time.perf_counter()
+    for _ in range(number):
+      fn()
+    if time.perf_counter() - t0 >= MIN_SAMPLE_TIME:
+      break
+    number *= 2
+  for _ in range(repeat):
+    t0 = time.perf_counter()
+    for _ in range(number):
+      fn()
+    times.append((time.perf_counter() - t0) / number)
+  return times
+
+
+def _git(*args):
+  try:
+    out = subprocess.run(["git", *args], capture_output=True, text=True, check=True,
+                         cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    return out.stdout.strip()
+  except (OSError, subprocess.CalledProcessError):
+    return None
+
+
+def machine_info():
+  return {
+    "node": platform.node(),
+    "machine": platform.machine(),
+    "python": platform.python_version(),
+    "numpy": np.__version__,
+  }
+
+
+def load_history(path):
+  if not os.path.exists(path):
+    return []
+  with open(path) as f:
+    return json.load(f)
+
+
+def save_history(path, history):
+  with open(path, "w") as f:
+    json.dump(history, f, indent=1)
+
+
+# Corrida previa más reciente de la misma máquina y backend (las corridas
+# anteriores a los kernels compilados son del backend "python")
+def previous_run(history, machine, backend):
+  for run in reversed(history):
+    if run.get("machine") == machine and run.get("backend", "python") == backend:
+      return run
+  return None
+
+
+def _human(seconds):
+  if seconds < 1e-3:
+    return f"{seconds * 1e6:8.1f} µs"
+  if seconds < 1:
+    return f"{seconds * 1e3:8.2f} ms"
+  return f"{seconds:8.3f} s "
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(description="Benchmarks del simulador TacoRescue")
+  parser.add_argument("--quick", action="store_true", help="solo el tablero base y una densidad")
+  parser.add_argument("-k", "--filter", default=None, help="subcadena del nombre del caso")
+  parser.add_argument("--repeat", type=int, default=5, help="muestras por caso")
+  parser.add_argument("--history", default=DEFAULT_HISTORY, help="archivo JSON de historial")
+  parser.add_argument("--no-save", action="store_true", help="no agregar la corrida al historial")
+  parser.add_argument("--threshold", type=float, default=1.25,
+                      help="razón de medianas a partir de la cual se marca regresión")
+  parser.add_argument("--backend", default="auto", choices=kernels.BACKENDS,
+                      help="backend de kernels de los modelos (ver tacosim.kernels)")
+  parser.add_argument("--fail-on-regression", action="store_true",
+                      help="salir con código 1 si hay regresiones")
+  args = parser.parse_args(argv)
+
+  # Los modelos escriben a logging en debug; en los benchmarks no debe costar nada
+  logging.getLogger("tacosim").setLevel(logging.WARNING)
+
+  # Backend efectivo: "auto" se resuelve a "numba" o "python"
+  backend = "python" if kernels.load(args.backend) is None else "numba"
+  cases = make_cases(quick=args.quick, backend=backend)
+  if args.filter:
+    cases = [c for c in cases if args.filter in case_key(c)]
+
+  machine = machine_info()
+  history = load_history(args.history)
+  prev = previous_run(history, machine, backend)
+  prev_results = prev["results"] if prev else {}
+
+  results = {}
+  regressions = []
+  for case in cases:
+    key = case_key(case)
+    times = measure(case, args.repeat)
+    median = statistics.median(times)
+    results[key] = {"median": median, "min": min(times), "samples": len(times)}
+
+    note = ""
+    if key in prev_results:
+      ratio = median / prev_results[key]["median"]
+      note = f"x{ratio:.2f}"
+      if ratio > args.threshold:
+        note += "  REGRESIÓN"
+        regressions.append((key, ratio))
+    print(f"{key:70s} {_human(median)}  (min {_human(min(times)).strip()})  {note}", flush=True)
+
+  run = {
+    "commit": _git("rev-parse", "--short", "HEAD"),
+    "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+    "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    "quick": args.quick,
+    "backend": backend,
+    "machine": machine,
+    "results": results,
+  }
+  if not args.no_save:
+    history.append(run)
+    save_history(args.history, history)
+
+  if prev:
+    print(f"\nComparado contra {prev['commit']} ({prev['timestamp']})")
+  if regressions:
+    print(f"{len(regressions)} regresión(es) por encima de x{args.threshold}:")
+    for key, ratio in regressions:
+      print(f"  {key}: x{ratio:.2f}")
+    if args.fail_on_regression:
+      return 1
+  return 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
@@ -0,0 +1,23 @@
+# Núcleo del simulador TacoRescue como paquete importable.
+# Un solo motor (reglas del fuego, POIs y acciones) con políticas
+# intercambiables: TacoRescueModel(policy="random" | "strategic" | "mcts").
+# Importarlo no ejecuta ninguna partida ni carga matplotlib; los demos viven en
+# TacoRescue.main() y TacoRescueStrat.main().
+from .pathfinding import PriorityQueue
+from .agent import TacoRescueAgent
+from .policies import POLICIES, MCTSPolicy, RandomPolicy, StrategicPolicy, make_policy
+from .model import TacoRescueModel
+from .render import get_grid, animate_grids
+
+__all__ = [
+  "MCTSPolicy",
+  "POLICIES",
+  "PriorityQueue",
+  "RandomPolicy",
+  "StrategicPolicy",
+  "TacoRescueAgent",
+  "TacoRescueModel",
+  "animate_grids",
+  "get_grid",
+  "make_policy",
+]
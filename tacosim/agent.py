@@ -0,0 +1,752 @@
+# Agente estratégico: busca POIs y fuego con A*/Dijkstra sobre el tablero.
+import logging
+import time
+
+from .occupancy import NO_TARGET
+from .pathfinding import PriorityQueue
+from .risk import no_risk
+
+logger = logging.getLogger(__name__)
+
+# AP que recupera un agente por turno y máximo que puede acumular
+AP_PER_TURN = 4
+MAX_AP = 8
+
+# Cada cuántos nodos expandidos revisa A* si venció el presupuesto del paso y
+# cuántos expande como máximo la búsqueda de respaldo ya vencido
+DEADLINE_CHECK = 64
+FALLBACK_EXPANSIONS = 256
+
+# El estado del agente (posición, AP, víctima, objetivo) vive en los arreglos
+# de model.grid (tacosim.occupancy); el agente es una vista sobre su fila
+# 'slot', que se asigna al colocarlo con model.grid.place_agent.
+class TacoRescueAgent:
+  __slots__ = ("model", "id", "uid", "slot", "path")
+
+  def __init__(self, model, id):
+    self.model = model
+    self.id = id
+    self.uid = None
+    self.slot = None
+    self.path = []
+
+  # Al copiar o serializar se usa la clase original aunque el agente esté
+  # instrumentado (tacosim.metrics cambia su clase por una subclase)
+  def __reduce__(self):
+    cls = type(self)
+    while "_metrics" in vars(cls):
+      cls = cls.__base__
+    return (_restore_agent, (cls, self.model, self.id, self.uid, self.slot, self.path))
+
+  @property
+  def pos(self):
+    x, y = self.model.grid.pos[self.slot]
+    return (int(x), int(y))
+
+  @property
+  def AP(self):
+    return int(self.model.grid.AP[self.slot])
+
+  @AP.setter
+  def AP(self, value):
+    self.model.grid.set_AP(self.slot, value)
+
+  @property
+  def carrying_victim(self):
+    return bool(self.model.grid.carrying[self.slot])
+
+  @carrying_victim.setter
+  def carrying_victim(self, value):
+    self.model.grid.set_carrying(self.slot, value)
+
+  @property
+  def target(self):
+    x, y = self.model.grid.target[self.slot]
+    return None if x == NO_TARGET else (int(x), int(y))
+
+  @target.setter
+  def target(self, value):
+    self.model.grid.target[self.slot] = (NO_TARGET, NO_TARGET) if value is None else value
+
+  # Método que recarga 4 AP por turno (límite = 8)
+  def refill_ap(self):
+    self.AP += AP_PER_TURN
+    if self.AP > MAX_AP:
+      self.AP = MAX_AP
+
+  # Método que verifica si se tienen suficientes AP para una acción
+  def can_spend(self, cost):
+    return self.AP >= cost
+
+  # Método que resta AP si el agente tiene suficientes
+  def spend_AP(self, cost):
+    if self.AP >= cost:
+      self.AP -= cost
+      return True
+    return False
+
+  # Método que retorna el estado de una celda:
+  # 0: Vacío | 1 = Humo | 2 = Fuego
+  def space_state(self, pos):
+    x, y = pos
+    return int(self.model.fire[x][y])
+
+  # Método que extingue humo de la celda (1AP)
+  def remove_smoke(self, pos):
+    if self.space_state(pos) != 1:
+      return False
+    if self.spend_AP(1):
+      x, y = pos
+      self.model.set_fire(x, y, 0)
+      self.model.events.record("remove_smoke", self.model.steps, self.id, (x, y))
+      return True
+    return False
+
+  # Método que extingue fuego de la celda (2AP)
+  def extinguish_fire(self, pos):
+    if self.space_state(pos) != 2:
+      return False
+    if self.spend_AP(2):
+      x, y = pos
+      self.model.set_fire(x, y, 0)
+      self.model.events.record("extinguish_fire", self.model.steps, self.id, (x, y))
+      logger.debug("uid=%s at %s -> extinguish fire", self.uid, self.pos)
+      return True
+    return False
+
+  # Método que convierte fuego en humo en la celda (1AP)
+  def fire_to_smoke(self, pos):
+    if self.space_state(pos) != 2:
+      return False
+    if self.spend_AP(1):
+      x, y = pos
+      self.model.set_fire(x, y, 1)
+      return True
+    return False
+
+  # Método que recoge una víctima de la celda
+  def pick_up_victim(self, pos):
+    if self.carrying_victim:
+      return False
+    if self.model.poi[pos] != 1:
+      return False
+    if self.model.poi[pos] == 1 and self.space_state(self.pos) != 2:
+      self.carrying_victim = True
+      self.model.set_poi(pos[0], pos[1], 0)
+      self.model.poi_unknown.remove(pos)
+      self.model.unassign_poi(pos)
+      self.model.victims_on_board += 1
+      self.model.events.record("pick_up_victim", self.model.steps, self.id, pos)
+      return True
+
+    return False
+
+  # Método que revela una falsa alarma en la celda
+  def remove_false_alarm(self, pos):
+    if self.model.poi[pos] != 2:
+      return False
+    self.model.set_poi(pos[0], pos[1], 0)
+    if pos in self.model.poi_unknown:
+      self.model.poi_unknown.remove(pos)
+    self.model.unassign_poi(pos)
+    self.model.events.record("remove_false_alarm", self.model.steps, self.id, pos)
+    return True
+
+  # Método que deja a la víctima en una entrada segura
+  def drop_off_victim(self, pos):
+    if not self.carrying_victim:
+      return False
+    if pos in self.model.entry_set and self.space_state(self.pos) != 2:
+      self.carrying_victim = False
+      self.model.rescued_count += 1
+      self.model.victims_on_board -= 1
+      self.model.events.record("drop_off_victim", self.model.steps, self.id, pos)
+      return True
+    return False
+
+  # Método que revisa si hay una puerta entre dos celdas
+  def is_door_between(self, pos, target_pos):
+    return (pos in self.model.doors and self.model.doors[pos] == target_pos)
+
+  # Método que revisa si una puerta entre dos celdas está cerrada
+  def is_door_closed(self, pos, target_pos):
+    if not self.is_door_between(pos, target_pos):
+      return False
+    x1, y1 = pos
+    x2, y2 = target_pos
+    dx, dy = x2 - x1, y2 - y1
+    if dx == 1:
+      wall = 1
+    elif dx == -1:
+      wall = 3
+    elif dy == 1:
+      wall = 0
+    elif dy == -1:
+      wall = 2
+    else:
+      return False
+    return self.model.walls[y1][x1][wall] == 1
+
+  # Método que revisa si hay una pared entre dos celdas
+  def is_wall_between(self, pos1, pos2):
+    x1, y1 = pos1
+    x2, y2 = pos2
+    dx, dy = x2 - x1, y2 - y1
+    if dx == 1:
+      wall = 1
+    elif dx == -1:
+      wall = 3
+    elif dy == 1:
+      wall = 0
+    elif dy == -1:
+      wall = 2
+    else:
+      return False
+    return self.model.walls[y1][x1][wall] == 1
+
+  # Método que abre una puerta entre dos celdas
+  def open_door(self, target_pos):
+    if not self.is_door_between(self.pos, target_pos):
+      return
+    x1, y1 = self.pos
+    x2, y2 = target_pos
+    dx, dy = x2 - x1, y2 - y1
+    if dx == 1:
+      wall = 1
+      opp = 3
+    elif dx == -1:
+      wall = 3
+      opp = 1
+    elif dy == 1:
+      wall = 0
+      opp = 2
+    elif dy == -1:
+      wall = 2
+      opp = 0
+    else:
+      return
+    self.model.set_wall(x1, y1, wall, 0)
+    self.model.set_wall(x2, y2, opp, 0)
+    self.model.walls_changed(x1, y1, x2, y2)
+    self.model.events.record("open_door", self.model.steps, self.id, (x1, y1), (x2, y2))
+
+  # Método que daña una pared entre dos celdas; si llega a 2 daños, se destruye.
+  def damage_wall(self, pos1, pos2):
+    if not self.is_wall_between(pos1, pos2):
+      return
+    x1, y1 = pos1
+    x2, y2 = pos2
+    dx, dy = x2 - x1, y2 - y1
+    if dx == 1:
+      wall = 1
+      opp = 3
+    elif dx == -1:
+      wall = 3
+      opp = 1
+    elif dy == 1:
+      wall = 0
+      opp = 2
+    elif dy == -1:
+      wall = 2
+      opp = 0
+    else:
+      return
+
+    # Acumula daño (2 golpes -> se destruye)
+    if self.model.walls[y1][x1][wall] == 1:
+        damage = self.model.add_wall_damage(x1, y1, wall)
+        self.model.damage += 1
+        if damage == 2:
+            self.model.set_wall(x1, y1, wall, 0)
+            self.model.events.record("demolish_wall", self.model.steps, self.id, (x1, y1), (x2, y2))
+        else:
+          self.model.events.record("damage_wall", self.model.steps, self.id, (x1, y1), (x2, y2))
+
+    # También daña la pared opuesta en la celda vecina
+    if 0 <= x2 < self.model.grid.width and 0 <= y2 < self.model.grid.height:
+      if self.model.walls[y2][x2][opp] == 1:
+        if self.model.add_wall_damage(x2, y2, opp) >= 2:
+          self.model.set_wall(x2, y2, opp, 0)
+    self.model.walls_changed(x1, y1, x2, y2)
+
+  # Método que calcula el costo en AP de moverse a una celda ('carrying' evita
+  # releer el estado del agente en cada vecino durante una búsqueda)
+  def calculate_cost(self, target_pos, carrying=None):
+    spaceState = self.space_state(target_pos)
+    if carrying is None:
+      carrying = self.carrying_victim
+    if carrying:
+      if spaceState == 2:
+        return None
+      return 2
+    else:
+      if spaceState == 2:
+        return 2
+      return 1
+
+  # Método que devuelve la posición de la entrada más cercana al agente
+  # (tabla precalculada por el mapa)
+  def nearest_entry(self):
+    x, y = self.pos
+    return self.model.board_map.nearest_entry[x][y]
+
+  # Método que revisa si la celda actual es una entrada
+  def is_entry(self):
+    return self.pos in self.model.entry_set
+
+  # Método que noquea al agente: pierde a la víctima y es movido a una entrada
+  def knock_out(self):
+    if self.carrying_victim == True:
+      self.carrying_victim = False
+      self.model.lost_victims += 1
+      self.model.victims_on_board -= 1
+    self.model.grid.move_agent(self, self.nearest_entry())
+    self.model.events.record("knock_out", self.model.steps, self.id, self.pos)
+    logger.debug("knock_out: uid=%s at %s", self.uid, self.pos)
+    return True
+
+  # Método que intenta mover al agente a una celda adyacente considerando muros, puertas y fuego.
+  # Con persist=False abrir una puerta o golpear una pared consume el intento
+  # (el agente no avanza); con persist=True abre y sigue golpeando mientras tenga AP.
+  def try_move(self, target_pos, persist=True):
+    cost = self.calculate_cost(target_pos)
+    if cost is None:
+      return False
+
+    spaceState = self.space_state(target_pos)
+    if spaceState == 2:
+      if self.AP < cost + 1:
+        return False
+
+    # Si hay puerta cerrada, intenta abrirla gastando 1 AP
+    if self.is_door_between(self.pos, target_pos):
+      if self.is_door_closed(self.pos, target_pos):
+        if not self.can_spend(1):
+          return False
+        self.open_door(target_pos)
+        self.spend_AP(1)
+        logger.debug("uid=%s at %s -> opened door to %s", self.uid, self.pos, target_pos)
+        if not persist:
+          return False
+
+    # Si hay pared, intenta dañarla gastando 2 AP
+    if self.is_wall_between(self.pos, target_pos):
+      while self.is_wall_between(self.pos, target_pos) and self.can_spend(2):
+        self.damage_wall(self.pos, target_pos)
+        self.spend_AP(2)
+        logger.debug("uid=%s at %s -> damaged wall toward %s", self.uid, self.pos, target_pos)
+        if not persist:
+          return False
+
+      # Si después de gastar AP todavía hay pared, no puede moverse
+      if self.is_wall_between(self.pos, target_pos):
+        return False
+      # si logró destruirla, el bucle termina y continúa para intentar moverse
+
+    # Revisar si el agente tiene suficiente AP
+    if not self.can_spend(cost):
+      return False
+
+    # Mover al agente a la celda objetivo
+    self.spend_AP(cost)
+    self.model.grid.move_agent(self, target_pos)
+    self.model.events.record("move", self.model.steps, self.id, self.pos)
+    logger.debug("Agent uid=%s moved to %s (target was %s)", self.uid, self.pos, target_pos)
+    return True
+
+  # Método que obtiene los vecinos de una celda y calcula el coste de pasar por ellos (para A*).
+  def neighbors_for_path(self, pos):
+    x, y = pos
+    candidates = []
+    directions = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+    carrying = self.carrying_victim
+    weights = self.model.weights
+    # Costo extra por el riesgo de que la celda se encienda (ver tacosim.risk)
+    risk = None if self.model.risk is None else self.model.risk.costs()
+
+    for dx, dy in directions:
+      nx, ny = x + dx, y + dy
+      if not (0 <= nx < self.model.grid.width and 0 <= ny < self.model.grid.height):
+        continue
+
+      # Calcular el costo base de moverse hacia la celda vecina
+      cost = self.calculate_cost((nx, ny), carrying)
+      if cost is None:
+        continue
+
+      # Calcular el costo extra considerando puertas y paredes
+      extra = 0
+      if self.is_door_between(pos, (nx, ny)):
+        if self.is_door_closed(pos, (nx, ny)):
+          extra += weights.door
+      elif self.is_wall_between(pos, (nx, ny)):
+        extra += weights.wall
+
+      if risk is None:
+        candidates.append(((nx, ny), float(cost + extra)))
+      else:
+        candidates.append(((nx, ny), float(cost + extra) + float(risk[nx, ny])))
+    return candidates
+
+  # Método que define la heurística para A*: cota inferior del costo de a a b
+  # con landmarks (ver tacosim.landmarks), nunca menor que la distancia Manhattan
+  def heuristic(self, a, b):
+    return self.model.landmarks.estimate(a, b)
+
+  # Método que implementa el algoritmo A* para calcular una ruta entre dos celdas
+  def a_star(self, start, goal):
+    if start == goal:
+      return []
+    if not self._reachable(start, goal, "a_star"):
+      return None
+    if self._out_of_time():
+      return self._a_star_fallback(start, goal)
+    if self.model.rooms is not None and self.model.risk is None:
+      planned = self._plan_rooms(start, goal, "a_star")
+      if planned is not None:
+        return planned[1]
+    if self.model.kernels is not None:
+      return self._a_star_kernel(start, goal)
+    return self._a_star_grid(start, goal, self.model.deadline)
+
+  # A* celda por celda. Con 'deadline' (perf_counter) o 'max_expanded' la
+  # búsqueda puede cortarse: entonces regresa la ruta parcial hacia el nodo
+  # expandido más cercano al objetivo según la heurística
+  def _a_star_grid(self, start, goal, deadline=None, max_expanded=None):
+    _, h = self.model.landmarks.heuristic_to(goal)
+    pq = PriorityQueue()
+    pq.push(0.0, start)
+    prev = {start: None}
+    dist = {start: 0.0}
+    expanded = 0
+    closest = start
+    cut = False
+
+    while not pq.empty():
+      _, current = pq.top()
+      pq.pop()
+      expanded += 1
+
+      if current == goal:
+        break
+      if h[current[0]][current[1]] < h[closest[0]][closest[1]]:
+        closest = current
+      if (max_expanded is not None and expanded >= max_expanded) or (
+          deadline is not None and expanded % DEADLINE_CHECK == 0 and time.perf_counter() >= deadline):
+        cut = True
+        break
+
+      # Explorar vecinos del nodo actual
+      for neighbor, step_cost in self.neighbors_for_path(current):
+        new_dist = dist[current] + step_cost
+        if neighbor not in dist or new_dist < dist[neighbor]:
+          dist[neighbor] = new_dist
+          priority = new_dist + h[neighbor[0]][neighbor[1]]
+          pq.push(priority, neighbor)
+          prev[neighbor] = current
+
+    if self.model.metrics is not None:
+      self.model.metrics.observe("search.a_star.expanded", expanded)
+
+    if cut:
+      if self.model.metrics is not None:
+        self.model.metrics.count("budget.partial_path")
+      goal = closest
+    elif goal not in prev:
+      return None
+
+    # Reconstrucción de la ruta desde el objetivo hacia el inicio
+    path = []
+    cur = goal
+    while cur != start:
+      path.append(cur)
+      cur = prev[cur]
+    path.reverse()
+    return path
+
+  # Ruta cuando ya venció el presupuesto del paso: la que el agente ya tenía
+  # hacia el mismo objetivo si sigue empezando junto a él, o si no una
+  # búsqueda de a lo más FALLBACK_EXPANSIONS nodos (ruta parcial)
+  def _a_star_fallback(self, start, goal):
+    path = self.path
+    metrics = self.model.metrics
+    if (path and path[-1] == goal and self.target == goal
+        and abs(path[0][0] - start[0]) + abs(path[0][1] - start[1]) == 1):
+      if metrics is not None:
+        metrics.count("budget.cached_path")
+      return list(path)
+    if metrics is not None:
+      metrics.count("budget.bounded_search")
+    return self._a_star_grid(start, goal, max_expanded=FALLBACK_EXPANSIONS)
+
+  # Método que calcula el coste mínimo entre dos celdas. Es A* con la misma
+  # heurística que a_star: al ser consistente, el costo es el de Dijkstra.
+  def shortest_cost(self, start, goal):
+    if start == goal:
+      return 0
+    if not self._reachable(start, goal, "shortest_cost"):
+      return None
+    if self.model.rooms is not None and self.model.risk is None:
+      planned = self._plan_rooms(start, goal, "shortest_cost")
+      if planned is not None:
+        return planned[0]
+    if self.model.kernels is not None:
+      return self._shortest_cost_kernel(start, goal)
+
+    _, h = self.model.landmarks.heuristic_to(goal)
+    pq = PriorityQueue()
+    pq.push(h[start[0]][start[1]], start)
+    dist = {start: 0.0}
+    expanded = 0
+
+    while not pq.empty():
+      priority, current = pq.top()
+      pq.pop()
+
+      curr_cost = dist[current]
+      if priority > curr_cost + h[current[0]][current[1]]:
+        continue
+      expanded += 1
+
+      # Si llegamos al objetivo, devolvemos el coste mínimo
+      if current == goal:
+        if self.model.metrics is not None:
+          self.model.metrics.observe("search.shortest_cost.expanded", expanded)
+        return curr_cost
+
+      # Explorar vecinos del nodo actual
+      for neighbor, step_cost in self.neighbors_for_path(current):
+        new_dist = curr_cost + step_cost
+        if neighbor not in dist or new_dist < dist[neighbor]:
+          dist[neighbor] = new_dist
+          pq.push(new_dist + h[neighbor[0]][neighbor[1]], neighbor)
+
+    # Si no se encontró un camino al objetivo
+    if self.model.metrics is not None:
+      self.model.metrics.observe("search.shortest_cost.expanded", expanded)
+    return None
+
+  # Método que calcula el costo mínimo desde 'start' a cada celda que cuesta
+  # a lo más 'radius' (Dijkstra acotado); regresa {celda: costo}. Con
+  # 'targets' termina en cuanto todas esas celdas tienen su costo final
+  def costs_within(self, start, radius, targets=None):
+    pq = PriorityQueue()
+    pq.push(0.0, start)
+    dist = {start: 0.0}
+    final = {}
+    pending = None if targets is None else set(targets)
+
+    while not pq.empty():
+      curr_cost, current = pq.top()
+      pq.pop()
+      if curr_cost > radius:
+        break
+      if current in final:
+        continue
+      final[current] = curr_cost
+      if pending is not None:
+        pending.discard(current)
+        if not pending:
+          break
+
+      for neighbor, step_cost in self.neighbors_for_path(current):
+        new_dist = curr_cost + step_cost
+        if new_dist <= radius and (neighbor not in dist or new_dist < dist[neighbor]):
+          dist[neighbor] = new_dist
+          pq.push(new_dist, neighbor)
+
+    if self.model.metrics is not None:
+      self.model.metrics.observe("search.costs_within.expanded", len(final))
+    return final
+
+  # Si la búsqueda puede llegar (ver tacosim.connectivity); las que no se
+  # descartan sin expandir nodos
+  def _reachable(self, start, goal, search):
+    model = self.model
+    if model.connectivity.reachable(start, goal, self.carrying_victim):
+      return True
+    if model.metrics is not None:
+      model.metrics.count(f"search.{search}.pruned")
+    return False
+
+  # Ruta y costo sobre el grafo de cuartos (ver tacosim.rooms); None si no
+  # encontró ruta y hay que buscar celda por celda. Con mapa de riesgo no se
+  # usa: las tablas por cuarto no incluyen ese costo
+  def _plan_rooms(self, start, goal, search):
+    model = self.model
+    cost, path, expanded = model.rooms.plan(start, goal, self.carrying_victim)
+    if model.metrics is not None:
+      model.metrics.observe(f"search.{search}.expanded", expanded)
+    if path is None:
+      return None
+    return cost, path
+
+  # Versiones compiladas de a_star y shortest_cost (ver tacosim.kernels);
+  # mismos resultados y mismo conteo de nodos expandidos
+  def _a_star_kernel(self, start, goal):
+    model = self.model
+    h, _ = model.landmarks.heuristic_to(goal)
+    path, found, expanded = model.kernels.a_star(
+      model.fire, model.walls, model.door_dirs, self._risk_costs(),
+      float(model.weights.door), float(model.weights.wall), h, bool(self.carrying_victim),
+      int(start[0]), int(start[1]), int(goal[0]), int(goal[1]))
+    if model.metrics is not None:
+      model.metrics.observe("search.a_star.expanded", expanded)
+    if not found:
+      return None
+    return [(int(x), int(y)) for x, y in path]
+
+  # Costo extra de entrar a cada celda para los kernels (ver tacosim.risk)
+  def _risk_costs(self):
+    model = self.model
+    if model.risk is None:
+      return no_risk(model.grid.width, model.grid.height)
+    return model.risk.costs()
+
+  def _shortest_cost_kernel(self, start, goal):
+    model = self.model
+    h, _ = model.landmarks.heuristic_to(goal)
+    cost, expanded = model.kernels.shortest_cost(
+      model.fire, model.walls, model.door_dirs, self._risk_costs(),
+      float(model.weights.door), float(model.weights.wall), h, bool(self.carrying_victim),
+      int(start[0]), int(start[1]), int(goal[0]), int(goal[1]))
+    if model.metrics is not None:
+      model.metrics.observe("search.shortest_cost.expanded", expanded)
+    if cost < 0:
+      return None
+    return cost
+
+  # Método que selecciona el POI más cercano en coste de AP
+  def nearest_poi(self):
+    if self.model.horizon is not None:
+      return self._nearest_bounded(list(self.model.poi_unknown), ties_last=True)
+    if self.model.deadline is not None:
+      return self._nearest_anytime(list(self.model.poi_unknown), 0, ties_last=True)
+
+    best = None
+    best_cost = None
+
+    for px, py in list(self.model.poi_unknown):
+
+      # Calcular coste de movimiento hasta este POI
+      move_cost = self.shortest_cost(self.pos, (px, py))
+      if move_cost is None:
+        continue
+
+      # Guardar el mejor candidato
+      if best is None or move_cost <= best_cost:
+        best = (px, py)
+        best_cost = move_cost
+
+    return best
+
+  # Método que selecciona la casilla de fuego más cercana en coste de AP
+  def nearest_fire(self):
+    if self.model.horizon is not None:
+      return self._nearest_bounded(sorted(self.model.fire_front.fire), ties_last=False)
+    if self.model.deadline is not None:
+      return self._nearest_anytime(sorted(self.model.fire_front.fire), 2, ties_last=False)
+
+    best = None
+    best_cost = None
+
+    # Recorrer solo las celdas con fuego, en el mismo orden que el grid (x, y)
+    pos = self.pos
+    for (ix, iy) in sorted(self.model.fire_front.fire):
+      # Calcular el coste de movimiento hasta esta celda
+      move_cost = self.shortest_cost(pos, (ix, iy))
+      if move_cost is None:
+        continue
+
+      # Coste adicional de la acción al llegar: 2 AP para fuego
+      action_cost = 2
+      total = move_cost + action_cost
+
+      # Guardar el mejor candidato
+      if best is None or total < best_cost:
+        best = (ix, iy)
+        best_cost = total
+
+    return best
+
+  # Modo acotado de nearest_poi / nearest_fire (model.horizon turnos): una
+  # sola búsqueda hasta el radio de AP de esos turnos da el costo exacto de
+  # los objetivos cercanos, que siempre ganan; los lejanos se ordenan por la
+  # cota de los landmarks. Si hay algún objetivo dentro del radio el
+  # resultado es el mismo que el del modo exacto.
+  def _nearest_bounded(self, targets, ties_last):
+    model = self.model
+    pos = self.pos
+    near = self.costs_within(pos, model.horizon * MAX_AP)
+    carrying = self.carrying_victim
+    best = None
+    best_key = None
+    for target in targets:
+      if target in near:
+        key = (0, near[target])
+      elif model.connectivity.reachable(pos, target, carrying):
+        key = (1, model.landmarks.estimate(pos, target))
+      else:
+        continue
+      if best is None or (key <= best_key if ties_last else key < best_key):
+        best = target
+        best_key = key
+    return best
+
+  # Modo con presupuesto de nearest_poi / nearest_fire (model.deadline): busca
+  # el costo de los objetivos de menor a mayor cota de los landmarks y para
+  # cuando la cota ya no puede ganarle al mejor ('extra' = AP de la acción al
+  # llegar). Si termina a tiempo el resultado es el del modo exacto; si vence
+  # regresa el mejor encontrado o, sin ninguno, el alcanzable de menor cota
+  def _nearest_anytime(self, targets, extra, ties_last):
+    model = self.model
+    pos = self.pos
+    estimate = model.landmarks.estimate
+    bounds = [estimate(pos, target) + extra for target in targets]
+    order = sorted(range(len(targets)), key=lambda i: (bounds[i], i))
+    best = None
+    best_key = None
+    expired = False
+    for i in order:
+      if best_key is not None and bounds[i] > best_key[0]:
+        break
+      if self._out_of_time():
+        expired = True
+        break
+      cost = self.shortest_cost(pos, targets[i])
+      if cost is None:
+        continue
+      # Empates como en el modo exacto: el último POI y el primer fuego
+      key = (cost + extra, -i if ties_last else i)
+      if best is None or key < best_key:
+        best = targets[i]
+        best_key = key
+
+    if expired and best is None:
+      carrying = self.carrying_victim
+      for i in order:
+        if model.connectivity.reachable(pos, targets[i], carrying):
+          best = targets[i]
+          break
+    if expired and model.metrics is not None:
+      model.metrics.count("budget.nearest_expired")
+    return best
+
+  # Si ya venció el presupuesto de planificación del paso
+  def _out_of_time(self):
+    deadline = self.model.deadline
+    return deadline is not None and time.perf_counter() >= deadline
+
+  # Método que representa el paso (turn) del agente: recarga AP y delega
+  # la decisión a la política del modelo
+  def step(self):
+    self.refill_ap()
+    self.model.policy.take_turn(self)
+
+
+def _restore_agent(cls, model, id, uid, slot, path):
+  agent = cls(model, id)
+  agent.uid = uid
+  agent.slot = slot
+  agent.path = path
+  return agent
@@ -0,0 +1,135 @@
+# Asignación de POIs a agentes por ronda (TacoRescueModel(allocation=...)).
+#
+#   "greedy"     cada agente busca su POI más cercano (nearest_poi); varios
+#                pueden ir por el mismo
+#   "hungarian"  al empezar cada ronda se calcula un solo campo de distancias
+#                por agente libre (costs_within sin límite), se arma la matriz
+#                agentes x POIs y se resuelve la asignación de costo total
+#                mínimo con el método húngaro; se registra con
+#                model.assign_poi y los agentes la consumen en lugar de
+#                buscar. Los agentes sin POI van al fuego.
+# La asignación se recalcula con la primera petición de cada ronda (la haga
+# el agente que la haga) y cuando a un agente se le acaba la suya (el POI se
+# reveló, se recogió o se quemó).
+import math
+
+ALLOCATIONS = ("greedy", "hungarian")
+
+# Costo para un POI al que el agente no puede llegar
+UNREACHABLE = 1e9
+
+
+# Función que resuelve la asignación de costo mínimo de una matriz (lista de
+# filas); regresa la columna de cada fila (None si sobran filas)
+def solve_assignment(cost):
+  n = len(cost)
+  m = len(cost[0]) if n else 0
+  if n == 0 or m == 0:
+    return [None] * n
+  if n > m:
+    # Se resuelve la traspuesta y se invierte
+    columns = solve_assignment([list(col) for col in zip(*cost)])
+    rows = [None] * n
+    for j, i in enumerate(columns):
+      rows[i] = j
+    return rows
+
+  # Método húngaro con potenciales, O(n^2 m); índices desde 1, p[j] es la
+  # fila asignada a la columna j
+  inf = float("inf")
+  u = [0.0] * (n + 1)
+  v = [0.0] * (m + 1)
+  p = [0] * (m + 1)
+  way = [0] * (m + 1)
+  for i in range(1, n + 1):
+    p[0] = i
+    j0 = 0
+    minv = [inf] * (m + 1)
+    used = [False] * (m + 1)
+    while True:
+      used[j0] = True
+      i0 = p[j0]
+      row = cost[i0 - 1]
+      delta = inf
+      j1 = 0
+      for j in range(1, m + 1):
+        if not used[j]:
+          cur = row[j - 1] - u[i0] - v[j]
+          if cur < minv[j]:
+            minv[j] = cur
+            way[j] = j0
+          if minv[j] < delta:
+            delta = minv[j]
+            j1 = j
+      for j in range(m + 1):
+        if used[j]:
+          u[p[j]] += delta
+          v[j] -= delta
+        else:
+          minv[j] -= delta
+      j0 = j1
+      if p[j0] == 0:
+        break
+    while j0:
+      j1 = way[j0]
+      p[j0] = p[j1]
+      j0 = j1
+
+  rows = [None] * n
+  for j in range(1, m + 1):
+    if p[j]:
+      rows[p[j] - 1] = j - 1
+  return rows
+
+
+class TaskAllocator:
+  def __init__(self, model):
+    self.model = model
+    self.allocated_at = None
+    # Ronda del último reparto: model.steps - model.current_index no cambia
+    # durante una ronda, sin importar qué agente pida primero
+    self.round = None
+    # POI repartido a cada agente en la última asignación (None si se quedó
+    # sin POI)
+    self.plan = {}
+
+  # Método que reparte los POIs desconocidos entre los agentes que no cargan
+  # víctima
+  def allocate(self):
+    model = self.model
+    self.allocated_at = model.steps
+    self.round = model.steps - model.current_index
+    model.assigned_pois.clear()
+    agents = [agent for agent in model.grid.agents if not agent.carrying_victim]
+    pois = list(model.poi_unknown)
+    self.plan = {agent.uid: None for agent in agents}
+    if not agents or not pois:
+      return
+
+    # Un Dijkstra por agente da su fila completa de la matriz
+    matrix = []
+    for agent in agents:
+      field = agent.costs_within(agent.pos, math.inf, targets=pois)
+      matrix.append([field.get(poi, UNREACHABLE) for poi in pois])
+    for agent, row, j in zip(agents, matrix, solve_assignment(matrix)):
+      if j is not None and row[j] < UNREACHABLE:
+        model.assign_poi(pois[j], agent.uid)
+        self.plan[agent.uid] = pois[j]
+
+  # Método que regresa el POI asignado al agente (None si no tiene); reparte
+  # de nuevo si cambió la ronda, si su POI ya no existe o si el agente no
+  # estaba libre en el último reparto
+  def target_for(self, agent):
+    model = self.model
+    if self.allocated_at != model.steps:
+      lost = self.plan.get(agent.uid) is not None and self._assigned(agent) is None
+      new_round = self.round != model.steps - model.current_index
+      if new_round or lost or agent.uid not in self.plan:
+        self.allocate()
+    return self._assigned(agent)
+
+  def _assigned(self, agent):
+    for pos, uid in self.model.assigned_pois.items():
+      if uid == agent.uid:
+        return pos
+    return None
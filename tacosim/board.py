@@ -0,0 +1,25 @@
+# Tablero inicial compartido por todos los motores (escalar y por lotes).
+
+# Cada celda tiene un array de 4 paredes: [arriba, derecha, abajo, izquierda]
+# 0: No hay pared / puerta abierta | 1: Si hay pared / puerta cerrada
+# Indexado como WALLS[y][x][pared]; las entradas quedan abiertas al exterior.
+WALLS = [
+  [[0,0,1,1],[0,0,1,0],[0,0,0,0],[0,0,1,0],[0,1,1,0],[0,0,1,1],[0,1,1,0],[0,1,1,1]],
+  [[1,0,0,1],[1,0,0,0],[1,0,0,0],[1,0,0,0],[1,1,0,0],[1,0,0,1],[1,1,0,0],[1,1,0,1]],
+  [[0,0,1,1],[0,1,1,0],[0,0,1,1],[0,0,1,0],[0,0,1,0],[0,1,1,0],[0,0,1,1],[0,0,1,0]],
+  [[0,0,0,0],[0,1,0,0],[1,0,0,1],[1,0,0,0],[1,0,0,0],[1,1,0,0],[1,0,0,1],[1,1,0,0]],
+  [[0,0,0,1],[0,0,0,0],[0,1,1,0],[0,0,1,1],[0,1,1,0],[0,0,1,1],[0,0,1,0],[0,1,1,0]],
+  [[1,0,0,1],[1,0,0,0],[1,1,0,0],[1,0,0,1],[1,1,0,0],[0,0,0,1],[1,0,0,0],[1,1,0,0]]]
+
+VICTIMS = [(3,4), (7,1)]
+FALSE_ALARMS = [(0,1)]
+FIRE_POS = [(1,4),(1,3),(2,4),(2,3),(3,3),(3,2),(4,3),(5,1),(5,0),(6,1)]
+ENTRIES = [(5,5),(0,3),(7,2),(2,0)]
+DOORS_POS = [(1,3,2,3),(2,5,3,5),(3,2,3,1),(4,4,5,4),(4,0,5,0),(5,2,6,2),(6,0,7,0),(7,4,7,3)]
+
+# Tamaño de la 'bolsa' de POIs (incluye los que arrancan en el tablero)
+TOTAL_VICTIMS = 10
+TOTAL_FALSE_ALARMS = 5
+
+# Índice en ENTRIES donde arranca cada agente (se repite si hay más de 6)
+START_ENTRIES = [3, 0, 2, 2, 0, 1]
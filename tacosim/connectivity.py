@@ -0,0 +1,95 @@
+# Índice de conectividad para descartar búsquedas imposibles.
+#
+# Con las reglas de calculate_cost toda celda vecina es alcanzable (las
+# paredes y puertas solo cuestan más), salvo que el agente cargue una
+# víctima: entonces las celdas con fuego son infranqueables. Este índice
+# etiqueta las componentes de celdas sin fuego con union-find:
+#   - una celda que deja de tener fuego entra como nodo nuevo y se une a sus
+#     vecinas sin fuego (fusión incremental)
+#   - una celda que se incendia puede partir su componente; si tiene dos o
+#     más vecinas sin fuego el índice se marca como viejo y se vuelve a
+#     etiquetar en la siguiente consulta
+# reachable() responde en O(1) amortizado si una búsqueda puede llegar.
+from .firefront import DIRECTIONS
+
+
+class Connectivity:
+  def __init__(self, model):
+    self.model = model
+    self.rebuilds = 0
+    self.rebuild()
+
+  # Etiqueta todas las componentes desde cero
+  def rebuild(self):
+    width, height = self.model.grid.width, self.model.grid.height
+    fire = self.model.fire
+    self.passable = [[fire[x][y] != 2 for y in range(height)] for x in range(width)]
+    # Nodo de union-find de cada celda (x * height + y) y padre de cada nodo
+    self.node = list(range(width * height))
+    self.parent = list(range(width * height))
+    for x in range(width):
+      for y in range(height):
+        if not self.passable[x][y]:
+          continue
+        if x + 1 < width and self.passable[x + 1][y]:
+          self._union(x * height + y, (x + 1) * height + y)
+        if y + 1 < height and self.passable[x][y + 1]:
+          self._union(x * height + y, x * height + y + 1)
+    self.stale = False
+    self.rebuilds += 1
+
+  def _find(self, i):
+    parent = self.parent
+    root = i
+    while parent[root] != root:
+      root = parent[root]
+    while parent[i] != root:
+      parent[i], i = root, parent[i]
+    return root
+
+  def _union(self, i, j):
+    ri, rj = self._find(self.node[i]), self._find(self.node[j])
+    if ri != rj:
+      self.parent[max(ri, rj)] = min(ri, rj)
+
+  # Vecinas sin fuego de (x, y)
+  def _open_neighbors(self, x, y):
+    width, height = self.model.grid.width, self.model.grid.height
+    return [(x + dx, y + dy) for dx, dy in DIRECTIONS
+            if 0 <= x + dx < width and 0 <= y + dy < height and self.passable[x + dx][y + dy]]
+
+  # Método que actualiza el índice cuando la celda (x, y) pasa a 'value'
+  def cell_changed(self, x, y, value):
+    passable = value != 2
+    if passable == self.passable[x][y]:
+      return
+    self.passable[x][y] = passable
+    if self.stale:
+      return
+    height = self.model.grid.height
+    neighbors = self._open_neighbors(x, y)
+    if passable:
+      # Nodo nuevo: el anterior puede seguir uniendo a su vieja componente
+      i = x * height + y
+      self.node[i] = len(self.parent)
+      self.parent.append(self.node[i])
+      for (nx, ny) in neighbors:
+        self._union(i, nx * height + ny)
+    elif len(neighbors) > 1:
+      # Con una sola vecina abierta la celda era una punta y no parte nada
+      self.stale = True
+
+  # Método que indica si una búsqueda de 'start' a 'goal' puede llegar
+  def reachable(self, start, goal, carrying):
+    if not carrying:
+      return True
+    gx, gy = goal
+    if not self.passable[gx][gy]:
+      return False
+    if self.stale:
+      self.rebuild()
+    height = self.model.grid.height
+    target = self._find(self.node[gx * height + gy])
+    sx, sy = start
+    sources = [(sx, sy)] if self.passable[sx][sy] else self._open_neighbors(sx, sy)
+    return any(self._find(self.node[x * height + y]) == target for (x, y) in sources)
@@ -0,0 +1,125 @@
+# Registro columnar de eventos del juego.
+# Cada evento es una fila de enteros (step, agente, acción, x1, y1, x2, y2)
+# en un arreglo de numpy que crece al doble cuando se llena. Las acciones se
+# guardan como códigos enteros; los diccionarios que espera Unity solo se
+# construyen al serializar (to_dicts).
+import numpy as np
+
+# Códigos de acción (el índice es el código; no reordenar, se guardan en disco)
+ACTIONS = (
+  "move",
+  "remove_smoke",
+  "extinguish_fire",
+  "pick_up_victim",
+  "drop_off_victim",
+  "remove_false_alarm",
+  "open_door",
+  "damage_wall",
+  "demolish_wall",
+  "knock_out",
+)
+ACTION_CODES = {name: code for code, name in enumerate(ACTIONS)}
+
+# Acciones que involucran dos celdas (pos1 -> pos2); las demás usan 'pos'
+PAIR_ACTIONS = frozenset(ACTION_CODES[a] for a in ("open_door", "damage_wall", "demolish_wall"))
+
+# Columnas del arreglo
+STEP, AGENT, ACTION, X1, Y1, X2, Y2 = range(7)
+COLUMNS = ("step", "agent", "action", "x1", "y1", "x2", "y2")
+NO_POS = -1
+
+DTYPE = np.int32
+
+
+class EventLog:
+  def __init__(self, capacity=256):
+    self._data = np.empty((capacity, len(COLUMNS)), dtype=DTYPE)
+    self._size = 0
+
+  def __len__(self):
+    return self._size
+
+  # Filas válidas (vista, sin copiar)
+  @property
+  def data(self):
+    return self._data[:self._size]
+
+  def column(self, name):
+    return self.data[:, COLUMNS.index(name)]
+
+  def _grow(self):
+    data = np.empty((2 * len(self._data), len(COLUMNS)), dtype=DTYPE)
+    data[:self._size] = self._data[:self._size]
+    self._data = data
+
+  # Método que agrega un evento; pos2 solo aplica a acciones entre dos celdas
+  def record(self, action, step, agent, pos, pos2=None):
+    if self._size == len(self._data):
+      self._grow()
+    x2, y2 = pos2 if pos2 is not None else (NO_POS, NO_POS)
+    self._data[self._size] = (step, agent, ACTION_CODES[action], pos[0], pos[1], x2, y2)
+    self._size += 1
+
+  def clear(self):
+    self._size = 0
+
+  # Índices de los eventos que cumplen todos los filtros dados. 'step',
+  # 'agent' y 'action' aceptan un valor o una lista; 'since' deja los
+  # eventos con step >= since.
+  def select(self, step=None, agent=None, action=None, since=None):
+    data = self.data
+    mask = np.ones(len(data), dtype=bool)
+    if since is not None:
+      mask &= data[:, STEP] >= since
+    if step is not None:
+      mask &= np.isin(data[:, STEP], step)
+    if agent is not None:
+      mask &= np.isin(data[:, AGENT], agent)
+    if action is not None:
+      codes = [ACTION_CODES[a] for a in np.atleast_1d(action)]
+      mask &= np.isin(data[:, ACTION], codes)
+    return np.flatnonzero(mask)
+
+  # Conteo de eventos por acción
+  def counts(self):
+    per_code = np.bincount(self.data[:, ACTION], minlength=len(ACTIONS))
+    return {name: int(n) for name, n in zip(ACTIONS, per_code)}
+
+  # Codificador JSON: lista de diccionarios en el formato que consume Unity
+  def to_dicts(self, rows=None):
+    data = self.data if rows is None else self.data[rows]
+    events = []
+    for step, agent, code, x1, y1, x2, y2 in data.tolist():
+      event = {"step": step, "id": agent, "action": ACTIONS[code]}
+      if code in PAIR_ACTIONS:
+        event["pos1"] = (x1, y1)
+        event["pos2"] = (x2, y2)
+      else:
+        event["pos"] = (x1, y1)
+      events.append(event)
+    return events
+
+  # Codificador binario: filas int32 little-endian, 7 columnas por evento
+  def to_bytes(self, rows=None):
+    data = self.data if rows is None else self.data[rows]
+    return np.ascontiguousarray(data, dtype="<i4").tobytes()
+
+  # EventLog de solo lectura sobre filas existentes (p. ej. un np.memmap)
+  @classmethod
+  def view(cls, rows):
+    log = cls.__new__(cls)
+    log._data = rows
+    log._size = len(rows)
+    return log
+
+  @classmethod
+  def from_bytes(cls, buf):
+    rows = np.frombuffer(buf, dtype="<i4").reshape(-1, len(COLUMNS))
+    log = cls(capacity=max(len(rows), 1))
+    log._data[:len(rows)] = rows
+    log._size = len(rows)
+    return log
+
+  # Compatibilidad con el uso como lista de diccionarios
+  def __iter__(self):
+    return iter(self.to_dicts())
@@ -0,0 +1,61 @@
+# Conjuntos activos del fuego, mantenidos de forma incremental.
+#
+#   fire      celdas con fuego
+#   smoke     celdas con humo
+#   frontier  celdas con humo que tienen una arista abierta hacia fuego (las
+#             que el flashover convertiría)
+#
+# El modelo avisa cada cambio de celda (TacoRescueModel.set_fire) y cada
+# pared o puerta que cambia (TacoRescueModel.walls_changed); solo se
+# recalculan la celda y sus vecinas, así el flashover y las consultas de
+# adyacencia recorren la frontera en lugar de todo el tablero. Quien escriba
+# directamente en model.fire debe llamar a rebuild().
+DIRECTIONS = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+
+
+class FireFront:
+  def __init__(self, model):
+    self.model = model
+    self.rebuild()
+
+  # Recalcula los tres conjuntos recorriendo todo el tablero
+  def rebuild(self):
+    fire = self.model.fire
+    self.fire = set()
+    self.smoke = set()
+    for x in range(self.model.grid.width):
+      for y in range(self.model.grid.height):
+        if fire[x][y] == 2:
+          self.fire.add((x, y))
+        elif fire[x][y] == 1:
+          self.smoke.add((x, y))
+    self.frontier = {(x, y) for (x, y) in self.smoke if self.model.is_adjacent_to_fire(x, y)}
+
+  # Método que actualiza los conjuntos cuando la celda (x, y) pasa a 'value'
+  def cell_changed(self, x, y, value):
+    cell = (x, y)
+    self.fire.discard(cell)
+    self.smoke.discard(cell)
+    if value == 2:
+      self.fire.add(cell)
+    elif value == 1:
+      self.smoke.add(cell)
+    self._refresh(x, y)
+    width, height = self.model.grid.width, self.model.grid.height
+    for dx, dy in DIRECTIONS:
+      nx, ny = x + dx, y + dy
+      if 0 <= nx < width and 0 <= ny < height:
+        self._refresh(nx, ny)
+
+  # Método que actualiza la frontera cuando cambia la arista entre dos celdas
+  def edge_changed(self, x, y, nx, ny):
+    self._refresh(x, y)
+    if 0 <= nx < self.model.grid.width and 0 <= ny < self.model.grid.height:
+      self._refresh(nx, ny)
+
+  def _refresh(self, x, y):
+    cell = (x, y)
+    if cell in self.smoke and self.model.is_adjacent_to_fire(x, y):
+      self.frontier.add(cell)
+    else:
+      self.frontier.discard(cell)
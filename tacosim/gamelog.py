@@ -0,0 +1,270 @@
+# Registro persistente de partidas en disco.
+#
+# Cada partida se guarda en dos archivos de solo-anexar:
+#   <id>.events  filas int32 del EventLog (step, agente, acción, x1, y1, x2, y2)
+#   <id>.tlog    cabecera + registros de estado por paso
+#
+# El estado completo del tablero se aplana en un vector int16 con un layout
+# fijo (StateLayout). El primer registro y luego uno de cada
+# 'keyframe_interval' pasos son keyframes (vector completo); los demás son
+# deltas (índices que cambiaron + valores nuevos), así reconstruir cualquier
+# paso aplica a lo más keyframe_interval - 1 deltas. Las escrituras pasan por
+# un buffer y el lector abre ambos archivos con np.memmap, de modo que revisar
+# partidas viejas no las carga al heap.
+import bisect
+import itertools
+import os
+import struct
+import time
+
+import numpy as np
+
+from .events import COLUMNS
+from .maps import WALL_INDEX
+
+MAGIC = b"TACOLOG\x01"
+# magic, width, height, players, seed (-1 = sin semilla)
+HEADER = struct.Struct("<8sHHHxxq")
+# step, tipo, número de elementos del payload
+RECORD = struct.Struct("<IBxxxI")
+KEYFRAME, DELTA = 0, 1
+KEYFRAME_INTERVAL = 16
+
+STATE_DTYPE = np.dtype("<i2")
+INDEX_DTYPE = np.dtype("<u4")
+EVENT_DTYPE = np.dtype("<i4")
+
+COUNTERS = ("damage", "rescued_count", "lost_victims", "victims_on_board",
+            "victims_count", "false_alarms_count")
+# Columnas por agente en el vector de estado
+AGENT_FIELDS = ("x", "y", "AP", "carrying_victim")
+
+
+# Layout del vector de estado para un tablero W x H con P agentes
+class StateLayout:
+  def __init__(self, width, height, players):
+    self.width = width
+    self.height = height
+    self.players = players
+    shapes = [
+      ("fire", (width, height)),
+      ("poi", (width, height)),
+      ("walls", (height, width, 4)),
+      ("walls_damage", (width, height, 4)),
+      ("doors", (height, width, 4)),
+      ("agents", (players, len(AGENT_FIELDS))),
+      ("counters", (len(COUNTERS),)),
+    ]
+    self.shapes = dict(shapes)
+    self.slices = {}
+    offset = 0
+    for name, shape in shapes:
+      n = int(np.prod(shape))
+      self.slices[name] = slice(offset, offset + n)
+      offset += n
+    self.size = offset
+
+  @classmethod
+  def for_model(cls, model):
+    return cls(model.grid.width, model.grid.height, len(model.grid.agents))
+
+  # Función que aplana el estado del modelo en un vector int16
+  def capture(self, model):
+    vec = np.empty(self.size, dtype=STATE_DTYPE)
+    vec[self.slices["fire"]] = np.ravel(model.fire)
+    vec[self.slices["poi"]] = np.ravel(model.poi)
+    vec[self.slices["walls"]] = np.ravel(model.walls)
+    vec[self.slices["walls_damage"]] = np.ravel(model.walls_damage)
+
+    doors = np.zeros(self.shapes["doors"], dtype=STATE_DTYPE)
+    for (x1, y1), (x2, y2) in model.doors.items():
+      doors[y1, x1, WALL_INDEX[(x2 - x1, y2 - y1)]] = 1
+    vec[self.slices["doors"]] = doors.ravel()
+
+    vec[self.slices["agents"]] = model.grid.agent_rows().ravel()
+    vec[self.slices["counters"]] = [getattr(model, c) for c in COUNTERS]
+    return vec
+
+  # Función que convierte un vector de estado en arreglos con nombre
+  def decode(self, vec):
+    state = {name: np.asarray(vec[sl]).reshape(self.shapes[name]) for name, sl in self.slices.items()}
+    state["counters"] = {c: int(v) for c, v in zip(COUNTERS, state["counters"])}
+    return state
+
+
+def _padded(nbytes):
+  return (nbytes + 3) & ~3
+
+
+# Escritor de una partida: record(model) se llama después de cada paso
+class GameLogWriter:
+  def __init__(self, directory, model, game_id=None, seed=None, buffer_size=1 << 16,
+               keyframe_interval=KEYFRAME_INTERVAL):
+    os.makedirs(directory, exist_ok=True)
+    self.game_id = game_id or new_game_id()
+    self.keyframe_interval = keyframe_interval
+    self.layout = StateLayout.for_model(model)
+    self.path = os.path.join(directory, self.game_id + ".tlog")
+    self.events_path = os.path.join(directory, self.game_id + ".events")
+
+    self._log = open(self.path, "wb", buffering=buffer_size)
+    self._events = open(self.events_path, "wb", buffering=buffer_size)
+    self._log.write(HEADER.pack(MAGIC, self.layout.width, self.layout.height,
+                                self.layout.players, -1 if seed is None else seed))
+    self._prev = None
+    self._since_keyframe = 0
+    self._events_written = 0
+    self.record(model)
+
+  def _write_record(self, step, kind, n, *payloads):
+    self._log.write(RECORD.pack(step, kind, n))
+    nbytes = 0
+    for p in payloads:
+      self._log.write(p)
+      nbytes += len(p)
+    self._log.write(b"\0" * (_padded(nbytes) - nbytes))
+
+  def write_keyframe(self, step, vec):
+    self._write_record(step, KEYFRAME, len(vec), vec.tobytes())
+
+  def record(self, model):
+    vec = self.layout.capture(model)
+    if self._prev is None or self._since_keyframe >= self.keyframe_interval - 1:
+      self.write_keyframe(model.steps, vec)
+      self._since_keyframe = 0
+    else:
+      self._since_keyframe += 1
+      changed = np.flatnonzero(vec != self._prev).astype(INDEX_DTYPE)
+      self._write_record(model.steps, DELTA, len(changed), changed.tobytes(), vec[changed].tobytes())
+    self._prev = vec
+
+    events = model.events
+    if len(events) > self._events_written:
+      self._events.write(events.data[self._events_written:].astype(EVENT_DTYPE).tobytes())
+      self._events_written = len(events)
+
+  def flush(self):
+    self._log.flush()
+    self._events.flush()
+
+  def close(self):
+    if not self._log.closed:
+      self._log.close()
+      self._events.close()
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, *exc):
+    self.close()
+
+
+# Lector de una partida sobre archivos mapeados en memoria
+class GameLogReader:
+  def __init__(self, directory, game_id):
+    self.game_id = game_id
+    self.path = os.path.join(directory, game_id + ".tlog")
+    self.events_path = os.path.join(directory, game_id + ".events")
+
+    self._buf = np.memmap(self.path, dtype=np.uint8, mode="r")
+    magic, width, height, players, seed = HEADER.unpack_from(self._buf, 0)
+    if magic != MAGIC:
+      raise ValueError(f"{self.path} no es un registro de partida")
+    self.layout = StateLayout(width, height, players)
+    self.seed = None if seed < 0 else seed
+
+    # Índice de registros: (step, tipo, n, offset del payload)
+    self.records = []
+    self.keyframes = []
+    self._steps = None
+    offset = HEADER.size
+    end = len(self._buf)
+    while offset + RECORD.size <= end:
+      step, kind, n = RECORD.unpack_from(self._buf, offset)
+      payload = n * STATE_DTYPE.itemsize if kind == KEYFRAME else n * (INDEX_DTYPE.itemsize + STATE_DTYPE.itemsize)
+      if offset + RECORD.size + payload > end:
+        break  # registro truncado (la partida sigue escribiéndose)
+      if kind == KEYFRAME:
+        self.keyframes.append(len(self.records))
+      self.records.append((step, kind, n, offset + RECORD.size))
+      offset += RECORD.size + _padded(payload)
+
+  # Eventos de la partida como arreglo (n, 7) mapeado en memoria
+  @property
+  def events(self):
+    size = os.path.getsize(self.events_path)
+    rows = size // (EVENT_DTYPE.itemsize * len(COLUMNS))
+    if rows == 0:
+      return np.empty((0, len(COLUMNS)), dtype=EVENT_DTYPE)
+    return np.memmap(self.events_path, dtype=EVENT_DTYPE, mode="r", shape=(rows, len(COLUMNS)))
+
+  @property
+  def steps(self):
+    if self._steps is None or len(self._steps) != len(self.records):
+      self._steps = [r[0] for r in self.records]
+    return self._steps
+
+  def _payload(self, record):
+    _, kind, n, offset = record
+    if kind == KEYFRAME:
+      return np.frombuffer(self._buf, dtype=STATE_DTYPE, count=n, offset=offset), None
+    idx = np.frombuffer(self._buf, dtype=INDEX_DTYPE, count=n, offset=offset)
+    vals = np.frombuffer(self._buf, dtype=STATE_DTYPE, count=n, offset=offset + n * INDEX_DTYPE.itemsize)
+    return idx, vals
+
+  # Función que aplica el registro i sobre el vector 'vec' (en sitio)
+  def apply(self, i, vec):
+    record = self.records[i]
+    a, b = self._payload(record)
+    if record[1] == KEYFRAME:
+      vec[:] = a
+    else:
+      vec[a] = b
+    return vec
+
+  # Recorre la partida paso a paso: (step, vector de estado)
+  def iter_states(self):
+    vec = np.zeros(self.layout.size, dtype=STATE_DTYPE)
+    for i, record in enumerate(self.records):
+      self.apply(i, vec)
+      yield record[0], vec
+
+  # Vector de estado al final del paso 'step' (o del último registro anterior):
+  # parte del keyframe más cercano y aplica solo los deltas que siguen
+  def vector_at(self, step):
+    i = bisect.bisect_right(self.steps, step) - 1
+    if i < 0:
+      raise IndexError(f"La partida {self.game_id} no tiene el paso {step}")
+    k = self.keyframes[bisect.bisect_right(self.keyframes, i) - 1]
+    vec = np.empty(self.layout.size, dtype=STATE_DTYPE)
+    for j in range(k, i + 1):
+      self.apply(j, vec)
+    return self.records[i][0], vec
+
+  def state_at(self, step):
+    step, vec = self.vector_at(step)
+    return step, self.layout.decode(vec)
+
+  def final_state(self):
+    vec = None
+    for _, vec in self.iter_states():
+      pass
+    return None if vec is None else self.layout.decode(vec.copy())
+
+  def close(self):
+    self._buf = None
+
+
+_game_counter = itertools.count()
+
+
+# Id ordenable por fecha de creación: fecha-hora, pid y un contador del proceso
+def new_game_id():
+  return time.strftime("%Y%m%d-%H%M%S") + f"-{os.getpid()}-{next(_game_counter):04d}"
+
+
+# Lista los ids de partidas guardadas en un directorio (más recientes al final)
+def list_games(directory):
+  if not os.path.isdir(directory):
+    return []
+  return sorted(name[:-5] for name in os.listdir(directory) if name.endswith(".tlog"))
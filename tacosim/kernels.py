@@ -0,0 +1,258 @@
+# Kernels compilados (Numba) para las rutas calientes del modelo.
+#
+# Las funciones de este módulo son Python plano sobre arreglos tipados
+# (fire (W, H) float64, walls (H, W, 4) int64, door_dirs (W, H) int64) y
+# reproducen exactamente la implementación de referencia de TacoRescueModel
+# y TacoRescueAgent: mismo orden de recorrido, mismos desempates en el heap
+# (prioridad y luego (x, y)) y la misma aritmética en float64, así que los
+# resultados son idénticos bit a bit.
+#
+# load(backend) las compila con numba.njit la primera vez que se piden;
+# importar este módulo no importa Numba. El modelo elige el backend al
+# construirse:
+#   TacoRescueModel(backend="auto")    # Numba si está instalado
+#   TacoRescueModel(backend="python")  # implementación de referencia
+#   TacoRescueModel(backend="numba")   # ValueError si falta Numba
+import heapq
+from types import SimpleNamespace
+
+import numpy as np
+
+BACKENDS = ("auto", "python", "numba")
+
+# Direcciones en el orden de los agentes y el fuego: arriba, abajo, derecha,
+# izquierda; WALL es la pared de la celda de origen en cada dirección
+DX = (0, 0, 1, -1)
+DY = (1, -1, 0, 0)
+WALL = (0, 2, 1, 3)
+NO_DOOR = -1
+
+# Colores de get_grid
+COLOR_FIRE = (1.0, 0.0, 0.0)
+COLOR_SMOKE = (0.5, 0.5, 0.5)
+COLOR_VICTIM = (0.0, 0.0, 1.0)
+COLOR_FALSE = (1.0, 1.0, 0.0)
+COLOR_WALL = (0.0, 0.0, 0.0)
+COLOR_WALL_D = (1.0, 0.5, 0.0)
+COLOR_AGENT = (0.0, 1.0, 0.0)
+CELL = 10
+
+
+# Igual que TacoRescueModel.is_adjacent_to_fire
+def adjacent_to_fire(fire, walls, x, y):
+  width, height = fire.shape
+  for d in range(4):
+    nx = x + DX[d]
+    ny = y + DY[d]
+    if nx < 0 or nx >= width or ny < 0 or ny >= height:
+      continue
+    if walls[y, x, WALL[d]] == 1:
+      continue
+    if fire[nx, ny] == 2:
+      return True
+  return False
+
+
+# Costo de TacoRescueAgent.neighbors_for_path hacia la dirección d, o -1.0
+# si no se puede entrar; 'risk' (W, H) es el costo extra de entrar a cada
+# celda (tacosim.risk, ceros sin mapa de riesgo) y door_cost / wall_cost los
+# extras de cruzar una puerta cerrada o una pared (model.weights)
+def _step_cost(fire, walls, door_dirs, risk, door_cost, wall_cost, carrying, x, y, d):
+  width, height = fire.shape
+  nx = x + DX[d]
+  ny = y + DY[d]
+  if nx < 0 or nx >= width or ny < 0 or ny >= height:
+    return -1.0
+  state = fire[nx, ny]
+  if carrying:
+    if state == 2:
+      return -1.0
+    cost = 2
+  elif state == 2:
+    cost = 2
+  else:
+    cost = 1
+  extra = 0.0
+  if door_dirs[x, y] == d:
+    if walls[y, x, WALL[d]] == 1:
+      extra = door_cost
+  elif walls[y, x, WALL[d]] == 1:
+    extra = wall_cost
+  return float(cost + extra) + risk[nx, ny]
+
+
+# TacoRescueAgent.a_star con la heurística h (W, H) hacia la meta: regresa
+# (ruta (n, 2), encontrada, expandidos)
+def a_star(fire, walls, door_dirs, risk, door_cost, wall_cost, h, carrying, sx, sy, gx, gy):
+  width, height = fire.shape
+  dist = np.zeros((width, height), dtype=np.float64)
+  seen = np.zeros((width, height), dtype=np.bool_)
+  prev = np.full((width, height, 2), -1, dtype=np.int64)
+  heap = [(0.0, sx, sy)]
+  seen[sx, sy] = True
+  expanded = 0
+
+  while len(heap) > 0:
+    _, cx, cy = heapq.heappop(heap)
+    expanded += 1
+    if cx == gx and cy == gy:
+      break
+    for d in range(4):
+      step = _step_cost(fire, walls, door_dirs, risk, door_cost, wall_cost, carrying, cx, cy, d)
+      if step < 0:
+        continue
+      nx = cx + DX[d]
+      ny = cy + DY[d]
+      new_dist = dist[cx, cy] + step
+      if not seen[nx, ny] or new_dist < dist[nx, ny]:
+        dist[nx, ny] = new_dist
+        seen[nx, ny] = True
+        priority = new_dist + h[nx, ny]
+        heapq.heappush(heap, (priority, nx, ny))
+        prev[nx, ny, 0] = cx
+        prev[nx, ny, 1] = cy
+
+  if not seen[gx, gy]:
+    return np.empty((0, 2), dtype=np.int64), False, expanded
+
+  n = 0
+  x, y = gx, gy
+  while x != sx or y != sy:
+    n += 1
+    x, y = prev[x, y, 0], prev[x, y, 1]
+  path = np.empty((n, 2), dtype=np.int64)
+  x, y = gx, gy
+  for i in range(n - 1, -1, -1):
+    path[i, 0] = x
+    path[i, 1] = y
+    x, y = prev[x, y, 0], prev[x, y, 1]
+  return path, True, expanded
+
+
+# TacoRescueAgent.shortest_cost (A* con la heurística h): regresa (costo o
+# -1.0, expandidos)
+def shortest_cost(fire, walls, door_dirs, risk, door_cost, wall_cost, h, carrying, sx, sy, gx, gy):
+  width, height = fire.shape
+  dist = np.zeros((width, height), dtype=np.float64)
+  seen = np.zeros((width, height), dtype=np.bool_)
+  heap = [(h[sx, sy], sx, sy)]
+  seen[sx, sy] = True
+  expanded = 0
+
+  while len(heap) > 0:
+    priority, cx, cy = heapq.heappop(heap)
+    curr_cost = dist[cx, cy]
+    if priority > curr_cost + h[cx, cy]:
+      continue
+    expanded += 1
+    if cx == gx and cy == gy:
+      return curr_cost, expanded
+    for d in range(4):
+      step = _step_cost(fire, walls, door_dirs, risk, door_cost, wall_cost, carrying, cx, cy, d)
+      if step < 0:
+        continue
+      nx = cx + DX[d]
+      ny = cy + DY[d]
+      new_dist = curr_cost + step
+      if not seen[nx, ny] or new_dist < dist[nx, ny]:
+        dist[nx, ny] = new_dist
+        seen[nx, ny] = True
+        heapq.heappush(heap, (new_dist + h[nx, ny], nx, ny))
+  return -1.0, expanded
+
+
+def _paint(grid, y0, y1, x0, x1, color):
+  for py in range(y0, y1):
+    for px in range(x0, x1):
+      for c in range(3):
+        grid[py, px, c] = color[c]
+
+
+# render.get_grid sobre arreglos: mismo orden de pintado (celda, paredes
+# arriba/derecha/abajo/izquierda, agentes)
+def render(fire, poi, walls, walls_damage, counts):
+  width, height = fire.shape
+  grid = np.ones((height * CELL, width * CELL, 3))
+  sub = CELL // 2
+  for x in range(width):
+    for y in range(height):
+      x0, x1 = x * CELL, (x + 1) * CELL
+      y0, y1 = y * CELL, (y + 1) * CELL
+
+      color = (1.0, 1.0, 1.0)
+      if fire[x, y] == 2:
+        color = COLOR_FIRE
+      elif fire[x, y] == 1:
+        color = COLOR_SMOKE
+      if poi[x, y] == 1:
+        color = COLOR_VICTIM
+      elif poi[x, y] == 2:
+        color = COLOR_FALSE
+      _paint(grid, y0, y1, x0, x1, color)
+
+      if walls[y, x, 0] == 1:
+        _paint(grid, y1 - 1, y1, x0, x1, COLOR_WALL if walls_damage[x, y, 0] == 0 else COLOR_WALL_D)
+      if walls[y, x, 1] == 1:
+        _paint(grid, y0, y1, x1 - 1, x1, COLOR_WALL if walls_damage[x, y, 1] == 0 else COLOR_WALL_D)
+      if walls[y, x, 2] == 1:
+        _paint(grid, y0, y0 + 1, x0, x1, COLOR_WALL if walls_damage[x, y, 2] == 0 else COLOR_WALL_D)
+      if walls[y, x, 3] == 1:
+        _paint(grid, y0, y1, x0, x0 + 1, COLOR_WALL if walls_damage[x, y, 3] == 0 else COLOR_WALL_D)
+
+      for i in range(min(counts[x, y], 4)):
+        x0s = x0 + (i % 2) * sub
+        y0s = y0 + (i // 2) * sub
+        _paint(grid, y0s, y0s + sub, x0s, x0s + sub, COLOR_AGENT)
+  return grid
+
+
+# Direcciones de las puertas por celda (NO_DOOR si no hay) a partir del
+# diccionario model.doors
+def door_directions(doors, width, height):
+  dirs = np.full((width, height), NO_DOOR, dtype=np.int64)
+  for (x, y), (nx, ny) in doors.items():
+    for d in range(4):
+      if (nx - x, ny - y) == (DX[d], DY[d]):
+        dirs[x, y] = d
+  return dirs
+
+
+KERNELS = ("adjacent_to_fire", "a_star", "shortest_cost", "render")
+_compiled = None
+
+
+def numba_available():
+  try:
+    import numba  # noqa: F401
+  except ImportError:
+    return False
+  return True
+
+
+# Función que resuelve el backend pedido: regresa los kernels compilados o
+# None para la implementación de referencia
+def load(backend="auto"):
+  global _compiled
+  if backend not in BACKENDS:
+    raise ValueError(f"Backend desconocido: {backend!r} (opciones: {', '.join(BACKENDS)})")
+  if backend == "python":
+    return None
+  if not numba_available():
+    if backend == "numba":
+      raise ValueError("El backend 'numba' requiere instalar numba")
+    return None
+  if _compiled is None:
+    _compiled = _compile()
+  return _compiled
+
+
+def _compile():
+  import numba
+  jit = numba.njit(cache=True)
+  g = globals()
+  # Las funciones auxiliares se reemplazan primero: Numba resuelve por nombre
+  # global las que llama cada kernel al compilarlo
+  for name in ("adjacent_to_fire", "_step_cost", "_paint"):
+    g[name] = jit(g[name])
+  return SimpleNamespace(**{name: g[name] if name == "adjacent_to_fire" else jit(g[name])
+                            for name in KERNELS})
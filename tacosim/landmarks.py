@@ -0,0 +1,159 @@
+# Heurística de landmarks (ALT) para las búsquedas de los agentes.
+#
+# Para unas pocas celdas de referencia L (escogidas entre entradas y esquinas)
+# se guarda la distancia d(L, v) y d(v, L) a todas las celdas sobre una cota
+# inferior de los costos de neighbors_for_path: 1 por entrar a una celda (con
+# fuego o cargando una víctima cuesta más) más el extra de la puerta cerrada
+# o la pared (model.weights, redondeados hacia abajo). Por la desigualdad del
+# triángulo
+#   d(n, g) >= d(L, g) - d(L, n)   y   d(n, g) >= d(n, L) - d(g, L)
+# así que el máximo de esas cotas y la distancia Manhattan es una heurística
+# admisible y consistente, mucho más ajustada que Manhattan cuando hay paredes.
+#
+# Las tablas dependen solo de paredes y puertas: TacoRescueModel.walls_changed
+# las marca como viejas y se recalculan en la siguiente consulta. Con count=0
+# la heurística es Manhattan.
+import math
+
+import numpy as np
+
+from .firefront import DIRECTIONS
+from .maps import WALL_INDEX
+
+# Suficiente para no desbordar al sumar costos en tableros grandes
+INF = np.int64(1) << 40
+# Máximo de heurísticas por meta guardadas entre cambios de paredes
+MAX_GOALS = 256
+
+
+class LandmarkTable:
+  def __init__(self, model, count=8):
+    self.model = model
+    self.count = count
+    width, height = model.grid.width, model.grid.height
+    xs, ys = np.meshgrid(np.arange(width), np.arange(height), indexing="ij")
+    self._xs, self._ys = xs, ys
+    self._goals = {}
+    self.stale = True
+    self.landmarks = []
+    if count:
+      self.landmarks = self._choose(count)
+
+  # Método que marca las tablas como viejas (cambió una pared o puerta)
+  def invalidate(self):
+    self.stale = True
+    self._goals = {}
+
+  # Costo mínimo de salir de cada celda en cada dirección (INF fuera del
+  # tablero), arreglo (4, W, H)
+  def _edge_costs(self):
+    model = self.model
+    walls = model.walls.transpose(1, 0, 2)
+    door_cost, wall_cost = math.floor(model.weights.door), math.floor(model.weights.wall)
+    costs = np.full((len(DIRECTIONS),) + walls.shape[:2], INF, dtype=np.int64)
+    for d, (dx, dy) in enumerate(DIRECTIONS):
+      closed = walls[:, :, WALL_INDEX[(dx, dy)]] == 1
+      door = model.door_dirs == d
+      cost = 1 + np.where(door, closed * door_cost, closed * wall_cost)
+      src, _ = _slices(dx, dy)
+      costs[d][src] = cost[src]
+    return costs
+
+  # Distancias desde (reverse=False) o hacia (reverse=True) cada fuente, con
+  # relajaciones vectorizadas hasta el punto fijo; arreglo (len(sources), W, H)
+  def _distances(self, sources, costs, reverse=False):
+    width, height = self.model.grid.width, self.model.grid.height
+    dist = np.full((len(sources), width, height), INF, dtype=np.int64)
+    for i, (x, y) in enumerate(sources):
+      dist[i, x, y] = 0
+    while True:
+      before = dist.copy()
+      for d, (dx, dy) in enumerate(DIRECTIONS):
+        src, dst = _slices(dx, dy)
+        cost = costs[d][src]
+        if reverse:
+          np.minimum(dist[(slice(None),) + src], dist[(slice(None),) + dst] + cost,
+                     out=dist[(slice(None),) + src])
+        else:
+          np.minimum(dist[(slice(None),) + dst], dist[(slice(None),) + src] + cost,
+                     out=dist[(slice(None),) + dst])
+      if np.array_equal(before, dist):
+        return dist
+
+  # Selección del más lejano: empieza en la primera esquina y agrega el
+  # candidato (entradas y esquinas) más lejano a los ya elegidos
+  def _choose(self, count):
+    width, height = self.model.grid.width, self.model.grid.height
+    corners = [(0, 0), (width - 1, height - 1), (0, height - 1), (width - 1, 0)]
+    candidates = list(dict.fromkeys(corners + list(self.model.entries)))
+    costs = self._edge_costs()
+    chosen = [candidates[0]]
+    nearest = self._distances(chosen, costs)[0]
+    while len(chosen) < min(count, len(candidates)):
+      best = max((c for c in candidates if c not in chosen), key=lambda c: nearest[c])
+      chosen.append(best)
+      nearest = np.minimum(nearest, self._distances([best], costs)[0])
+    return chosen
+
+  def _refresh(self):
+    if self.count:
+      costs = self._edge_costs()
+      self.forward = self._distances(self.landmarks, costs)
+      self.backward = self._distances(self.landmarks, costs, reverse=True)
+    self.stale = False
+
+  # Heurística hacia 'goal' para todas las celdas: (arreglo (W, H) float64,
+  # la misma tabla como listas para las búsquedas en Python)
+  def heuristic_to(self, goal):
+    goal = (int(goal[0]), int(goal[1]))
+    if goal in self._goals:
+      return self._goals[goal]
+    if self.stale:
+      self._refresh()
+
+    h = np.abs(self._xs - goal[0]) + np.abs(self._ys - goal[1])
+    if self.count:
+      gx, gy = goal
+      h = np.maximum(h, (self.forward[:, gx, gy, None, None] - self.forward).max(axis=0))
+      h = np.maximum(h, (self.backward - self.backward[:, gx, gy, None, None]).max(axis=0))
+    h = h.astype(np.float64)
+
+    if len(self._goals) >= MAX_GOALS:
+      self._goals = {}
+    self._goals[goal] = (h, h.tolist())
+    return self._goals[goal]
+
+  # Tablas que nunca se modifican en su lugar (solo se reemplazan), así que
+  # las copias del modelo las pueden compartir; las viejas se recalculan
+  # antes para no recalcularlas en cada copia
+  def shared_tables(self):
+    if self.stale:
+      self._refresh()
+    tables = list(self._goals.values())
+    if self.count:
+      tables += [self.forward, self.backward]
+    return tables
+
+  # Cota inferior del costo de ir de a a b (el mismo valor que
+  # heuristic_to(b) en a, sin calcular la tabla de toda la meta)
+  def estimate(self, a, b):
+    (ax, ay), (bx, by) = a, b
+    best = abs(ax - bx) + abs(ay - by)
+    if self.count:
+      if self.stale:
+        self._refresh()
+      best = max(best, int((self.forward[:, bx, by] - self.forward[:, ax, ay]).max()),
+                 int((self.backward[:, ax, ay] - self.backward[:, bx, by]).max()))
+    return float(best)
+
+
+# Rebanadas (origen, destino) de las celdas que tienen vecina en (dx, dy)
+def _slices(dx, dy):
+  def axis(delta):
+    if delta > 0:
+      return slice(0, -delta), slice(delta, None)
+    if delta < 0:
+      return slice(-delta, None), slice(0, delta)
+    return slice(None), slice(None)
+  (sx, tx), (sy, ty) = axis(dx), axis(dy)
+  return (sx, sy), (tx, ty)
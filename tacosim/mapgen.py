@@ -0,0 +1,175 @@
+# Generador procedural de edificios para escenarios grandes.
+#
+# Parte el tablero en cuartos con una partición binaria (BSP): cada corte
+# levanta una pared de lado a lado del rectángulo y abre un solo paso entre
+# las dos mitades (puerta cerrada o hueco), así todo el edificio queda
+# conectado. Luego cierra el perímetro, abre las entradas y reparte fuego y
+# POIs con las densidades pedidas. El resultado es un BoardMap validado, igual
+# que uno cargado con load_map; la misma semilla da el mismo edificio.
+#
+#   board_map = generate_map(64, 48, seed=0, min_room=4)
+#   model = TacoRescueModel(board_map=board_map)
+#
+# También se puede guardar como JSON:
+#   python -m tacosim.mapgen 64 48 --seed 0 -o edificio.json
+import argparse
+
+import numpy as np
+
+from . import board
+from .maps import BoardMap, save_map
+
+# Proporción del tablero original: POIs en la bolsa por celda
+BASE_CELLS = 48
+VICTIMS_PER_CELL = board.TOTAL_VICTIMS / BASE_CELLS
+FALSE_ALARMS_PER_CELL = board.TOTAL_FALSE_ALARMS / BASE_CELLS
+
+
+# Función que genera un edificio de W x H.
+#   min_room       lado mínimo de un cuarto; más chico = más cuartos y paredes
+#   max_room       lado a partir del cual un cuarto siempre se vuelve a partir
+#   door_ratio     fracción de pasos entre cuartos que son puertas (el resto
+#                  son huecos sin pared)
+#   entries        número de entradas en el perímetro (por defecto una cada
+#                  ~12 celdas de perímetro)
+#   fire_density   fracción de celdas que arrancan con fuego
+#   poi_density    fracción de celdas que arrancan con un POI (2/3 víctimas)
+def generate_map(width, height, seed=None, min_room=3, max_room=None, door_ratio=0.7,
+                 entries=None, fire_density=0.2, poi_density=0.06):
+  if width < 2 or height < 2:
+    raise ValueError(f"El edificio debe medir al menos 2x2: {width}x{height}")
+  if min_room < 1:
+    raise ValueError(f"min_room debe ser positivo: {min_room}")
+  rng = np.random.default_rng(seed)
+  max_room = max_room or 3 * min_room
+
+  walls = np.zeros((height, width, 4), dtype=np.int8)
+  doors = []
+  has_door = np.zeros((width, height), dtype=bool)
+
+  # Perímetro cerrado
+  walls[-1, :, 0] = 1
+  walls[:, -1, 1] = 1
+  walls[0, :, 2] = 1
+  walls[:, 0, 3] = 1
+
+  # Partición en cuartos (pila en lugar de recursión para tableros grandes)
+  rooms = [(0, 0, width, height)]
+  while rooms:
+    x0, y0, w, h = rooms.pop()
+    can_x = w >= 2 * min_room
+    can_y = h >= 2 * min_room
+    if not (can_x or can_y):
+      continue
+    if max(w, h) <= max_room and rng.random() < 0.3:
+      continue  # cuarto mediano que se deja entero
+    # Se corta el lado más largo (o el único que se puede cortar)
+    vertical = can_x and (not can_y or w > h or (w == h and rng.random() < 0.5))
+    if vertical:
+      cut = x0 + int(rng.integers(min_room, w - min_room + 1))
+      _split_x(walls, cut, y0, h)
+      _open_passage(rng, walls, doors, has_door, door_ratio,
+                    [((cut - 1, y), (cut, y)) for y in range(y0, y0 + h)])
+      rooms += [(x0, y0, cut - x0, h), (cut, y0, x0 + w - cut, h)]
+    else:
+      cut = y0 + int(rng.integers(min_room, h - min_room + 1))
+      _split_y(walls, cut, x0, w)
+      _open_passage(rng, walls, doors, has_door, door_ratio,
+                    [((x, cut - 1), (x, cut)) for x in range(x0, x0 + w)])
+      rooms += [(x0, y0, w, cut - y0), (x0, cut, w, y0 + h - cut)]
+
+  entry_cells = _place_entries(rng, walls, width, height, entries)
+
+  # Fuego y POIs en celdas distintas, fuera de las entradas
+  n_cells = width * height
+  n_fire = int(round(fire_density * n_cells))
+  n_poi = int(round(poi_density * n_cells))
+  entry_idx = {x * height + y for (x, y) in entry_cells}
+  free = np.array([i for i in range(n_cells) if i not in entry_idx])
+  picked = rng.permutation(free)[:n_fire + n_poi]
+  cells = [(int(i // height), int(i % height)) for i in picked]
+  fire_pos = cells[:n_fire]
+  pois = cells[n_fire:]
+  n_victims = (2 * len(pois) + 2) // 3
+  victims, false_alarms = pois[:n_victims], pois[n_victims:]
+
+  return BoardMap(
+    width, height, walls, doors, entry_cells, fire_pos, victims, false_alarms,
+    total_victims=max(len(victims), int(round(VICTIMS_PER_CELL * n_cells))),
+    total_false_alarms=max(len(false_alarms), int(round(FALSE_ALARMS_PER_CELL * n_cells))),
+  )
+
+
+# Pared vertical entre las columnas cut - 1 y cut, filas [y0, y0 + h)
+def _split_x(walls, cut, y0, h):
+  walls[y0:y0 + h, cut - 1, 1] = 1
+  walls[y0:y0 + h, cut, 3] = 1
+
+
+# Pared horizontal entre las filas cut - 1 y cut, columnas [x0, x0 + w)
+def _split_y(walls, cut, x0, w):
+  walls[cut - 1, x0:x0 + w, 0] = 1
+  walls[cut, x0:x0 + w, 2] = 1
+
+
+# Abre un paso en uno de los pares de celdas del corte. Las puertas solo van
+# donde ninguna de las dos celdas tiene ya una (el modelo guarda una puerta
+# por celda); si no hay lugar, el paso queda como hueco.
+def _open_passage(rng, walls, doors, has_door, door_ratio, pairs):
+  (x1, y1), (x2, y2) = pairs[int(rng.integers(len(pairs)))]
+  if rng.random() < door_ratio:
+    free = [p for p in pairs if not has_door[p[0]] and not has_door[p[1]]]
+    if free:
+      (x1, y1), (x2, y2) = free[int(rng.integers(len(free)))]
+      doors.append((x1, y1, x2, y2))
+      has_door[x1, y1] = has_door[x2, y2] = True
+      return  # la pared se queda: la puerta arranca cerrada
+  if x2 > x1:
+    walls[y1, x1, 1] = walls[y2, x2, 3] = 0
+  else:
+    walls[y1, x1, 0] = walls[y2, x2, 2] = 0
+
+
+# Entradas repartidas a lo largo del perímetro (con un desfase aleatorio);
+# cada una abre su pared exterior
+def _place_entries(rng, walls, width, height, n):
+  ring = ([(x, 0, 2) for x in range(width)] +
+          [(width - 1, y, 1) for y in range(1, height)] +
+          [(x, height - 1, 0) for x in range(width - 2, -1, -1)] +
+          [(0, y, 3) for y in range(height - 2, 0, -1)])
+  if n is None:
+    n = max(1, len(ring) // 12)
+  n = min(n, len(ring))
+  offset = rng.random() * len(ring) / n
+  entries = []
+  for k in range(n):
+    x, y, w = ring[int(offset + k * len(ring) / n) % len(ring)]
+    walls[y, x, w] = 0
+    entries.append((x, y))
+  return entries
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(description="Genera un edificio procedural como mapa JSON")
+  parser.add_argument("width", type=int)
+  parser.add_argument("height", type=int)
+  parser.add_argument("--seed", type=int, default=None)
+  parser.add_argument("--min-room", type=int, default=3)
+  parser.add_argument("--max-room", type=int, default=None)
+  parser.add_argument("--door-ratio", type=float, default=0.7)
+  parser.add_argument("--entries", type=int, default=None)
+  parser.add_argument("--fire", type=float, default=0.2, help="densidad inicial de fuego")
+  parser.add_argument("--poi", type=float, default=0.06, help="densidad inicial de POIs")
+  parser.add_argument("-o", "--output", default="board.json")
+  args = parser.parse_args(argv)
+
+  board_map = generate_map(args.width, args.height, seed=args.seed, min_room=args.min_room,
+                           max_room=args.max_room, door_ratio=args.door_ratio,
+                           entries=args.entries, fire_density=args.fire, poi_density=args.poi)
+  save_map(board_map, args.output)
+  print(f"{args.output}: {args.width}x{args.height}, {len(board_map.doors_pos)} puertas, "
+        f"{len(board_map.entries)} entradas")
+
+
+if __name__ == "__main__":
+  main()
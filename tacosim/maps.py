@@ -0,0 +1,195 @@
+# Mapas del tablero: formato JSON, cargador y validación.
+#
+# Un mapa describe un tablero de W x H:
+#   {
+#     "width": 8, "height": 6,
+#     "walls": ["0011 0010 0000 ...", ...],   # una fila por y (0 = abajo);
+#                                             # 4 bits por celda: arriba,
+#                                             # derecha, abajo, izquierda
+#     "doors": [[x1, y1, x2, y2], ...],       # puertas entre celdas vecinas,
+#                                             # sobre una pared; una por celda
+#     "entries": [[x, y], ...],
+#     "fire": [[x, y], ...],
+#     "victims": [[x, y], ...],
+#     "false_alarms": [[x, y], ...],
+#     "bag": {"victims": 10, "false_alarms": 5},   # opcional
+#     "start_entries": [3, 0, 2, 2, 0, 1]          # opcional
+#   }
+# "walls" también acepta la lista anidada [y][x][pared] de board.WALLS.
+#
+# load_map valida el mapa una sola vez y construye los índices derivados
+# (conjunto de entradas y entrada más cercana por celda) que el modelo usa
+# en lugar de recorrer listas en cada turno.
+import json
+
+import numpy as np
+
+from . import board
+
+# Índice de pared -> (dx, dy), en el orden [arriba, derecha, abajo, izquierda]
+WALL_DELTAS = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+WALL_INDEX = {d: i for i, d in enumerate(WALL_DELTAS)}
+
+
+class BoardMap:
+  def __init__(self, width, height, walls, doors_pos, entries, fire_pos, victims,
+               false_alarms, total_victims=board.TOTAL_VICTIMS,
+               total_false_alarms=board.TOTAL_FALSE_ALARMS, start_entries=None):
+    self.width = width
+    self.height = height
+    self.walls = np.asarray(walls, dtype=np.int8)
+    self.doors_pos = [tuple(d) for d in doors_pos]
+    self.entries = [tuple(p) for p in entries]
+    self.fire_pos = [tuple(p) for p in fire_pos]
+    self.victims = [tuple(p) for p in victims]
+    self.false_alarms = [tuple(p) for p in false_alarms]
+    self.total_victims = total_victims
+    self.total_false_alarms = total_false_alarms
+    # Entrada inicial de cada agente (índices en entries, se repiten en ciclo)
+    self.start_entries = list(range(len(self.entries)) if start_entries is None else start_entries)
+
+    self.validate()
+
+    # Índices derivados
+    self.entry_set = frozenset(self.entries)
+    self.nearest_entry = self._nearest_entry_table()
+
+  # Función que verifica que el mapa sea consistente; lanza ValueError
+  def validate(self):
+    W, H = self.width, self.height
+    if W <= 0 or H <= 0:
+      raise ValueError(f"Tamaño inválido: {W}x{H}")
+    if self.walls.shape != (H, W, 4):
+      raise ValueError(f"walls debe tener forma ({H}, {W}, 4), no {self.walls.shape}")
+    if not np.isin(self.walls, (0, 1)).all():
+      raise ValueError("walls solo puede contener 0 y 1")
+
+    # Cada pared interior debe verse igual desde ambas celdas
+    w = self.walls
+    if (w[:-1, :, 0] != w[1:, :, 2]).any() or (w[:, :-1, 1] != w[:, 1:, 3]).any():
+      raise ValueError("walls no es simétrico entre celdas vecinas")
+
+    def check_cell(name, p):
+      if not (0 <= p[0] < W and 0 <= p[1] < H):
+        raise ValueError(f"{name} fuera del tablero: {p}")
+
+    for name in ("entries", "fire_pos", "victims", "false_alarms"):
+      for p in getattr(self, name):
+        check_cell(name, p)
+    if not self.entries:
+      raise ValueError("El mapa necesita al menos una entrada")
+    pois = self.victims + self.false_alarms
+    if len(set(pois)) != len(pois):
+      raise ValueError("Hay POIs repetidos en la misma celda")
+    if len(self.victims) > self.total_victims or len(self.false_alarms) > self.total_false_alarms:
+      raise ValueError("Hay más POIs iniciales que los de la bolsa")
+
+    # El modelo guarda una puerta por celda (doors_dict), y una puerta es una
+    # pared que se abre: debe estar sobre una arista con pared
+    with_door = set()
+    for (x1, y1, x2, y2) in self.doors_pos:
+      check_cell("doors", (x1, y1))
+      check_cell("doors", (x2, y2))
+      if (x2 - x1, y2 - y1) not in WALL_INDEX:
+        raise ValueError(f"La puerta {(x1, y1, x2, y2)} no une celdas vecinas")
+      if w[y1, x1, WALL_INDEX[(x2 - x1, y2 - y1)]] != 1:
+        raise ValueError(f"La puerta {(x1, y1, x2, y2)} está en una arista sin pared")
+      for cell in ((x1, y1), (x2, y2)):
+        if cell in with_door:
+          raise ValueError(f"La celda {cell} tiene más de una puerta")
+        with_door.add(cell)
+
+    for i in self.start_entries:
+      if not 0 <= i < len(self.entries):
+        raise ValueError(f"start_entries apunta a una entrada inexistente: {i}")
+
+  # Entrada más cercana (Manhattan, la primera en caso de empate) por celda
+  def _nearest_entry_table(self):
+    xs = np.arange(self.width)[:, None, None]
+    ys = np.arange(self.height)[None, :, None]
+    ex = np.array([e[0] for e in self.entries])[None, None, :]
+    ey = np.array([e[1] for e in self.entries])[None, None, :]
+    best = np.argmin(np.abs(xs - ex) + np.abs(ys - ey), axis=2)
+    return [[self.entries[best[x, y]] for y in range(self.height)] for x in range(self.width)]
+
+  # Diccionario de puertas en ambos sentidos, como lo usa el modelo
+  def doors_dict(self):
+    doors = {}
+    for (x1, y1, x2, y2) in self.doors_pos:
+      doors[(x1, y1)] = (x2, y2)
+      doors[(x2, y2)] = (x1, y1)
+    return doors
+
+  def to_dict(self):
+    return {
+      "width": self.width,
+      "height": self.height,
+      "walls": [" ".join("".join(str(int(v)) for v in cell) for cell in row) for row in self.walls],
+      "doors": [list(d) for d in self.doors_pos],
+      "entries": [list(p) for p in self.entries],
+      "fire": [list(p) for p in self.fire_pos],
+      "victims": [list(p) for p in self.victims],
+      "false_alarms": [list(p) for p in self.false_alarms],
+      "bag": {"victims": self.total_victims, "false_alarms": self.total_false_alarms},
+      "start_entries": list(self.start_entries),
+    }
+
+
+def _parse_walls(walls):
+  rows = []
+  for row in walls:
+    if isinstance(row, str):
+      rows.append([[int(c) for c in cell] for cell in row.split()])
+    else:
+      rows.append(row)
+  return rows
+
+
+# Función que construye un BoardMap a partir de un diccionario con el formato
+# de arriba
+def map_from_dict(data):
+  try:
+    bag = data.get("bag", {})
+    return BoardMap(
+      width=data["width"],
+      height=data["height"],
+      walls=_parse_walls(data["walls"]),
+      doors_pos=data.get("doors", []),
+      entries=data["entries"],
+      fire_pos=data.get("fire", []),
+      victims=data.get("victims", []),
+      false_alarms=data.get("false_alarms", []),
+      total_victims=bag.get("victims", board.TOTAL_VICTIMS),
+      total_false_alarms=bag.get("false_alarms", board.TOTAL_FALSE_ALARMS),
+      start_entries=data.get("start_entries"),
+    )
+  except KeyError as e:
+    raise ValueError(f"Falta el campo {e.args[0]!r} en el mapa") from None
+
+
+# Función que carga un mapa desde un archivo JSON (o un diccionario ya leído)
+def load_map(source):
+  if isinstance(source, dict):
+    return map_from_dict(source)
+  with open(source) as f:
+    return map_from_dict(json.load(f))
+
+
+def save_map(board_map, path):
+  with open(path, "w") as f:
+    json.dump(board_map.to_dict(), f, indent=1)
+
+
+_default = None
+
+
+# El tablero original de 8x6 (se valida una sola vez)
+def default_map():
+  global _default
+  if _default is None:
+    _default = BoardMap(
+      width=8, height=6, walls=board.WALLS, doors_pos=board.DOORS_POS,
+      entries=board.ENTRIES, fire_pos=board.FIRE_POS, victims=board.VICTIMS,
+      false_alarms=board.FALSE_ALARMS, start_entries=board.START_ENTRIES,
+    )
+  return _default
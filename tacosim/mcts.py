@@ -0,0 +1,276 @@
+# Política MCTS: planea el turno del agente actual con búsqueda en árbol de
+# Monte Carlo (UCT de lazo abierto) sobre copias del modelo.
+#
+# Una acción es el objetivo del turno: un POI sin revelar, una de las celdas
+# con fuego más cercanas o, si carga una víctima, una de las entradas más
+# cercanas. La secuencia de acciones del turno de 8 AP que sale de cada
+# objetivo es la de StrategicPolicy.follow (ruta de A*, apagar, recoger,
+# dejar). Cada iteración:
+#   1. copia el modelo (TacoRescueModel.clone) con otra semilla, así cada
+#      iteración ve otro futuro del fuego
+#   2. baja por el árbol eligiendo con UCT el objetivo de los turnos del
+#      agente (hasta 'depth' turnos propios) y agrega un nodo nuevo
+#   3. los demás agentes juegan la política estratégica y entre turnos corren
+#      advance_fire y replenish_poi (model.play_turn)
+#   4. sigue 'rounds' rondas con la política estratégica y propaga la mejora
+#      de evaluate() respecto al estado inicial
+#
+# Paralelismo de raíz: con workers > 1 cada proceso de un
+# ProcessPoolExecutor hace su propia búsqueda con otra semilla sobre el
+# modelo serializado, se suman las visitas de los hijos de la raíz y se juega
+# el objetivo más visitado. El presupuesto es 'rollouts' iteraciones en total
+# y/o 'time_limit' segundos por búsqueda (y a lo más la mitad de lo que
+# queda del presupuesto del paso, model.step_budget). Con tiempo, una
+# iteración que no termina antes del límite se abandona y, si no terminó
+# ninguna, el turno usa el objetivo de la política estratégica; solo con
+# rollouts (sin tiempo) la partida es reproducible con la semilla del modelo.
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .landmarks import LandmarkTable
+
+# Valor extra de una partida ganada o perdida en evaluate()
+WIN = 5.0
+LOSS = -5.0
+# Peso por AP de distancia en el término de avance de evaluate()
+CARRY_DISTANCE = 0.05
+SEEK_DISTANCE = 0.02
+
+
+# Función que califica un estado: víctimas rescatadas y cargadas contra
+# víctimas perdidas, daño del edificio y celdas con fuego, más un término de
+# avance (distancia de quien carga a su entrada y de los demás al POI más
+# cercano) para que unos pocos turnos simulados distingan los objetivos
+def evaluate(model):
+  value = (model.rescued_count + 0.5 * model.victims_on_board - model.lost_victims
+           - 0.05 * model.damage - 0.02 * len(model.fire_front.fire))
+  if model.rescued_count >= 7:
+    value += WIN
+  elif model.damage >= 24 or model.lost_victims >= 4:
+    value += LOSS
+
+  estimate = model.landmarks.estimate
+  for agent in model.grid.agents:
+    pos = agent.pos
+    if agent.carrying_victim:
+      value -= CARRY_DISTANCE * estimate(pos, agent.nearest_entry())
+    elif model.poi_unknown:
+      value -= SEEK_DISTANCE * min(estimate(pos, poi) for poi in model.poi_unknown)
+  return value
+
+
+# Función que regresa los objetivos candidatos del turno del agente, en un
+# orden fijo
+def candidate_targets(agent, fires=3, entries=2):
+  model = agent.model
+  estimate = model.landmarks.estimate
+  pos = agent.pos
+  if agent.carrying_victim:
+    return sorted(model.entries, key=lambda c: (estimate(pos, c), c))[:entries]
+  nearest = sorted(model.fire_front.fire, key=lambda c: (estimate(pos, c), c))[:fires]
+  return sorted(model.poi_unknown) + nearest
+
+
+# Si está sobre una víctima y no carga otra, la recoge (inicio del turno de
+# StrategicPolicy)
+def _pick_up(agent):
+  if agent.model.poi[agent.pos] == 1 and not agent.carrying_victim:
+    agent.pick_up_victim(agent.pos)
+
+
+class _Node:
+  __slots__ = ("visits", "total", "children")
+
+  def __init__(self):
+    self.visits = 0
+    self.total = 0.0
+    self.children = {}
+
+
+# Elige el hijo de 'node' entre los candidatos: primero los que no se han
+# probado (en orden) y luego el de mayor UCT, con el valor medio llevado a
+# [0, 1] según las recompensas vistas ('bounds' = [mínima, máxima]). Regresa
+# (objetivo, hijo)
+def _select(node, candidates, exploration, bounds):
+  best, best_score = None, None
+  log_n = math.log(max(node.visits, 1))
+  low, high = bounds
+  span = high - low if high > low else 1.0
+  for target in candidates:
+    child = node.children.get(target)
+    if child is None or child.visits == 0:
+      return target, node.children.setdefault(target, _Node())
+    mean = (child.total / child.visits - low) / span
+    score = mean + exploration * math.sqrt(log_n / child.visits)
+    if best_score is None or score > best_score:
+      best, best_score = target, score
+  return best, node.children[best]
+
+
+# Una iteración sobre la copia 'sim'; el agente en turno ya recargó AP y
+# elige entre 'candidates' (calculados sobre el modelo real). Si llega el
+# 'deadline' antes de terminar la abandona sin propagar y regresa False
+def _iterate(sim, root, candidates, base, bounds, params, strategic, deadline=None):
+  slot = sim.current_index
+  players = len(sim.grid.agents)
+  node = root
+  visited = [root]
+  own = 0
+  for step in range((params["depth"] + params["rounds"]) * players):
+    if sim.end_game():
+      break
+    if deadline is not None and time.perf_counter() >= deadline:
+      return False
+    agent = sim.grid.agents[sim.current_index]
+    if step:
+      sim.steps += 1
+    if node is None or agent.slot != slot or own >= params["depth"]:
+      sim.play_turn()
+      continue
+
+    if step:
+      agent.refill_ap()
+      _pick_up(agent)
+      candidates = candidate_targets(agent, params["fires"])
+    if not candidates:
+      sim.play_turn()
+      continue
+    target, child = _select(node, candidates, params["exploration"], bounds)
+    new = child.visits == 0
+    visited.append(child)
+    sim.play_turn(lambda a: strategic.follow(a, target))
+    own += 1
+    node = None if new else child
+
+  reward = evaluate(sim) - base
+  bounds[0] = min(bounds[0], reward)
+  bounds[1] = max(bounds[1], reward)
+  for n in visited:
+    n.visits += 1
+    n.total += reward
+  return True
+
+
+# Búsqueda de un proceso: regresa ({objetivo: (visitas, suma)}, iteraciones)
+def _search(model, candidates, seed, rollouts, time_limit, params):
+  from .policies import StrategicPolicy
+  strategic = StrategicPolicy()
+  deadline = None if time_limit is None else time.perf_counter() + time_limit
+  rng = random.Random(seed)
+  root = _Node()
+  base = evaluate(model)
+  # Las paredes cambian seguido en las simulaciones y recalcular los
+  # landmarks en cada copia domina el costo: ahí basta la heurística
+  # Manhattan (mismo costo óptimo, solo expande más nodos); por lo mismo
+  # las simulaciones no usan el mapa de riesgo de fuego
+  manhattan = LandmarkTable(model, count=0)
+  bounds = [math.inf, -math.inf]
+  done = 0
+  while rollouts is None or done < rollouts:
+    if deadline is not None and time.perf_counter() >= deadline:
+      break
+    sim = model.clone()
+    sim.policy = strategic
+    sim.landmarks = manhattan
+    sim.step_budget = None
+    sim.risk = None
+    sim.random.seed(rng.getrandbits(64))
+    sim.rng = np.random.default_rng(rng.getrandbits(64))
+    if not _iterate(sim, root, candidates, base, bounds, params, strategic, deadline):
+      break
+    done += 1
+  return {target: (child.visits, child.total) for target, child in root.children.items() if child.visits}, done
+
+
+class MCTSPolicy:
+  name = "mcts"
+
+  def __init__(self, rollouts=64, time_limit=None, workers=1, depth=2, rounds=1, fires=3,
+               exploration=1.0):
+    if rollouts is None and time_limit is None:
+      raise ValueError("MCTSPolicy necesita rollouts o time_limit")
+    if workers < 1:
+      raise ValueError(f"workers debe ser al menos 1: {workers!r}")
+    from .policies import StrategicPolicy
+    self.rollouts = rollouts
+    self.time_limit = time_limit
+    self.workers = workers
+    self.params = dict(depth=depth, rounds=rounds, fires=fires, exploration=exploration)
+    self._strategic = StrategicPolicy()
+    self._pool = None
+    # Estadísticas de la última búsqueda (iteraciones, segundos y visitas y
+    # valor medio por objetivo)
+    self.last_search = None
+
+  # El pool de procesos no se copia ni se serializa con el modelo
+  def __getstate__(self):
+    state = self.__dict__.copy()
+    state["_pool"] = None
+    return state
+
+  def take_turn(self, agent):
+    _pick_up(agent)
+    self._strategic.follow(agent, self.choose_target(agent))
+
+  # Método que elige el objetivo del turno: el hijo de la raíz más visitado
+  # (empates: mayor valor medio y luego el orden de los candidatos). Si el
+  # tiempo no alcanzó para ninguna iteración usa el de la política estratégica
+  def choose_target(self, agent):
+    candidates = candidate_targets(agent, self.params["fires"])
+    if len(candidates) <= 1:
+      return candidates[0] if candidates else self._strategic.choose_target(agent)
+    children = self.search(agent.model, candidates)
+    if not children:
+      return self._strategic.choose_target(agent)
+    def rank(i):
+      visits, total = children.get(candidates[i], (0, 0.0))
+      return (visits, total / visits if visits else -math.inf, -i)
+    return candidates[max(range(len(candidates)), key=rank)]
+
+  # Método que busca desde el estado actual del modelo (el agente en turno ya
+  # recargó AP) entre los objetivos 'candidates'; regresa {objetivo:
+  # (visitas, suma de recompensas)}
+  def search(self, model, candidates):
+    t0 = time.perf_counter()
+    seed = int(model.rng.integers(1 << 62))
+    # Con presupuesto del paso (model.deadline) la búsqueda usa a lo más la
+    # mitad de lo que queda; el resto es para la ruta del turno
+    time_limit = self.time_limit
+    if model.deadline is not None:
+      remaining = max(model.deadline - t0, 0.0) / 2
+      time_limit = remaining if time_limit is None else min(time_limit, remaining)
+    if self.workers == 1:
+      results = [_search(model, candidates, seed, self.rollouts, time_limit, self.params)]
+    else:
+      if self._pool is None:
+        self._pool = ProcessPoolExecutor(max_workers=self.workers)
+      share = None if self.rollouts is None else -(-self.rollouts // self.workers)
+      futures = [self._pool.submit(_search, model, candidates, seed + i, share, time_limit, self.params)
+                 for i in range(self.workers)]
+      results = [f.result() for f in futures]
+
+    children = {}
+    rollouts = 0
+    for stats, done in results:
+      rollouts += done
+      for target, (visits, total) in stats.items():
+        v, t = children.get(target, (0, 0.0))
+        children[target] = (v + visits, t + total)
+    self.last_search = {
+      "rollouts": rollouts,
+      "seconds": time.perf_counter() - t0,
+      "children": {target: (v, t / v if v else 0.0) for target, (v, t) in children.items()},
+    }
+    if model.metrics is not None:
+      model.metrics.observe("search.mcts.rollouts", rollouts)
+    return children
+
+  # Método que termina los procesos del pool (si se crearon)
+  def close(self):
+    if self._pool is not None:
+      self._pool.shutdown()
+      self._pool = None
@@ -0,0 +1,198 @@
+# Instrumentación opcional del simulador: contadores e histogramas por fase.
+#
+# Un objeto Metrics se activa envolviendo los métodos del modelo a nivel de
+# instancia y cambiando la clase de sus agentes por una subclase
+# instrumentada (instrument_model). Si nunca se activa, las clases quedan
+# intactas y el costo es cero; la única excepción son los nodos expandidos
+# por las búsquedas, que se cuentan en una variable local y se reportan si
+# model.metrics no es None.
+#
+#   metrics = Metrics()
+#   for seed in range(100):
+#     model = TacoRescueModel(seed=seed, metrics=metrics)
+#     while not model.end_game():
+#       model.step()
+#   metrics.snapshot()
+import functools
+import time
+from contextlib import contextmanager
+
+# Fases de TacoRescueModel.step y sub-fases del fuego
+MODEL_PHASES = {
+  "advance_fire": "phase.advance_fire",
+  "replenish_poi": "phase.replenish_poi",
+  "flashover": "fire.flashover",
+  "explosion": "fire.explosion",
+}
+
+# Acciones de los agentes
+AGENT_ACTIONS = [
+  "try_move", "open_door", "damage_wall", "remove_smoke", "extinguish_fire",
+  "fire_to_smoke", "pick_up_victim", "drop_off_victim", "remove_false_alarm",
+  "knock_out",
+]
+
+# Búsquedas de rutas (se cuentan por turno)
+AGENT_SEARCHES = ["a_star", "shortest_cost", "costs_within"]
+
+
+# Histograma con cubetas en potencias de 2; los tiempos se guardan en
+# microsegundos para que las cubetas tengan sentido.
+class Histogram:
+  def __init__(self, unit=""):
+    self.unit = unit
+    self.count = 0
+    self.total = 0.0
+    self.min = None
+    self.max = None
+    self.buckets = {}
+
+  def observe(self, value):
+    self.count += 1
+    self.total += value
+    if self.min is None or value < self.min:
+      self.min = value
+    if self.max is None or value > self.max:
+      self.max = value
+    # Cubeta b contiene los valores en [2^(b-1), 2^b)
+    b = int(value).bit_length()
+    self.buckets[b] = self.buckets.get(b, 0) + 1
+
+  # Percentil aproximado: límite superior de la cubeta que lo contiene
+  def percentile(self, q):
+    if not self.count:
+      return None
+    target = q * self.count
+    seen = 0
+    for b in sorted(self.buckets):
+      seen += self.buckets[b]
+      if seen >= target:
+        return min(float(2 ** b), self.max)
+    return self.max
+
+  def to_dict(self):
+    return {
+      "unit": self.unit,
+      "count": self.count,
+      "total": self.total,
+      "mean": self.total / self.count if self.count else None,
+      "min": self.min,
+      "max": self.max,
+      "p50": self.percentile(0.5),
+      "p90": self.percentile(0.9),
+      "p99": self.percentile(0.99),
+      "buckets": {f"<{2 ** b}": n for b, n in sorted(self.buckets.items())},
+    }
+
+
+class Metrics:
+  def __init__(self):
+    self.counters = {}
+    self.histograms = {}
+    self.searches = 0
+    # Subclases instrumentadas por clase de agente
+    self._agent_classes = {}
+
+  def reset(self):
+    self.counters.clear()
+    self.histograms.clear()
+    self.searches = 0
+
+  def count(self, name, value=1):
+    self.counters[name] = self.counters.get(name, 0) + value
+
+  def observe(self, name, value, unit=""):
+    hist = self.histograms.get(name)
+    if hist is None:
+      hist = self.histograms[name] = Histogram(unit)
+    hist.observe(value)
+
+  # Contexto que mide la duración de una fase
+  @contextmanager
+  def phase(self, name):
+    t0 = time.perf_counter()
+    try:
+      yield
+    finally:
+      self.observe(name, (time.perf_counter() - t0) * 1e6, "us")
+
+  # Decorador que mide cada llamada a la función bajo el nombre dado
+  def timed(self, name):
+    def decorator(fn):
+      @functools.wraps(fn)
+      def wrapper(*args, **kwargs):
+        t0 = time.perf_counter()
+        try:
+          return fn(*args, **kwargs)
+        finally:
+          self.observe(name, (time.perf_counter() - t0) * 1e6, "us")
+      return wrapper
+    return decorator
+
+  # Envuelve obj.<method> a nivel de instancia con timed(name)
+  def wrap_method(self, obj, method, name):
+    setattr(obj, method, self.timed(name)(getattr(obj, method)))
+
+  def snapshot(self):
+    return {
+      "counters": dict(self.counters),
+      "histograms": {k: h.to_dict() for k, h in sorted(self.histograms.items())},
+    }
+
+  # Instrumenta un TacoRescueModel ya construido y a todos sus agentes
+  def instrument_model(self, model):
+    model.metrics = self
+    self.wrap_method(model, "step", "step")
+    self.wrap_method(model.datacollector, "collect", "phase.collect")
+    for method, name in MODEL_PHASES.items():
+      self.wrap_method(model, method, name)
+    for agent in model.grid.agents:
+      self.instrument_agent(agent)
+
+  # Los agentes usan __slots__ (no aceptan atributos por instancia): se
+  # instrumentan cambiando su clase por una subclase con los métodos
+  # envueltos, creada una vez por cada Metrics y clase de agente.
+  def instrument_agent(self, agent):
+    cls = type(agent)
+    if getattr(cls, "_metrics", None) is self:
+      return
+    if cls not in self._agent_classes:
+      self._agent_classes[cls] = self._instrumented_class(cls)
+    agent.__class__ = self._agent_classes[cls]
+
+  def _instrumented_class(self, cls):
+    methods = {"__slots__": (), "_metrics": self}
+    for action in AGENT_ACTIONS:
+      methods[action] = self.timed(f"action.{action}")(getattr(cls, action))
+    for search in AGENT_SEARCHES:
+      methods[search] = self._wrap_search(getattr(cls, search), search)
+
+    # El turno completo, con cuántas búsquedas de ruta hizo
+    turn = cls.step
+    @functools.wraps(turn)
+    def step(agent):
+      before = self.searches
+      t0 = time.perf_counter()
+      try:
+        return turn(agent)
+      finally:
+        self.observe("phase.agent_turn", (time.perf_counter() - t0) * 1e6, "us")
+        self.observe("turn.searches", self.searches - before)
+    methods["step"] = step
+    return type(cls.__name__, (cls,), methods)
+
+  def _wrap_search(self, fn, search):
+    timed = self.timed(f"search.{search}")(fn)
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+      self.searches += 1
+      self.count(f"search.{search}.calls")
+      return timed(*args, **kwargs)
+    return wrapper
+
+  # Instrumenta las fases de un TacoRescueBatch
+  def instrument_batch(self, batch):
+    batch.metrics = self
+    self.wrap_method(batch, "step", "batch.step")
+    for method in ("agent_step", "advance_fire", "replenish_poi", "_finish"):
+      self.wrap_method(batch, method, f"batch.{method.lstrip('_')}")
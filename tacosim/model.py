@@ -0,0 +1,607 @@
+# Modelo del juego: tablero, fuego, POIs y turnos de los agentes estratégicos.
+import copy
+import heapq
+import logging
+import time
+
+import numpy as np
+from mesa import Model
+from mesa.datacollection import DataCollector
+
+from .landmarks import LandmarkTable
+from .maps import default_map
+from .agent import TacoRescueAgent
+from .allocation import ALLOCATIONS, TaskAllocator
+from .connectivity import Connectivity
+from .events import EventLog
+from .firefront import DIRECTIONS, FireFront
+from . import kernels
+from .metrics import Metrics
+from .occupancy import Occupancy
+from .policies import make_policy
+from .rays import DIRECTION_INDEX, WALL_SIDES, RayTable
+from .risk import FireRisk
+from .weights import make_weights
+from .rooms import PLANNERS, RoomGraph
+from .render import get_grid
+from .zobrist import ZobristHash
+
+logger = logging.getLogger(__name__)
+
+def _datacollector():
+  return DataCollector(model_reporters=
+      {"Grid":get_grid,
+      "Walls": lambda model: np.copy(model.walls),
+      "WallsDamage": lambda model: np.copy(model.walls_damage),
+      "Steps": lambda model: model.steps})
+
+
+# Contador del modelo que avisa sus cambios al hash del estado
+def _counter(name):
+  attr = "_" + name
+
+  def get(self):
+    return getattr(self, attr)
+
+  def set(self, value):
+    if self.zobrist is not None:
+      self.zobrist.counter_changed(name, getattr(self, attr), value)
+    setattr(self, attr, value)
+
+  return property(get, set)
+
+
+class TacoRescueModel(Model):
+  # Hash de Zobrist del estado (ver tacosim.zobrist); se crea al final de
+  # __init__, con el tablero ya armado
+  zobrist = None
+
+  damage = _counter("damage")
+  rescued_count = _counter("rescued_count")
+  lost_victims = _counter("lost_victims")
+  victims_on_board = _counter("victims_on_board")
+  victims_count = _counter("victims_count")
+  false_alarms_count = _counter("false_alarms_count")
+
+  def __init__(self, width=8, height=6, players=6, policy="strategic", seed=None, metrics=None,
+               board_map=None, backend="auto", planner="grid",
+               landmarks=8, horizon=None, allocation="greedy", step_budget=None,
+               fire_risk=None, weights=None):
+    # Mesa 3.0.0 solo siembra 'random' con seed=...; pasarlo como rng=...
+    # siembra tanto 'random' como 'rng', así la partida es reproducible.
+    super().__init__(rng=seed)
+
+    # Política que decide el turno de cada agente ("random", "strategic" o
+    # una instancia con el método take_turn(agent))
+    self.policy = make_policy(policy)
+
+    # Instrumentación opcional (ver tacosim.metrics); None = desactivada
+    self.metrics = None
+
+    # Kernels compilados (ver tacosim.kernels): "auto" usa Numba si está
+    # instalado, "python" la implementación de referencia y "numba" lo exige.
+    # None = implementación de referencia
+    self.kernels = kernels.load(backend)
+    self.backend = "python" if self.kernels is None else "numba"
+
+    # Mapa del tablero (tacosim.maps); sin mapa solo existe el tablero de 8x6
+    if board_map is None:
+      if (width, height) != (8, 6):
+        raise ValueError(f"No hay mapa para un tablero de {width}x{height}; "
+                         "pasa board_map=tacosim.maps.load_map(...)")
+      board_map = default_map()
+    self.board_map = board_map
+    width, height = board_map.width, board_map.height
+
+    # Ocupación del tablero y orden de turnos (ver tacosim.occupancy)
+    self.grid = Occupancy(width, height, capacity=players)
+    self.datacollector = _datacollector()
+
+    self.steps = 0
+    self.current_index = 0
+    self._agent_counter = 0
+
+    self.assigned_pois = {}
+    # Registro columnar de acciones de los agentes (ver tacosim.events)
+    self.events = EventLog()
+
+    self.damage = 0
+    self.rescued_count = 0
+    self.lost_victims = 0
+    self.victims_count = board_map.total_victims
+    self.false_alarms_count = board_map.total_false_alarms
+    self.victims_on_board = 0
+    self.victims = list(board_map.victims)
+    self.false_alarms = list(board_map.false_alarms)
+    self.poi_unknown = self.victims + self.false_alarms
+    self.fire_pos = list(board_map.fire_pos)
+    self.entries = list(board_map.entries)
+    self.entry_set = board_map.entry_set
+    self.doors_pos = list(board_map.doors_pos)
+
+    # Diccionario que almacena información de las puertas
+    # Cada puerta conecta dos celdas, se registran en ambos sentidos
+    self.doors = board_map.doors_dict()
+
+    # Cada celda tiene un array de 4 paredes: [arriba, derecha, abajo, izquierda]
+    # 0: No hay pared / puerta abierta | 1: Si hay pared / puerta cerrada
+    self.walls = board_map.walls.astype(int)
+
+    # Matriz que almacena daño acumulado en paredes
+    self.walls_damage = np.zeros( (width, height, 4) )
+
+    # Matriz que almacena el estado del fuego
+    # 0: Vacío | 1 = Humo | 2 = Fuego
+    self.fire = np.zeros( (width, height) )
+    for (x, y) in self.fire_pos:
+      self.fire[x][y] = 2
+
+    # Matriz que almacena el estado de los POI
+    # 0: Vacío | 1 = Víctima | 2 = Falsa Alarma
+    self.poi = np.zeros( (width, height) )
+    for (x, y) in self.victims:
+      self.poi[x][y] = 1
+      self.victims_count -= 1
+    for (x, y) in self.false_alarms:
+      self.poi[x][y] = 2
+      self.false_alarms_count -= 1
+
+    # Conjuntos de fuego, humo y frontera (ver tacosim.firefront) y rayos de
+    # las ondas expansivas (ver tacosim.rays)
+    self.fire_front = FireFront(self)
+    self.rays = RayTable(self)
+
+    # Componentes de celdas sin fuego, para descartar búsquedas imposibles
+    # cargando una víctima (ver tacosim.connectivity)
+    self.connectivity = Connectivity(self)
+
+    # Dirección de la puerta de cada celda (kernels.NO_DOOR si no tiene),
+    # para las búsquedas compiladas
+    self.door_dirs = kernels.door_directions(self.doors, width, height)
+
+    # Pesos de planeación de los agentes (costo extra de paredes y puertas,
+    # costo de apagar y orden POI/fuego; ver tacosim.weights). None = los de
+    # siempre; un dict cambia solo los que trae
+    self.weights = make_weights(weights)
+
+    # Planificador de rutas: "grid" busca celda por celda y "rooms" sobre el
+    # grafo de cuartos y portales (ver tacosim.rooms)
+    if planner not in PLANNERS:
+      raise ValueError(f"Planificador desconocido: {planner!r} (opciones: {', '.join(PLANNERS)})")
+    self.rooms = RoomGraph(self) if planner == "rooms" else None
+
+    # Heurística de A* con 'landmarks' celdas de referencia (ver
+    # tacosim.landmarks); 0 = distancia Manhattan
+    self.landmarks = LandmarkTable(self, count=landmarks)
+
+    # Modo acotado de selección de objetivos: None busca el costo exacto a
+    # cada candidato; un número de turnos limita la búsqueda a los AP de esos
+    # turnos (ver TacoRescueAgent.nearest_poi)
+    if horizon is not None and horizon < 1:
+      raise ValueError(f"horizon debe ser None o al menos 1 turno: {horizon!r}")
+    self.horizon = horizon
+
+    # Reparto de POIs: "greedy" deja que cada agente busque el más cercano y
+    # "hungarian" los asigna por ronda con assign_poi (ver tacosim.allocation)
+    if allocation not in ALLOCATIONS:
+      raise ValueError(f"Asignación desconocida: {allocation!r} (opciones: {', '.join(ALLOCATIONS)})")
+    self.allocator = TaskAllocator(self) if allocation == "hungarian" else None
+
+    # Presupuesto de planificación por paso en segundos: None = sin límite;
+    # con un número el turno del agente corre con model.deadline y sus
+    # búsquedas regresan lo mejor que llevan al vencer (ver
+    # TacoRescueAgent.nearest_poi y a_star). planning_time es lo que tardó el
+    # último turno y budget_overruns cuántos turnos se pasaron
+    if step_budget is not None and step_budget <= 0:
+      raise ValueError(f"step_budget debe ser None o mayor que 0: {step_budget!r}")
+    self.step_budget = step_budget
+    self.deadline = None
+    self.planning_time = None
+    self.budget_overruns = 0
+
+    # Mapa de riesgo de fuego (ver tacosim.risk): None = desactivado; un
+    # peso en AP suma a cada paso de las rutas peso x probabilidad de que la
+    # celda se encienda antes del siguiente turno del agente
+    self.risk = FireRisk(self, fire_risk, steps=players) if fire_risk is not None else None
+
+    # Colocar agentes en las entradas del tablero
+    start = board_map.start_entries
+    for i in range(players):
+      position = self.entries[start[i % len(start)]]
+      agent = TacoRescueAgent(self, i)
+      self._agent_counter += 1
+      agent.uid = self._agent_counter
+      self.grid.place_agent(agent, position)
+
+    # metrics=True crea un Metrics propio; una instancia se puede compartir
+    # entre varios modelos para agregar una corrida por lotes
+    if metrics is True:
+      metrics = Metrics()
+    if metrics:
+      metrics.instrument_model(self)
+
+    self.zobrist = ZobristHash(self)
+    self.grid.zobrist = self.zobrist
+
+  # Método que retorna un agente por uid
+  def get_agent_by_uid(self, uid):
+    return self.grid.get_agent_by_uid(uid)
+
+  # El estado sin lo que no se puede copiar ni serializar: los métodos
+  # envueltos (el paso de Mesa y la instrumentación), el datacollector, los
+  # kernels compilados y las métricas
+  def __getstate__(self):
+    state = {name: value for name, value in self.__dict__.items() if not callable(value)}
+    del state["datacollector"], state["kernels"]
+    state["metrics"] = None
+    return state
+
+  def __setstate__(self, state):
+    self.__dict__.update(state)
+    self.kernels = kernels.load(self.backend)
+    self.datacollector = _datacollector()
+    self._user_step = self.step
+    self.step = self._wrapped_step
+
+  # Método que copia el modelo para simular jugadas (ver tacosim.mcts). La
+  # copia comparte el mapa, empieza con el registro de eventos vacío y no
+  # tiene métricas
+  def clone(self):
+    memo = {id(self.board_map): self.board_map, id(self.entry_set): self.entry_set,
+            id(self.events): EventLog()}
+    for table in self.landmarks.shared_tables():
+      memo[id(table)] = table
+    return copy.deepcopy(self, memo)
+
+  # Método que regresa el hash de Zobrist del estado actual (O(1))
+  def state_hash(self):
+    return self.zobrist.value
+
+  # Método que cambia el estado de fuego de una celda y actualiza la frontera
+  def set_fire(self, x, y, value):
+    if self.zobrist is not None:
+      self.zobrist.fire_changed(x, y, self.fire[x][y], value)
+    self.fire[x][y] = value
+    self.fire_front.cell_changed(x, y, value)
+    self.connectivity.cell_changed(x, y, value)
+    if self.rooms is not None:
+      self.rooms.cell_changed(x, y)
+
+  # Método que cambia el contenido de POI de una celda
+  def set_poi(self, x, y, value):
+    if self.zobrist is not None:
+      self.zobrist.poi_changed(x, y, self.poi[x][y], value)
+    self.poi[x][y] = value
+
+  # Método que cambia el lado 'side' [arriba, derecha, abajo, izquierda] de la
+  # pared o puerta de (x, y); después hay que llamar a walls_changed
+  def set_wall(self, x, y, side, value):
+    if self.zobrist is not None:
+      self.zobrist.wall_changed(x, y, side, self.walls[y][x][side], value)
+    self.walls[y][x][side] = value
+
+  # Método que suma un golpe al lado 'side' de la pared de (x, y) y regresa
+  # el daño acumulado
+  def add_wall_damage(self, x, y, side):
+    old = self.walls_damage[x][y][side]
+    if self.zobrist is not None:
+      self.zobrist.damage_changed(x, y, side, old, old + 1)
+    self.walls_damage[x][y][side] = old + 1
+    return old + 1
+
+  # Método que se llama después de abrir, dañar o destruir la pared o puerta
+  # entre (x, y) y (nx, ny)
+  def walls_changed(self, x, y, nx, ny):
+    self.fire_front.edge_changed(x, y, nx, ny)
+    self.rays.edge_changed(x, y, nx, ny)
+    if self.rooms is not None:
+      self.rooms.edge_changed(x, y, nx, ny)
+    self.landmarks.invalidate()
+    # Las puertas solo desaparecen (al destruirse)
+    for cell in ((x, y), (nx, ny)):
+      if cell not in self.doors and self.grid.in_bounds(cell):
+        if self.zobrist is not None and self.door_dirs[cell] != kernels.NO_DOOR:
+          self.zobrist.door_removed(cell[0], cell[1], int(self.door_dirs[cell]))
+        self.door_dirs[cell] = kernels.NO_DOOR
+
+  # Método que avanza el fuego según las reglas del juego
+  def advance_fire(self):
+    x = self.random.randrange(self.grid.width)
+    y = self.random.randrange(self.grid.height)
+    current = self.fire[x][y]
+
+    # Si está vacío -> poner humo
+    if current == 0:
+      self.set_fire(x, y, 1)
+      if self.is_adjacent_to_fire(x, y):
+          self.place_fire(x, y)
+
+    # Si hay humo -> convertir en fuego
+    elif current == 1:
+        self.place_fire(x, y)
+
+    # Si hay fuego -> explosión
+    elif current == 2:
+        self.explosion(x, y)
+
+    # Aplicar flashover después de cada avance
+    self.flashover()
+
+  # Método que verifica si una celda es adyacente a fuego
+  def is_adjacent_to_fire(self, x, y):
+    if self.kernels is not None:
+      return self.kernels.adjacent_to_fire(self.fire, self.walls, x, y)
+    directions = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+    for dx, dy in directions:
+        nx, ny = x + dx, y + dy
+        if self.can_propagate(x, y, nx, ny):
+            if self.fire[nx][ny] == 2:
+                return True
+    return False
+
+  # Método que verifica si se puede propagar fuego entre dos celdas
+  def can_propagate(self, x, y, nx, ny):
+    if not (0 <= nx < self.grid.width and 0 <= ny < self.grid.height):
+      return False
+
+    dx, dy = nx - x, ny - y
+
+    # Arriba
+    if dx == 0 and dy == 1:
+      if self.walls[y][x][0] == 1:
+        return False
+
+    # Abajo
+    if dx == 0 and dy == -1:
+      if self.walls[y][x][2] == 1:
+        return False
+
+    # Derecha
+    if dx == 1 and dy == 0:
+      if self.walls[y][x][1] == 1:
+        return False
+
+    # Izquierda
+    if dx == -1 and dy == 0:
+      if self.walls[y][x][3] == 1:
+        return False
+
+    return True
+
+  # Método que maneja una explosión: propaga fuego y daña paredes
+  def explosion(self, x, y):
+    directions = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+    for dx, dy in directions:
+      nx, ny = x + dx, y + dy
+      result = self.damage_wall(x, y, dx, dy)
+      if result == "continue" and self.can_propagate(x, y, nx, ny):
+        self.shockwave(nx, ny, dx, dy)
+
+  # Método que propaga la onda expansiva en línea recta. El llamador ya
+  # verificó que se puede entrar a (x, y). Entre paredes y puertas la onda
+  # solo revisa el fuego de las celdas del rayo precalculado; al final del
+  # rayo damage_wall decide si se detiene o cruza (puerta abierta).
+  def shockwave(self, x, y, dx, dy):
+    run = self.rays.run[DIRECTION_INDEX[(dx, dy)]]
+    while 0 <= x < self.grid.width and 0 <= y < self.grid.height:
+      # Si encuentra vacío o humo, lo convierte en fuego y se detiene
+      n = int(run[x, y])
+      for k in range(n + 1):
+        cx, cy = x + k * dx, y + k * dy
+        if self.fire[cx][cy] != 2:
+          self.place_fire(cx, cy)
+          return
+
+      # Todo el rayo tiene fuego: la onda llega a la pared, puerta o borde
+      x, y = x + n * dx, y + n * dy
+      if self.damage_wall(x, y, dx, dy) == "stop":
+        return
+      x += dx
+      y += dy
+
+  # Método que aplica el flashover: humo adyacente a fuego -> fuego.
+  # Equivale a recorrer el tablero por filas (y, luego x) convirtiendo cada
+  # humo adyacente a fuego, pero solo visita la frontera: un humo que se
+  # vuelve adyacente durante el recorrido se convierte en esta pasada si viene
+  # después en ese orden, y si no queda en la frontera para el siguiente paso.
+  def flashover(self):
+    frontier = self.fire_front.frontier
+    if not frontier:
+      return
+    queue = [(y, x) for (x, y) in frontier]
+    heapq.heapify(queue)
+    queued = set(queue)
+    while queue:
+      y, x = heapq.heappop(queue)
+      if self.fire[x][y] != 1 or not self.is_adjacent_to_fire(x, y):
+        continue
+      self.place_fire(x, y)
+      for dx, dy in DIRECTIONS:
+        nx, ny = x + dx, y + dy
+        key = (ny, nx)
+        if key > (y, x) and key not in queued and (nx, ny) in self.fire_front.smoke:
+          heapq.heappush(queue, key)
+          queued.add(key)
+
+  # Método que coloca fuego en la posición (x, y)
+  def place_fire(self, x, y):
+    if not (0 <= x < self.grid.width and 0 <= y < self.grid.height):
+      return
+
+    self.set_fire(x, y, 2)
+
+    if (x, y) in self.poi_unknown:
+      self.poi_unknown.remove((x, y))
+      self.unassign_poi((x, y))
+
+      if self.poi[x][y] == 1:
+        self.lost_victims += 1
+      elif self.poi[x][y] == 2:
+        self.false_alarms_count -= 1
+
+      self.set_poi(x, y, 0)
+
+    if self.grid.counts[x, y]:
+      for agent in self.grid.agents_at((x, y)):
+        agent.knock_out()
+
+  # Método que daña paredes y puertas entre dos celdas
+  def damage_wall(self, x, y, dx, dy):
+    wall, opp_wall = WALL_SIDES[(dx, dy)]
+    nx, ny = x + dx, y + dy
+
+    # Si es una puerta: romper inmediatamente
+    if (x, y) in self.doors and self.doors[(x, y)] == (nx, ny):
+        # Si estaba abierta, se destruye y la onda PUEDE seguir
+        if self.walls[y][x][wall] == 0:
+            self.set_wall(x, y, wall, 0)
+            self.set_wall(nx, ny, opp_wall, 0)
+            del self.doors[(x, y)]
+            del self.doors[(nx, ny)]
+            self.walls_changed(x, y, nx, ny)
+            return "continue"
+
+        # Si estaba cerrada, se destruye y se detiene
+        if self.walls[y][x][wall] == 1:
+            self.set_wall(x, y, wall, 0)
+            self.set_wall(nx, ny, opp_wall, 0)
+            del self.doors[(x, y)]
+            del self.doors[(nx, ny)]
+            self.walls_changed(x, y, nx, ny)
+            return "stop"
+
+    # Si es una pared: acumula daño (2 golpes -> se destruye)
+    if self.walls[y][x][wall] == 1:
+      damage = self.add_wall_damage(x, y, wall)
+      self.damage += 1
+      if damage == 2:
+        self.set_wall(x, y, wall, 0)
+
+      # También daña la pared opuesta en la celda vecina
+      if 0 <= nx < self.grid.width and 0 <= ny < self.grid.height:
+        if self.walls[ny][nx][opp_wall] == 1:
+          if self.add_wall_damage(nx, ny, opp_wall) >= 2:
+            self.set_wall(nx, ny, opp_wall, 0)
+      self.walls_changed(x, y, nx, ny)
+      return "stop"
+
+    return "continue"
+
+  # Método que asigna un POI en pos (x,y) al agente uid
+  def assign_poi(self, pos, uid):
+    self.assigned_pois[pos] = uid
+
+  # Método que quita cualquier asignación existente de POI para pos
+  def unassign_poi(self, pos):
+    if pos in self.assigned_pois:
+      del self.assigned_pois[pos]
+
+  # Método que devuelve el uid del agente al que está asignado un POI
+  def get_assigned_agent_uid(self, pos):
+    return self.assigned_pois.get(pos, None)
+
+  # Método que se encarga de agregar POIs al tablero cuando es necesario
+  def replenish_poi(self):
+    # Si hay menos de 3 POIs
+    while (len(self.poi_unknown) + self.victims_on_board) < 3:
+      if self.victims_count <= 0 and self.false_alarms_count <= 0:
+        return
+
+      x = self.random.randrange(self.grid.width)
+      y = self.random.randrange(self.grid.height)
+
+      # Repetir si hay ya un POI en la posición
+      if (x, y) in self.poi_unknown:
+        continue
+
+      # Quitar humo/fuego previo a colocar el POI
+      if self.fire[x][y] in (1, 2):
+        self.set_fire(x, y, 0)
+
+      self.place_poi(x, y)
+
+  # Método que coloca un POI en el tablero
+  def place_poi(self, x, y):
+    poi_type = self.poi_type()
+    if poi_type is None:
+      return
+
+    self.set_poi(x, y, poi_type)
+    self.poi_unknown.append((x, y))
+
+  # Método que devuelve 1 (víctima) o 2 (falsa alarma) según lo que queda en la 'bolsa'.
+  def poi_type(self):
+    v = self.victims_count
+    f = self.false_alarms_count
+
+    if v <= 0 and f <= 0:
+      return None
+
+    if v <= 0:
+      return 2
+
+    if f <= 0:
+      return 1
+
+    total = v + f
+    if self.random.random() < (v / total):
+      self.victims_count -= 1
+      return 1
+    else:
+      self.false_alarms_count -= 1
+      return 2
+
+  # Método que define las condiciones bajo las que finaliza el juego
+  def end_game(self):
+    if self.rescued_count >= 7:
+      logger.debug("Victoria. Rescued Victims: %s", self.rescued_count)
+      return True
+
+    if self.damage >= 24:
+      logger.debug("Edificio colapsado. Damage: %s", self.damage)
+      return True
+
+    if self.lost_victims >= 4:
+      logger.debug("Derrota. Lost Victims: %s", self.lost_victims)
+      return True
+
+    return False
+
+  # Método que ejecuta un paso del modelo
+  def step(self):
+    logger.debug("--- Paso %s ---", self.steps)
+
+    self.datacollector.collect(self)
+    self.play_turn()
+
+  # Método que juega el turno del agente actual, avanza el fuego y repone
+  # POIs (el paso sin recolectar datos). 'take_turn' reemplaza al turno
+  # normal del agente (agent.step) en este paso
+  def play_turn(self, take_turn=None):
+    agent = self.grid.agents[self.current_index]
+    budget = self.step_budget
+    if budget is not None:
+      t0 = time.perf_counter()
+      self.deadline = t0 + budget
+    if take_turn is None:
+      agent.step()
+    else:
+      take_turn(agent)
+    if budget is not None:
+      self.deadline = None
+      self._planned(time.perf_counter() - t0)
+    self.current_index = (self.current_index + 1) % len(self.grid.agents)
+
+
+    self.advance_fire()
+    self.replenish_poi()
+
+  # Registra el tiempo de planificación de un turno con presupuesto
+  def _planned(self, elapsed):
+    self.planning_time = elapsed
+    overrun = elapsed > self.step_budget
+    self.budget_overruns += overrun
+    if self.metrics is not None:
+      self.metrics.observe("budget.planning", elapsed * 1e6, "us")
+      if overrun:
+        self.metrics.count("budget.overruns")
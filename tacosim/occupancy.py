@@ -0,0 +1,128 @@
+# Índice de ocupación del tablero y estado de los agentes en arreglos.
+#
+# Reemplaza a MultiGrid y BaseScheduler: el modelo solo necesitaba colocar y
+# mover agentes, preguntar quién está en una celda y guardar la lista de
+# agentes en orden de turno. Además guarda el estado de cada agente como
+# columnas contiguas (una fila por agente, en orden de turno):
+#   counts    (W, H) int32   número de agentes por celda
+#   pos       (N, 2) int32   posición
+#   AP        (N,)   int32   puntos de acción
+#   carrying  (N,)   bool    si carga una víctima
+#   target    (N, 2) int32   objetivo actual (-1, -1 = ninguno)
+# Los arreglos pueden tener filas de sobra; solo las primeras len(self) son
+# válidas (positions regresa esa vista). Los TacoRescueAgent son vistas
+# delgadas sobre una fila, así la serialización y los barridos pueden operar
+# sobre los arreglos completos.
+import numpy as np
+
+NO_TARGET = -1
+
+
+class Occupancy:
+  def __init__(self, width, height, capacity=8):
+    self.width = width
+    self.height = height
+    self.counts = np.zeros((width, height), dtype=np.int32)
+    self.agents = []
+    self._by_uid = {}
+    # Hash del estado que se entera de los cambios de los agentes (ver
+    # tacosim.zobrist); None = ninguno
+    self.zobrist = None
+    self._allocate(max(capacity, 1))
+
+  def _allocate(self, capacity):
+    n = len(self.agents)
+    columns = {
+      "pos": np.zeros((capacity, 2), dtype=np.int32),
+      "AP": np.zeros(capacity, dtype=np.int32),
+      "carrying": np.zeros(capacity, dtype=bool),
+      "target": np.full((capacity, 2), NO_TARGET, dtype=np.int32),
+    }
+    for name, column in columns.items():
+      if n:
+        column[:n] = getattr(self, name)[:n]
+      setattr(self, name, column)
+
+  def __len__(self):
+    return len(self.agents)
+
+  # Posiciones válidas (vista, sin copiar)
+  @property
+  def positions(self):
+    return self.pos[:len(self.agents)]
+
+  def in_bounds(self, pos):
+    return 0 <= pos[0] < self.width and 0 <= pos[1] < self.height
+
+  # Método que agrega un agente al final del orden de turnos en 'pos' y le
+  # asigna su fila
+  def place_agent(self, agent, pos):
+    if not self.in_bounds(pos):
+      raise ValueError(f"Posición fuera del tablero: {pos}")
+    n = len(self.agents)
+    if n == len(self.pos):
+      self._allocate(2 * n)
+    agent.slot = n
+    self.agents.append(agent)
+    uid = getattr(agent, "uid", None)
+    if uid is not None:
+      self._by_uid[uid] = agent
+    self.pos[n] = pos
+    self.counts[pos] += 1
+
+  def move_agent(self, agent, pos):
+    if not self.in_bounds(pos):
+      raise ValueError(f"Posición fuera del tablero: {pos}")
+    i = agent.slot
+    x, y = self.pos[i]
+    if self.zobrist is not None:
+      self.zobrist.agent_changed(i, "x", x, pos[0])
+      self.zobrist.agent_changed(i, "y", y, pos[1])
+    self.counts[x, y] -= 1
+    self.counts[pos] += 1
+    self.pos[i] = pos
+
+  def set_AP(self, i, value):
+    if self.zobrist is not None:
+      self.zobrist.agent_changed(i, "AP", self.AP[i], value)
+    self.AP[i] = value
+
+  def set_carrying(self, i, value):
+    if self.zobrist is not None:
+      self.zobrist.agent_changed(i, "carrying_victim", self.carrying[i], value)
+    self.carrying[i] = value
+
+  def is_empty(self, pos):
+    return self.counts[pos] == 0
+
+  # Agentes en una celda, en orden de turno
+  def agents_at(self, pos):
+    if self.counts[pos] == 0:
+      return []
+    positions = self.positions
+    hits = np.flatnonzero((positions[:, 0] == pos[0]) & (positions[:, 1] == pos[1]))
+    return [self.agents[i] for i in hits]
+
+  # Compatibilidad con la API de MultiGrid
+  def get_cell_list_contents(self, pos):
+    return self.agents_at(pos)
+
+  def get_agent_by_uid(self, uid):
+    return self._by_uid.get(uid)
+
+  # Filas (x, y, AP, carrying) de todos los agentes, para serializar
+  def agent_rows(self):
+    n = len(self.agents)
+    return np.column_stack([self.pos[:n], self.AP[:n], self.carrying[:n]])
+
+  # Índice con el estado de agentes ya capturado (p. ej. al reproducir una
+  # partida); 'agents' son los objetos que se listan en /state
+  @classmethod
+  def from_rows(cls, width, height, agents, rows):
+    grid = cls(width, height, capacity=len(agents))
+    rows = np.asarray(rows)
+    for agent, (x, y, ap, carrying) in zip(agents, rows):
+      grid.place_agent(agent, (int(x), int(y)))
+      grid.AP[agent.slot] = ap
+      grid.carrying[agent.slot] = bool(carrying)
+    return grid
@@ -0,0 +1,32 @@
+# Estructuras de búsqueda compartidas por los agentes del simulador.
+import heapq
+
+class PriorityQueue:
+    def __init__(self):
+        self.__data = []
+
+    # Función para verificar si la fila de prioridades está vacía
+    def empty(self):
+        return not self.__data
+
+    # Función para limpiar la fila de prioridades
+    def clear(self):
+        self.__data.clear()
+
+    # Función para insertar un elemento en la fila de prioridades
+    def push(self, priority, value):
+        heapq.heappush(self.__data, (priority, value))
+
+    # Función para extraer el elemento con mayor prioridad (menor número)
+    def pop(self):
+        if self.__data: # not empty
+            heapq.heappop(self.__data)
+        else:
+            raise Exception("No such element")
+
+    # Función para obtener el primer elemento sin sacarlo
+    def top(self):
+        if self.__data: # not empty
+            return self.__data[0]
+        else:
+            raise Exception("No such element")
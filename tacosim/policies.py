@@ -0,0 +1,186 @@
+# Políticas de decisión de los agentes.
+# Una política es cualquier objeto con take_turn(agent); se llama una vez por
+# turno, después de recargar AP, y usa las acciones de TacoRescueAgent. Las
+# reglas del juego (fuego, POIs, costos) son las mismas para todas.
+import logging
+
+from .mcts import MCTSPolicy
+
+logger = logging.getLogger(__name__)
+
+DIRECTIONS = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+
+
+# Política aleatoria: intenta 8 direcciones al azar; abrir una puerta o
+# golpear una pared consume el intento.
+class RandomPolicy:
+  name = "random"
+
+  def take_turn(self, agent):
+    model = agent.model
+
+    if model.poi[agent.pos] == 1:
+      if not agent.carrying_victim:
+        agent.pick_up_victim(agent.pos)
+
+    idxs = model.rng.choice(len(DIRECTIONS), size=8, replace=True)
+    options = [DIRECTIONS[i] for i in idxs]
+
+    for dx, dy in options:
+      if agent.AP == 0:
+        break
+
+      x, y = agent.pos
+      pos = (x + dx, y + dy)
+      if not (0 <= pos[0] < model.grid.width and 0 <= pos[1] < model.grid.height):
+        continue
+
+      state = agent.space_state(pos)
+      if not agent.try_move(pos, persist=False):
+        continue
+
+      if state == 2:
+        if agent.can_spend(2):
+          agent.extinguish_fire(pos)
+        else:
+          agent.fire_to_smoke(pos)
+      elif state == 1:
+        if agent.can_spend(1):
+          agent.remove_smoke(pos)
+      elif state == 0:
+        if model.poi[pos] == 1:
+          agent.pick_up_victim(pos)
+        if model.poi[pos] == 2:
+          agent.remove_false_alarm(pos)
+
+      if agent.is_entry():
+        if agent.carrying_victim == True:
+          agent.drop_off_victim(pos)
+
+
+# Política estratégica: va al POI más cercano (o al fuego más cercano si no
+# hay POIs) siguiendo la ruta de A*, y lleva las víctimas a la entrada.
+class StrategicPolicy:
+  name = "strategic"
+
+  def take_turn(self, agent):
+    model = agent.model
+
+    # Si está sobre una POI y no carga víctima, intentarlo
+    if model.poi[agent.pos] == 1 and not agent.carrying_victim:
+      agent.pick_up_victim(agent.pos)
+
+    self.follow(agent, self.choose_target(agent))
+
+  # Método que decide el objetivo del turno según el estado del agente
+  def choose_target(self, agent):
+    model = agent.model
+
+    # Si está cargando una víctima -> dirigirse a la entrada más cercana
+    if agent.carrying_victim:
+      desired_target = agent.nearest_entry()
+
+    # Dirigirse hacia el POI asignado (o el más cercano), si no hay,
+    # dirigirse hacia el fuego más cercano (al revés sin weights.poi_first)
+    elif model.weights.poi_first:
+      desired_target = self._poi_target(agent)
+      if desired_target is None:
+        desired_target = agent.nearest_fire()
+    else:
+      desired_target = agent.nearest_fire()
+      if desired_target is None:
+        desired_target = self._poi_target(agent)
+    return desired_target
+
+  # POI asignado por el reparto del modelo o, sin reparto, el más cercano
+  def _poi_target(self, agent):
+    allocator = agent.model.allocator
+    if allocator is not None:
+      return allocator.target_for(agent)
+    return agent.nearest_poi()
+
+  # Método que juega el resto del turno rumbo a 'desired_target': avanza por
+  # la ruta de A* apagando fuego y humo, recoge y deja víctimas, y sin ruta
+  # combate el fuego de las celdas vecinas
+  def follow(self, agent, desired_target):
+    model = agent.model
+
+    # Actualizar el objetivo y calcular ruta desde la posición actual.
+    if desired_target is not None:
+      agent.target = desired_target
+      agent.path = agent.a_star(agent.pos, agent.target) or []
+
+    logger.debug("Agent uid=%s pos=%s AP=%s target=%s path_len=%s", agent.uid, agent.pos, agent.AP, agent.target, len(agent.path))
+
+    # Avanzar por la ruta mientras haya AP y queden pasos en la ruta.
+    while agent.AP > 0 and agent.path:
+      next_pos = agent.path[0]
+      moved = agent.try_move(next_pos)
+      if moved:
+        agent.path.pop(0)
+
+        state = agent.space_state(agent.pos)
+
+        # Si hay fuego, extinguir si es posible, si no convertir a humo
+        if state == 2:
+          if agent.can_spend(2):
+            agent.extinguish_fire(agent.pos)
+          else:
+            agent.fire_to_smoke(agent.pos)
+
+        # Si hay humo, extinguir si es posible
+        elif state == 1:
+          if agent.can_spend(1):
+            agent.remove_smoke(agent.pos)
+
+        # Si la celda tiene un POI con víctima, intentar recogerla
+        if model.poi[agent.pos] == 1 and not agent.carrying_victim:
+          agent.pick_up_victim(agent.pos)
+
+        # Si la celda tiene un POI con falsa alarma, revelarlo
+        agent.remove_false_alarm(agent.pos)
+
+        # Si llegó a una entrada y carga una víctima, dejarla
+        if agent.is_entry() and agent.carrying_victim:
+          agent.drop_off_victim(agent.pos)
+
+        continue
+
+      # Si el movimiento falló, intentar replantear ruta desde la posición actual
+      else:
+        agent.path = agent.a_star(agent.pos, agent.target) or []
+        break
+
+    # Si no hay ruta y no hay objetivo, o el objetivo es la posición actual
+    if not agent.path and desired_target is None or desired_target == agent.pos:
+      for dx, dy in DIRECTIONS:
+        if agent.AP == 0:
+          break
+        x, y = agent.pos
+        pos = (x + dx, y + dy)
+        if not (0 <= pos[0] < model.grid.width and 0 <= pos[1] < model.grid.height):
+          continue
+        state = agent.space_state(pos)
+        if state == 2 and agent.can_spend(2):
+          if agent.try_move(pos):
+            agent.extinguish_fire(pos)
+        elif state == 1 and agent.can_spend(1):
+          if agent.try_move(pos):
+            agent.remove_smoke(pos)
+
+
+POLICIES = {
+  RandomPolicy.name: RandomPolicy,
+  StrategicPolicy.name: StrategicPolicy,
+  MCTSPolicy.name: MCTSPolicy,
+}
+
+
+# Función que regresa una instancia de política a partir de su nombre
+# (o la misma instancia si ya es una política)
+def make_policy(policy):
+  if isinstance(policy, str):
+    if policy not in POLICIES:
+      raise ValueError(f"Política desconocida: {policy!r} (opciones: {sorted(POLICIES)})")
+    return POLICIES[policy]()
+  return policy
@@ -0,0 +1,85 @@
+# Tablas de rayos para las ondas expansivas.
+#
+# Para cada celda y dirección, run[d][x, y] es cuántos pasos seguidos se
+# pueden dar desde (x, y) en la dirección d cruzando solo aristas "lisas":
+# sin pared del lado de la celda de origen, sin puerta y dentro del tablero.
+# Es exactamente donde la onda expansiva avanza sin tocar paredes (damage_wall
+# regresaría "continue" sin efectos), así que shockwave solo revisa el fuego
+# de las celdas del rayo y llama a damage_wall al final. Cuando cambia una
+# pared o puerta (TacoRescueModel.walls_changed) solo se recalculan las
+# celdas cuyo rayo llega a esa arista.
+import numpy as np
+
+from .firefront import DIRECTIONS
+from .maps import WALL_INDEX
+
+DIRECTION_INDEX = {d: i for i, d in enumerate(DIRECTIONS)}
+
+# (dx, dy) -> (pared de la celda, pared opuesta en la vecina)
+WALL_SIDES = {d: (WALL_INDEX[d], WALL_INDEX[(-d[0], -d[1])]) for d in DIRECTIONS}
+
+
+class RayTable:
+  def __init__(self, model):
+    self.model = model
+    width, height = model.grid.width, model.grid.height
+    self.run = np.zeros((len(DIRECTIONS), width, height), dtype=np.int32)
+    self.rebuild()
+
+  def rebuild(self):
+    for y in range(self.model.grid.height):
+      self._row(y)
+    for x in range(self.model.grid.width):
+      self._column(x)
+
+  # Método que actualiza los rayos que llegan a la arista entre dos celdas:
+  # el de (x, y) hacia (nx, ny) y el de (nx, ny) de regreso, y hacia atrás
+  # las celdas que llegaban a ellos por aristas lisas
+  def edge_changed(self, x, y, nx, ny):
+    d = DIRECTION_INDEX[(nx - x, ny - y)]
+    self._update(d, x, y)
+    if 0 <= nx < self.model.grid.width and 0 <= ny < self.model.grid.height:
+      self._update(DIRECTION_INDEX[(x - nx, y - ny)], nx, ny)
+
+  def _update(self, d, x, y):
+    dx, dy = DIRECTIONS[d]
+    run = self.run[d]
+    while True:
+      value = run[x + dx, y + dy] + 1 if self._smooth(x, y, dx, dy) else 0
+      if run[x, y] == value:
+        return  # sin cambio: las celdas de atrás tampoco cambian
+      run[x, y] = value
+      x, y = x - dx, y - dy
+      if not (0 <= x < self.model.grid.width and 0 <= y < self.model.grid.height):
+        return
+      if not self._smooth(x, y, dx, dy):
+        return
+
+  # Si el paso de (x, y) a (x + dx, y + dy) es liso
+  def _smooth(self, x, y, dx, dy):
+    nx, ny = x + dx, y + dy
+    if not (0 <= nx < self.model.grid.width and 0 <= ny < self.model.grid.height):
+      return False
+    if self.model.doors.get((x, y)) == (nx, ny):
+      return False
+    return self.model.walls[y][x][WALL_SIDES[(dx, dy)][0]] == 0
+
+  # Recorre la línea desde el extremo hacia el que apunta d, así cada celda
+  # suma uno al valor de la siguiente
+  def _line(self, d, cells):
+    dx, dy = DIRECTIONS[d]
+    run = self.run[d]
+    nxt = 0
+    for (x, y) in cells:
+      nxt = nxt + 1 if self._smooth(x, y, dx, dy) else 0
+      run[x, y] = nxt
+
+  def _row(self, y):
+    width = self.model.grid.width
+    self._line(DIRECTION_INDEX[(1, 0)], [(x, y) for x in range(width - 1, -1, -1)])
+    self._line(DIRECTION_INDEX[(-1, 0)], [(x, y) for x in range(width)])
+
+  def _column(self, x):
+    height = self.model.grid.height
+    self._line(DIRECTION_INDEX[(0, 1)], [(x, y) for y in range(height - 1, -1, -1)])
+    self._line(DIRECTION_INDEX[(0, -1)], [(x, y) for y in range(height)])
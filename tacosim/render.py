@@ -0,0 +1,106 @@
+# Renderizado del tablero. matplotlib solo se importa al animar, de modo que
+# importar el simulador no carga ninguna dependencia de visualización.
+import numpy as np
+
+def get_grid(model):
+  # Con kernels compilados (ver tacosim.kernels) se pinta la misma imagen
+  compiled = getattr(model, "kernels", None)
+  if compiled is not None:
+    return compiled.render(model.fire, model.poi, model.walls, model.walls_damage, model.grid.counts)
+
+  width, height = model.grid.width, model.grid.height
+  # Base: todo blanco
+  grid = np.ones((height*10, width*10, 3))
+
+  # Colores
+  COLOR_FIRE   = [1, 0, 0]        # Rojo
+  COLOR_SMOKE  = [0.5, 0.5, 0.5]  # Gris
+  COLOR_VICTIM = [0, 0, 1]        # Azul
+  COLOR_FALSE  = [1, 1, 0]        # Amarillo
+  COLOR_WALL   = [0, 0, 0]        # Negro
+  COLOR_WALL_D = [1, 0.5, 0]      # Naranja
+  COLOR_AGENT  = [0, 1, 0]        # Verde
+
+  cell_size = 10  # cada celda se escala a 10x10 píxeles
+
+  for x in range(width):
+    for y in range(height):
+      # Región de píxeles de esta celda
+      x0, x1 = x*cell_size, (x+1)*cell_size
+      y0, y1 = y*cell_size, (y+1)*cell_size
+
+      # Color base
+      color = [1, 1, 1]
+
+      # Fuego / Humo
+      if model.fire[x][y] == 2:
+        color = COLOR_FIRE
+      elif model.fire[x][y] == 1:
+        color = COLOR_SMOKE
+
+      # POIs
+      if model.poi[x][y] == 1:      # víctima
+        color = COLOR_VICTIM
+      elif model.poi[x][y] == 2:    # falsa alarma
+        color = COLOR_FALSE
+
+      # Pinta la celda
+      grid[y0:y1, x0:x1] = color
+
+      # Paredes de la celda
+      walls = model.walls[y][x]
+      damage = model.walls_damage[x][y]
+
+      # Arriba
+      if walls[0] == 1:
+        wall_color = COLOR_WALL if damage[0] == 0 else COLOR_WALL_D
+        grid[y1-1:y1, x0:x1] = wall_color
+      # Derecha
+      if walls[1] == 1:
+        wall_color = COLOR_WALL if damage[1] == 0 else COLOR_WALL_D
+        grid[y0:y1, x1-1:x1] = wall_color
+      # Abajo
+      if walls[2] == 1:
+        wall_color = COLOR_WALL if damage[2] == 0 else COLOR_WALL_D
+        grid[y0:y0+1, x0:x1] = wall_color
+      # Izquierda
+      if walls[3] == 1:
+        wall_color = COLOR_WALL if damage[3] == 0 else COLOR_WALL_D
+        grid[y0:y1, x0:x0+1] = wall_color
+
+      # Dibujar agentes (si hay)
+      n_agents = model.grid.counts[x, y]
+
+      if n_agents > 0:
+          sub_size = cell_size // 2  # subdivisión 2x2
+          for i in range(min(n_agents, 4)):  # max 4 visibles
+              row = i // 2
+              col = i % 2
+              x0s = x0 + col * sub_size
+              x1s = x0s + sub_size
+              y0s = y0 + row * sub_size
+              y1s = y0s + sub_size
+              grid[y0s:y1s, x0s:x1s] = COLOR_AGENT
+
+  return grid
+
+# Función que crea una animación a partir de los frames del DataCollector
+def animate_grids(all_grids, interval=200):
+  import matplotlib
+  import matplotlib.pyplot as plt
+  import matplotlib.animation as animation
+  plt.rcParams["animation.html"] = "jshtml"
+  matplotlib.rcParams['animation.embed_limit'] = 2**128
+
+  fig, axs = plt.subplots(figsize=(6,6))
+  axs.set_xticks([])
+  axs.set_yticks([])
+
+  # Primer frame
+  patch = axs.imshow(all_grids.iloc[0, 0], origin="lower")
+
+  def animate(i):
+    patch.set_data(all_grids.iloc[i, 0])
+    return [patch]
+
+  return animation.FuncAnimation(fig, animate, frames=len(all_grids), interval=interval, blit=True)
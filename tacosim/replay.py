@@ -0,0 +1,46 @@
+# Reproducción de partidas guardadas con tacosim.gamelog.
+# frame_at(reader, step) reconstruye el estado al final de un paso a partir
+# del keyframe más cercano y lo regresa con los mismos atributos que lee
+# app.serialize_state de un TacoRescueModel, para servirlo igual que /state.
+from types import SimpleNamespace
+
+import numpy as np
+
+from .events import STEP, EventLog
+from .maps import WALL_DELTAS
+from .occupancy import Occupancy
+
+
+def frame_at(reader, step):
+  step, state = reader.state_at(step)
+  counters = state["counters"]
+
+  doors = {}
+  for y, x, w in zip(*np.nonzero(state["doors"])):
+    dx, dy = WALL_DELTAS[w]
+    doors[(int(x), int(y))] = (int(x + dx), int(y + dy))
+
+  layout = reader.layout
+  agents = [SimpleNamespace(id=i) for i in range(layout.players)]
+  grid = Occupancy.from_rows(layout.width, layout.height, agents, state["agents"])
+
+  # Los eventos están ordenados por paso: los que ocurrieron hasta 'step'
+  rows = reader.events
+  end = int(np.searchsorted(rows[:, STEP], step, side="right"))
+
+  poi = state["poi"]
+  return SimpleNamespace(
+    steps=step,
+    grid=grid,
+    events=EventLog.view(rows[:end]),
+    fire=state["fire"].astype(float),
+    walls=state["walls"].astype(int),
+    walls_damage=state["walls_damage"].astype(float),
+    doors=doors,
+    poi=poi.astype(float),
+    # np.nonzero ya da el orden (x, y) en que serialize_state los regresa
+    poi_unknown=[(int(x), int(y)) for x, y in zip(*np.nonzero(poi))],
+    damage=counters["damage"],
+    rescued_count=counters["rescued_count"],
+    lost_victims=counters["lost_victims"],
+  )
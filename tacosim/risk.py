@@ -0,0 +1,204 @@
+# Mapa de riesgo de fuego para planear rutas (TacoRescueModel(fire_risk=...)).
+#
+# Para cada celda sin fuego estima la probabilidad de que se encienda en los
+# próximos 'steps' pasos del modelo (por omisión una ronda: hasta el
+# siguiente turno del mismo agente) con 'rollouts' simulaciones de
+# advance_fire a la vez, como arreglos (rollouts, W, H):
+#   - una celda al azar por simulación: vacío -> humo (fuego si es adyacente
+#     a fuego), humo -> fuego, fuego -> explosión
+#   - la explosión daña paredes y destruye puertas como damage_wall (cada
+#     simulación lleva sus propias aristas) y lanza una onda en cada
+#     dirección que avanza por celdas con fuego y enciende la primera que no
+#     lo tiene
+#   - flashover: el humo adyacente a fuego se enciende hasta el punto fijo
+# El flashover hasta el punto fijo es un poco más pesimista que el recorrido
+# por filas del modelo y los agentes no apagan nada. El riesgo
+# por 'weight' se suma como costo en AP al entrar a la celda
+# (TacoRescueAgent.neighbors_for_path y los kernels); las celdas que ya tienen
+# fuego no suman nada, su costo ya lo refleja.
+#
+# El mapa se calcula una vez por paso del modelo (model.steps: un turno de
+# agente), con el tablero de la primera consulta del turno, y las
+# simulaciones se siembran con el hash de Zobrist de ese estado, así el mismo
+# estado da siempre el mismo mapa y no se consume el generador de la partida.
+# Lo que cambia el agente durante su turno (quitar humo, apagar fuego, abrir
+# puertas, romper paredes) no se refleja hasta el siguiente turno; el fuego
+# solo se propaga entre turnos, así que lo que se pierde es poco y evita
+# repetir todas las simulaciones con cada acción.
+import numpy as np
+
+from .kernels import DX, DY, WALL
+from .landmarks import _slices
+
+# Costos cero para las búsquedas compiladas sin mapa de riesgo, por tamaño
+_ZEROS = {}
+
+
+# Función que regresa un arreglo (W, H) de ceros de solo lectura
+def no_risk(width, height):
+  zeros = _ZEROS.get((width, height))
+  if zeros is None:
+    zeros = _ZEROS[(width, height)] = np.zeros((width, height))
+    zeros.flags.writeable = False
+  return zeros
+
+
+class FireRisk:
+  def __init__(self, model, weight=4.0, rollouts=64, steps=6):
+    if weight <= 0:
+      raise ValueError(f"weight debe ser mayor que 0: {weight!r}")
+    if rollouts < 1 or steps < 1:
+      raise ValueError(f"rollouts y steps deben ser al menos 1: {rollouts!r}, {steps!r}")
+    self.model = model
+    self.weight = weight
+    self.rollouts = rollouts
+    self.steps = steps
+    self.computed_at = None
+    self.probability = None
+    self._costs = None
+
+  # Método que regresa el costo extra (W, H) de entrar a cada celda,
+  # recalculado solo en la primera consulta de cada paso
+  def costs(self):
+    model = self.model
+    if self.computed_at != model.steps:
+      if model.metrics is not None:
+        with model.metrics.phase("phase.fire_risk"):
+          self._update()
+      else:
+        self._update()
+    return self._costs
+
+  def _update(self):
+    model = self.model
+    self.probability = self.simulate(np.random.default_rng(model.state_hash()))
+    self._costs = self.weight * self.probability
+    self._costs.flags.writeable = False
+    self.computed_at = model.steps
+
+  # Método que corre las simulaciones desde el tablero actual y regresa la
+  # probabilidad (W, H) de que cada celda sin fuego se encienda
+  def simulate(self, rng):
+    model = self.model
+    width, height = model.grid.width, model.grid.height
+    rollouts = self.rollouts
+    runs = np.arange(rollouts)
+
+    # Aristas por simulación, arreglos (rollouts, 4, W, H) indexados por la
+    # celda de origen y la dirección d: lado cerrado (pared o puerta
+    # cerrada), puerta y daño acumulado
+    inside = np.zeros((4, width, height), dtype=bool)
+    for d in range(4):
+      src, _ = _slices(DX[d], DY[d])
+      inside[d][src] = True
+    walls = model.walls.transpose(1, 0, 2)
+    sides = list(WALL)
+    edges = _Edges(
+      np.repeat((walls[:, :, sides] == 1).transpose(2, 0, 1)[None], rollouts, axis=0),
+      np.repeat((model.door_dirs[None] == np.arange(4)[:, None, None])[None], rollouts, axis=0),
+      np.repeat(model.walls_damage[:, :, sides].transpose(2, 0, 1)[None], rollouts, axis=0).astype(np.int8),
+      inside)
+
+    fire = np.repeat(model.fire[None].astype(np.int8), rollouts, axis=0)
+    burning_now = model.fire == 2
+    ignited = np.zeros(fire.shape, dtype=bool)
+
+    for _ in range(self.steps):
+      xs = rng.integers(width, size=rollouts)
+      ys = rng.integers(height, size=rollouts)
+      current = fire[runs, xs, ys]
+
+      # Vacío -> humo, y fuego si ya es adyacente a fuego; humo -> fuego
+      empty = current == 0
+      fire[runs[empty], xs[empty], ys[empty]] = 1
+      adjacent = np.zeros(rollouts, dtype=bool)
+      for d in range(4):
+        through = edges.passable(runs, d, xs, ys)
+        nx = np.where(through, xs + DX[d], xs)
+        ny = np.where(through, ys + DY[d], ys)
+        adjacent |= through & (fire[runs, nx, ny] == 2)
+      ignite = (empty & adjacent) | (current == 1)
+      fire[runs[ignite], xs[ignite], ys[ignite]] = 2
+
+      # Explosión: daña la pared o puerta de cada lado y lanza una onda que
+      # avanza por celdas con fuego hasta encender la primera que no lo tiene
+      exploding = runs[current == 2]
+      for d in range(4):
+        x, y = xs[exploding], ys[exploding]
+        active = edges.damage(exploding, d, x, y)
+        active &= edges.passable(exploding, d, x, y)
+        rs, x, y = exploding[active], x[active] + DX[d], y[active] + DY[d]
+        while len(rs):
+          lit = fire[rs, x, y] == 2
+          fire[rs[~lit], x[~lit], y[~lit]] = 2
+          rs, x, y = rs[lit], x[lit], y[lit]
+          on = edges.damage(rs, d, x, y) & inside[d][x, y]
+          rs, x, y = rs[on], x[on] + DX[d], y[on] + DY[d]
+
+      # Flashover hasta el punto fijo
+      passable = ~edges.closed & inside
+      while True:
+        on_fire = fire == 2
+        adjacent = np.zeros(fire.shape, dtype=bool)
+        for d in range(4):
+          src, dst = _slices(DX[d], DY[d])
+          adjacent[(slice(None),) + src] |= passable[:, d][(slice(None),) + src] & on_fire[(slice(None),) + dst]
+        spread = (fire == 1) & adjacent
+        if not spread.any():
+          break
+        fire[spread] = 2
+
+      ignited |= fire == 2
+
+    probability = ignited.mean(axis=0)
+    probability[burning_now] = 0.0
+    return probability
+
+
+# Dirección opuesta a cada d (arriba <-> abajo, derecha <-> izquierda)
+OPPOSITE = (1, 0, 3, 2)
+
+
+# Paredes y puertas de todas las simulaciones; mismas reglas que
+# TacoRescueModel.damage_wall
+class _Edges:
+  def __init__(self, closed, door, damage, inside):
+    self.closed = closed
+    self.door = door
+    self.hits = damage
+    self.inside = inside
+
+  # Si el fuego pasa de (x, y) en la dirección d, en las simulaciones 'rs'
+  def passable(self, rs, d, x, y):
+    return self.inside[d][x, y] & ~self.closed[rs, d, x, y]
+
+  # Golpe de explosión al lado d de (x, y): una puerta se destruye y una
+  # pared suma daño en los dos lados (con 2 se abre). Regresa si la onda
+  # sigue (no había pared ni puerta cerrada)
+  def damage(self, rs, d, x, y):
+    closed = self.closed[rs, d, x, y]
+    if not closed.any():
+      return ~closed
+    door = closed & self.door[rs, d, x, y]
+    inside = self.inside[d][x, y]
+    nx, ny = x + DX[d] * inside, y + DY[d] * inside
+    opp = OPPOSITE[d]
+
+    if door.any():
+      k = door
+      for side, cx, cy in ((d, x, y), (opp, nx, ny)):
+        self.closed[rs[k], side, cx[k], cy[k]] = False
+        self.door[rs[k], side, cx[k], cy[k]] = False
+
+    k = closed & ~door
+    if k.any():
+      self._hit(rs[k], d, x[k], y[k])
+      k &= inside
+      k[k] = self.closed[rs[k], opp, nx[k], ny[k]]
+      self._hit(rs[k], opp, nx[k], ny[k])
+    return ~closed
+
+  def _hit(self, rs, side, x, y):
+    self.hits[rs, side, x, y] += 1
+    broken = self.hits[rs, side, x, y] >= 2
+    self.closed[rs[broken], side, x[broken], y[broken]] = False
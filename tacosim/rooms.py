@@ -0,0 +1,306 @@
+# Planificador jerárquico por cuartos y portales para tableros grandes.
+#
+# Un cuarto es una componente de celdas unidas por aristas lisas (sin pared en
+# ninguno de los dos lados y sin puerta). Entre dos cuartos vecinos cada
+# puerta es un portal, y cada tramo continuo de pared entre ellos aporta un
+# portal en su celda central (las paredes se pueden romper, con el costo
+# extra model.weights.wall).
+#
+# Las distancias dentro de un cuarto se calculan con Dijkstra restringido a
+# sus celdas y se guardan por celda de origen, así una consulta solo busca
+# entre portales (A* sobre el grafo de cuartos) y luego arma la ruta celda por
+# celda con los árboles ya calculados. Los costos son los de
+# TacoRescueAgent.neighbors_for_path. Las reparaciones son incrementales:
+#   cell_changed  el fuego cambió en una celda: se descartan las tablas de
+#                 su cuarto
+#   edge_changed  se abrió, dañó o destruyó una pared o puerta: si la arista
+#                 quedó lisa se fusionan los dos cuartos y se recalculan sus
+#                 portales y los de sus vecinos; si no, solo se descartan las
+#                 tablas del cuarto cuando la arista es interna
+# Las paredes y puertas solo se abren, así que los cuartos solo se fusionan.
+#
+# Las rutas pasan por los portales elegidos y por eso pueden costar un poco
+# más que las de a_star; si el grafo de cuartos no encuentra ruta se usa la
+# búsqueda por celdas.
+import heapq
+
+import numpy as np
+
+from .firefront import DIRECTIONS
+from .maps import WALL_INDEX
+
+PLANNERS = ("grid", "rooms")
+
+
+class RoomGraph:
+  def __init__(self, model):
+    self.model = model
+    self.rebuild()
+
+  # Recalcula cuartos, portales y tablas desde cero
+  def rebuild(self):
+    width, height = self.model.grid.width, self.model.grid.height
+    self.room = np.full((width, height), -1, dtype=np.int32)
+    self.cells = {}
+    for x in range(width):
+      for y in range(height):
+        if self.room[x, y] < 0:
+          self._flood(x, y, len(self.cells))
+    self.portals = {}
+    self.exits = {}
+    self._tables = {r: {} for r in self.cells}
+    self._hops = {}
+    for r in self.cells:
+      self._set_portals(r)
+
+  def __len__(self):
+    return len(self.cells)
+
+  def _flood(self, x, y, r):
+    self.room[x, y] = r
+    cells = [(x, y)]
+    stack = [(x, y)]
+    while stack:
+      cx, cy = stack.pop()
+      for dx, dy in DIRECTIONS:
+        nx, ny = cx + dx, cy + dy
+        if self._smooth(cx, cy, nx, ny) and self.room[nx, ny] < 0:
+          self.room[nx, ny] = r
+          cells.append((nx, ny))
+          stack.append((nx, ny))
+    self.cells[r] = cells
+
+  # Si la arista entre dos celdas es lisa en ambos sentidos
+  def _smooth(self, x, y, nx, ny):
+    if not (0 <= nx < self.model.grid.width and 0 <= ny < self.model.grid.height):
+      return False
+    if self.model.doors.get((x, y)) == (nx, ny):
+      return False
+    walls = self.model.walls
+    return (walls[y][x][WALL_INDEX[(nx - x, ny - y)]] == 0
+            and walls[ny][nx][WALL_INDEX[(x - nx, y - ny)]] == 0)
+
+  # Guarda los portales del cuarto r y, por celda portal, las celdas vecinas
+  # a las que cruza
+  def _set_portals(self, r):
+    self.portals[r] = self._find_portals(r)
+    exits = {}
+    for (p, q) in self.portals[r]:
+      exits.setdefault(p, []).append(q)
+    self.exits[r] = exits
+    self._hops[r] = {}
+
+  # Portales (celda del cuarto, celda vecina) que salen del cuarto r: cada
+  # puerta y la celda central de cada tramo continuo de pared hacia un vecino
+  def _find_portals(self, r):
+    width, height = self.model.grid.width, self.model.grid.height
+    portals = []
+    segments = {}
+    for (x, y) in self.cells[r]:
+      for dx, dy in DIRECTIONS:
+        nx, ny = x + dx, y + dy
+        if not (0 <= nx < width and 0 <= ny < height) or self.room[nx, ny] == r:
+          continue
+        if self.model.doors.get((x, y)) == (nx, ny):
+          portals.append(((x, y), (nx, ny)))
+          continue
+        line, along = (x, y) if dx else (y, x)
+        segments.setdefault((int(self.room[nx, ny]), dx, dy, line), []).append(along)
+
+    for (_, dx, dy, line), alongs in segments.items():
+      alongs.sort()
+      start = 0
+      for i in range(1, len(alongs) + 1):
+        if i == len(alongs) or alongs[i] != alongs[i - 1] + 1:
+          mid = alongs[(start + i - 1) // 2]
+          a = (line, mid) if dx else (mid, line)
+          portals.append((a, (a[0] + dx, a[1] + dy)))
+          start = i
+    return portals
+
+  # Método que descarta las tablas del cuarto de (x, y) cuando cambia su fuego
+  def cell_changed(self, x, y):
+    self._clear(int(self.room[x, y]))
+
+  def _clear(self, r):
+    self._tables[r] = {}
+    self._hops[r] = {}
+
+  # Método que repara el grafo cuando cambia la arista entre dos celdas
+  def edge_changed(self, x, y, nx, ny):
+    if not (0 <= nx < self.model.grid.width and 0 <= ny < self.model.grid.height):
+      return
+    a, b = int(self.room[x, y]), int(self.room[nx, ny])
+    if a == b:
+      self._clear(a)
+    elif self._smooth(x, y, nx, ny):
+      self._merge(a, b)
+
+  # Fusiona los cuartos a y b (el chico se renombra al grande) y recalcula
+  # los portales del cuarto nuevo y de sus vecinos: sus tramos de pared
+  # pueden haberse unido, pero sus tablas internas siguen siendo válidas
+  def _merge(self, a, b):
+    if len(self.cells[a]) < len(self.cells[b]):
+      a, b = b, a
+    neighbors = {q for (_, q) in self.portals.pop(b)} | {q for (_, q) in self.portals[a]}
+    for (x, y) in self.cells[b]:
+      self.room[x, y] = a
+    self.cells[a].extend(self.cells.pop(b))
+    for cache in (self.exits, self._tables, self._hops):
+      del cache[b]
+    self._clear(a)
+    for r in {a} | {int(self.room[q]) for q in neighbors}:
+      self._set_portals(r)
+
+  # Costo de pasar de a a su vecina b (None si no se puede entrar)
+  def _step(self, a, b, carrying):
+    model = self.model
+    (x, y), (nx, ny) = a, b
+    state = model.fire[nx][ny]
+    if carrying:
+      if state == 2:
+        return None
+      cost = 2
+    elif state == 2:
+      cost = 2
+    else:
+      cost = 1
+    wall = model.walls[y][x][WALL_INDEX[(nx - x, ny - y)]]
+    if model.doors.get(a) == b:
+      if wall == 1:
+        cost += model.weights.door
+    elif wall == 1:
+      cost += model.weights.wall
+    return float(cost)
+
+  # Dijkstra restringido al cuarto r desde 'src' (reverse=True: distancias
+  # hacia 'src'); regresa (dist, siguiente celda hacia 'src')
+  def _table(self, r, src, carrying, reverse=False):
+    key = (src, bool(carrying), reverse)
+    tables = self._tables[r]
+    if key in tables:
+      return tables[key]
+
+    width, height = self.model.grid.width, self.model.grid.height
+    dist = {src: 0.0}
+    link = {src: None}
+    heap = [(0.0, src)]
+    while heap:
+      d, cell = heapq.heappop(heap)
+      if d > dist[cell]:
+        continue
+      x, y = cell
+      for dx, dy in DIRECTIONS:
+        n = (x + dx, y + dy)
+        if not (0 <= n[0] < width and 0 <= n[1] < height) or self.room[n] != r:
+          continue
+        step = self._step(n, cell, carrying) if reverse else self._step(cell, n, carrying)
+        if step is None:
+          continue
+        nd = d + step
+        if n not in dist or nd < dist[n]:
+          dist[n] = nd
+          link[n] = cell
+          heapq.heappush(heap, (nd, n))
+    tables[key] = (dist, link)
+    return tables[key]
+
+  # Celdas portal del cuarto r alcanzables desde 'src' y su distancia
+  def _portal_hops(self, r, src, carrying):
+    key = (src, bool(carrying))
+    hops = self._hops[r]
+    if key not in hops:
+      dist, _ = self._table(r, src, carrying)
+      hops[key] = [(p, dist[p]) for p in self.exits[r] if p != src and p in dist]
+    return hops[key]
+
+  # Método que busca la ruta de menor costo entre los portales; regresa
+  # (costo, ruta sin 'start', nodos expandidos) o (None, None, expandidos)
+  def plan(self, start, goal, carrying):
+    start = (int(start[0]), int(start[1]))
+    goal = (int(goal[0]), int(goal[1]))
+    rg = int(self.room[goal])
+    bwd, _ = self._table(rg, goal, carrying, reverse=True)
+
+    # Además de los portales, el inicio puede cruzar directo a los cuartos
+    # vecinos y la meta recibir cruces desde los suyos (consultas cortas
+    # entre cuartos vecinos)
+    extra = {}
+    for cell, outgoing in ((start, True), (goal, False)):
+      for dx, dy in DIRECTIONS:
+        n = (cell[0] + dx, cell[1] + dy)
+        if self.model.grid.in_bounds(n) and self.room[n] != self.room[cell]:
+          edge = (cell, n) if outgoing else (n, goal)
+          extra.setdefault(int(self.room[edge[0]]), []).append(edge)
+
+    # Nodos: inicio, meta y celdas portal; 'came' guarda cómo se llegó a
+    # cada uno: ("start",), ("cross", celda) o ("room", celda)
+    best = {}
+    came = {}
+    heap = []
+    tie = 0
+
+    def push(node, cost, how):
+      nonlocal tie
+      if node not in best or cost < best[node]:
+        best[node] = cost
+        came[node] = how
+        tie += 1
+        heapq.heappush(heap, (cost + abs(node[0] - goal[0]) + abs(node[1] - goal[1]), tie, node))
+
+    push(start, 0.0, ("start",))
+    expanded = 0
+    closed = set()
+    while heap:
+      _, _, node = heapq.heappop(heap)
+      if node in closed:
+        continue
+      closed.add(node)
+      expanded += 1
+      if node == goal:
+        return best[goal], self._refine(goal, came, carrying), expanded
+
+      cost = best[node]
+      r = int(self.room[node])
+      if r == rg and node in bwd:
+        push(goal, cost + bwd[node], ("room", node))
+      for p, d in self._portal_hops(r, node, carrying):
+        if p not in closed:
+          push(p, cost + d, ("room", node))
+      for q in self.exits[r].get(node, ()):
+        step = self._step(node, q, carrying)
+        if step is not None:
+          push(q, cost + step, ("cross", node))
+      for (p, q) in extra.get(r, ()):
+        if p != node:
+          dist, _ = self._table(r, node, carrying)
+          if p in dist:
+            push(p, cost + dist[p], ("room", node))
+        else:
+          step = self._step(p, q, carrying)
+          if step is not None:
+            push(q, cost + step, ("cross", node))
+    return None, None, expanded
+
+  # Arma la ruta por celdas a partir de los nodos del grafo de cuartos
+  def _refine(self, goal, came, carrying):
+    hops = []
+    node = goal
+    while came[node][0] != "start":
+      hops.append((came[node], node))
+      node = came[node][1]
+    hops.reverse()
+
+    path = []
+    for (kind, src), node in hops:
+      if kind == "cross":
+        path.append(node)
+        continue
+      _, link = self._table(int(self.room[src]), src, carrying)
+      segment = []
+      cell = node
+      while cell != src:
+        segment.append(cell)
+        cell = link[cell]
+      path.extend(reversed(segment))
+    return path
@@ -0,0 +1,87 @@
+# Tabla de transposición acotada indexada por el hash de Zobrist del estado
+# (TacoRescueModel.state_hash o zobrist.state_hash de una partida guardada).
+#
+# Sirve para planificadores (valor de un estado ya evaluado), cachés de
+# resultados y para descartar estados repetidos al reproducir partidas. La
+# memoria es fija: 'capacity' entradas en cubetas de dos lugares:
+#   - el primero prefiere profundidad: solo se reemplaza por una entrada de
+#     igual o mayor profundidad, o si la que tiene es de una generación vieja
+#   - el segundo siempre se reemplaza
+# Así los resultados caros sobreviven a los baratos sin que la tabla se
+# llene de entradas que ya no sirven. new_generation() marca como viejas
+# todas las entradas actuales (p. ej. al empezar otra búsqueda).
+EMPTY = None
+
+
+class TranspositionTable:
+  def __init__(self, capacity=1 << 16):
+    if capacity < 2:
+      raise ValueError(f"capacity debe ser al menos 2: {capacity!r}")
+    # Número de cubetas: potencia de dos para indexar con una máscara
+    buckets = 1
+    while buckets * 2 <= capacity // 2:
+      buckets *= 2
+    self._mask = buckets - 1
+    self.capacity = 2 * buckets
+    self.generation = 0
+    self.hits = 0
+    self.misses = 0
+    self.clear()
+
+  # Vacía la tabla (las estadísticas se conservan)
+  def clear(self):
+    self._keys = [EMPTY] * self.capacity
+    self._values = [None] * self.capacity
+    self._depths = [0] * self.capacity
+    self._generations = [0] * self.capacity
+    self._used = 0
+
+  def __len__(self):
+    return self._used
+
+  def new_generation(self):
+    self.generation += 1
+
+  # Método que regresa el valor guardado para 'key' o 'default'
+  def get(self, key, default=None):
+    i = (key & self._mask) * 2
+    for j in (i, i + 1):
+      if self._keys[j] == key:
+        self.hits += 1
+        return self._values[j]
+    self.misses += 1
+    return default
+
+  def __contains__(self, key):
+    i = (key & self._mask) * 2
+    return self._keys[i] == key or self._keys[i + 1] == key
+
+  # Método que guarda 'value' para 'key' con la profundidad (o costo) con la
+  # que se calculó
+  def store(self, key, value, depth=0):
+    i = (key & self._mask) * 2
+    keys = self._keys
+    if keys[i + 1] == key and keys[i] != key:
+      # Ya estaba en el lugar de siempre-reemplazar: se actualiza ahí salvo
+      # que ahora merezca el de profundidad
+      if self._keeps(i, key, depth):
+        self._put(i + 1, EMPTY, None, 0)
+        self._put(i, key, value, depth)
+      else:
+        self._put(i + 1, key, value, depth)
+    elif self._keeps(i, key, depth):
+      self._put(i, key, value, depth)
+    else:
+      self._put(i + 1, key, value, depth)
+
+  # Si la entrada nueva puede ocupar el lugar de profundidad de la cubeta i
+  def _keeps(self, i, key, depth):
+    return (self._keys[i] is EMPTY or self._keys[i] == key
+            or self._generations[i] != self.generation or depth >= self._depths[i])
+
+  def _put(self, j, key, value, depth):
+    self._used += (key is not EMPTY) - (self._keys[j] is not EMPTY)
+    self._keys[j] = key
+    self._values[j] = value
+    self._depths[j] = depth
+    self._generations[j] = self.generation
@@ -0,0 +1,195 @@
+# Búsqueda de los pesos de la política estratégica (tacosim.weights) con
+# partidas sembradas.
+#
+# tune() busca entre configuraciones de SPACE con partidas sembradas en un
+# ProcessPoolExecutor y halving sucesivo: en cada ronda todas las
+# configuraciones vivas juegan las mismas semillas, se quedan las mejores
+# 1/eta según el puntaje medio y las que siguen juegan eta veces más
+# partidas. El presupuesto es de segundos de CPU sumados entre los procesos;
+# al agotarse se reporta la mejor de las vivas sobre las semillas que todas
+# jugaron. Las configuraciones repetidas se quitan antes de jugar, y SPACE
+# solo tiene pesos que cambian las partidas, así que sus 5 x 3 x 2 = 30
+# combinaciones son distintas entre sí. Desde la terminal:
+#   python -m tacosim.tuning --configs 16 --games 2 --workers 4 --budget 600
+import argparse
+import itertools
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .weights import DEFAULT_WEIGHTS, Weights, make_weights
+
+# Valores que prueba tune() por peso
+SPACE = {
+  "wall": (2, 3, 4, 6, 8),
+  "door": (0, 1, 2),
+  "poi_first": (True, False),
+}
+
+# Puntaje de una partida: peso de cada resultado
+OBJECTIVE = {"rescued": 1.0, "lost": -1.0, "damage": -0.1}
+
+# Pasos máximos por partida
+MAX_STEPS = 1000
+
+
+# Función que calcula el puntaje de una partida ({"rescued", "lost", "damage"})
+def score(outcome, objective=None):
+  objective = OBJECTIVE if objective is None else objective
+  return sum(w * outcome[name] for name, w in objective.items())
+
+
+# Función que juega una partida estratégica con 'weights'; regresa (resultado,
+# segundos de CPU). Corre en los procesos del pool
+def play(weights, seed, max_steps=MAX_STEPS, model_kw=None):
+  from .model import TacoRescueModel
+  t0 = time.process_time()
+  model = TacoRescueModel(seed=seed, policy="strategic", weights=weights, **(model_kw or {}))
+  # Como model.step sin recolectar datos
+  while not model.end_game() and model.steps < max_steps:
+    model.steps += 1
+    model.play_turn()
+  outcome = {
+    "rescued": model.rescued_count,
+    "lost": model.lost_victims,
+    "damage": model.damage,
+    "won": model.rescued_count >= 7,
+    "steps": model.steps,
+  }
+  return outcome, time.process_time() - t0
+
+
+# Función que regresa las configuraciones a probar: DEFAULT_WEIGHTS y
+# 'count' - 1 más al azar de SPACE (todas si count es None)
+def sample_configs(count=None, seed=0):
+  grid = [Weights(*values) for values in itertools.product(*(SPACE[f] for f in Weights._fields))]
+  grid.remove(DEFAULT_WEIGHTS)
+  if count is not None:
+    grid = random.Random(seed).sample(grid, min(count - 1, len(grid)))
+  return [DEFAULT_WEIGHTS] + grid
+
+
+# Función que busca los mejores pesos con halving sucesivo
+#   configs   lista de Weights o dicts (o el número a muestrear con
+#             sample_configs); las repetidas se juegan una sola vez
+#   games     partidas por configuración en la primera ronda
+#   eta       fracción que se descarta por ronda (se queda 1/eta)
+#   budget    segundos de CPU en total (None = sin límite)
+# Regresa un dict con la mejor configuración, sus resultados medios, el
+# historial de rondas y el costo
+def tune(configs=16, games=2, eta=2, workers=1, budget=None, seed=0, max_steps=MAX_STEPS,
+         objective=None, model_kw=None):
+  if eta < 2:
+    raise ValueError(f"eta debe ser al menos 2: {eta!r}")
+  if isinstance(configs, int):
+    configs = sample_configs(configs, seed)
+  # Sin repetidas (conserva el primer orden): dos copias solo gastarían
+  # partidas y el desempate entre ellas sería ruido de las semillas
+  configs = list(dict.fromkeys(make_weights(c) for c in configs))
+  rng = random.Random(seed)
+  seeds = []
+  results = {c: {} for c in configs}
+  alive = list(configs)
+  rungs = []
+  cpu = 0.0
+  start = time.perf_counter()
+  pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+  exhausted = False
+  try:
+    while True:
+      # Todas las vivas juegan las mismas semillas (números aleatorios comunes)
+      while len(seeds) < games:
+        seeds.append(rng.getrandbits(32))
+      tasks = [(c, s) for s in seeds[:games] for c in alive if s not in results[c]]
+      if pool is None:
+        outputs = (play(c, s, max_steps, model_kw) for c, s in tasks)
+      else:
+        outputs = pool.map(play, *zip(*tasks), itertools.repeat(max_steps), itertools.repeat(model_kw))
+      for (c, s), (outcome, seconds) in zip(tasks, outputs):
+        results[c][s] = outcome
+        cpu += seconds
+        if budget is not None and cpu >= budget:
+          exhausted = True
+          break
+
+      ranking, common = _rank(alive, results, seeds, objective)
+      rungs.append({"configs": len(alive), "games": games,
+                    "best": ranking[0] if ranking else None, "cpu_seconds": cpu})
+      if exhausted or len(alive) == 1:
+        break
+      alive = ranking[:max(1, len(alive) // eta)]
+      games *= eta
+  finally:
+    if pool is not None:
+      pool.shutdown(cancel_futures=True)
+
+  result = {"best": None, "score": None, "games": 0, "baseline": None}
+  if ranking:
+    best = ranking[0]
+    outcomes = [results[best][s] for s in common]
+    result.update(best=best, games=len(common),
+                  score=sum(score(o, objective) for o in outcomes) / len(outcomes))
+    for name in ("rescued", "lost", "damage", "won"):
+      result[name] = sum(o[name] for o in outcomes) / len(outcomes)
+    # Comparación con los pesos de siempre en las semillas que jugaron ambos
+    default = results.get(DEFAULT_WEIGHTS, {})
+    shared = [s for s in common if s in default]
+    if shared:
+      result["baseline"] = {
+        "games": len(shared),
+        "best": sum(score(results[best][s], objective) for s in shared) / len(shared),
+        "default": sum(score(default[s], objective) for s in shared) / len(shared),
+      }
+  result.update(rungs=rungs, budget_exhausted=exhausted, cpu_seconds=cpu,
+                elapsed=time.perf_counter() - start)
+  return result
+
+
+# Ordena las configuraciones vivas por puntaje medio sobre las semillas que
+# todas jugaron (empates: el orden original). Si el presupuesto cortó la
+# primera ronda antes de eso, compara las que jugaron la primera semilla.
+# Regresa (configuraciones, semillas comparadas)
+def _rank(alive, results, seeds, objective):
+  played = 0
+  while played < len(seeds) and all(seeds[played] in results[c] for c in alive):
+    played += 1
+  if played == 0:
+    alive = [c for c in alive if seeds and seeds[0] in results[c]]
+    played = 1
+  common = seeds[:played]
+  mean = {c: sum(score(results[c][s], objective) for s in common) / len(common) for c in alive}
+  return sorted(alive, key=lambda c: -mean[c]), common
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(description="Busca los pesos de la política estratégica")
+  parser.add_argument("--configs", type=int, default=16, help="configuraciones a probar (incluye la de siempre)")
+  parser.add_argument("--games", type=int, default=2, help="partidas por configuración en la primera ronda")
+  parser.add_argument("--eta", type=int, default=2, help="se queda 1/eta de las configuraciones por ronda")
+  parser.add_argument("--workers", type=int, default=1, help="procesos del pool")
+  parser.add_argument("--budget", type=float, default=None, help="segundos de CPU en total")
+  parser.add_argument("--seed", type=int, default=0)
+  parser.add_argument("--max-steps", type=int, default=MAX_STEPS)
+  args = parser.parse_args(argv)
+
+  result = tune(args.configs, args.games, args.eta, args.workers, args.budget, args.seed, args.max_steps)
+  if result["best"] is None:
+    print("El presupuesto de CPU no alcanzó para ninguna partida")
+    return
+  for i, rung in enumerate(result["rungs"]):
+    print(f"Ronda {i}: {rung['configs']} configuraciones x {rung['games']} partidas "
+          f"(CPU {rung['cpu_seconds']:.1f}s) -> {rung['best']}")
+  print(f"Mejor: {result['best']}")
+  print(f"Puntaje {result['score']:.2f} en {result['games']} partidas")
+  baseline = result["baseline"]
+  if baseline is not None and result["best"] != DEFAULT_WEIGHTS:
+    print(f"Contra los pesos de siempre en {baseline['games']} partidas: "
+          f"{baseline['best']:.2f} vs {baseline['default']:.2f}")
+  print(f"Rescatadas: {result['rescued']:.2f} | Perdidas: {result['lost']:.2f} | "
+        f"Daño: {result['damage']:.2f} | Ganadas: {result['won']:.0%}")
+  if result["budget_exhausted"]:
+    print("Se agotó el presupuesto de CPU")
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,32 @@
+# Pesos de planeación de la política estratégica (TacoRescueModel(weights=...)).
+#
+#   wall       AP extra que planea pagar para cruzar una pared (A*, landmarks,
+#              cuartos y kernels)
+#   door       AP extra de cruzar una puerta cerrada
+#   poi_first  True: busca POIs y, si no hay, fuego; False: al revés
+# No hay peso para la acción al llegar a un fuego: nearest_fire suma la
+# misma constante a todos los candidatos, así que no cambia cuál elige.
+# El modelo acepta un Weights o un dict con los que cambian; DEFAULT_WEIGHTS
+# reproduce las partidas de siempre. Las reglas del juego (lo que cuesta de
+# verdad romper una pared) no cambian. tacosim.tuning busca los mejores.
+from collections import namedtuple
+
+Weights = namedtuple("Weights", ["wall", "door", "poi_first"])
+DEFAULT_WEIGHTS = Weights(wall=4, door=1, poi_first=True)
+
+
+# Función que valida y completa los pesos del modelo: None, un Weights o un
+# dict con los que cambian respecto a DEFAULT_WEIGHTS
+def make_weights(weights=None):
+  if weights is None:
+    return DEFAULT_WEIGHTS
+  if not isinstance(weights, Weights):
+    unknown = set(weights) - set(Weights._fields)
+    if unknown:
+      raise ValueError(f"Pesos desconocidos: {', '.join(sorted(unknown))} "
+                       f"(opciones: {', '.join(Weights._fields)})")
+    weights = DEFAULT_WEIGHTS._replace(**weights)
+  for name in ("wall", "door"):
+    if getattr(weights, name) < 0:
+      raise ValueError(f"El peso {name} no puede ser negativo: {getattr(weights, name)!r}")
+  return weights
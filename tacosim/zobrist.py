@@ -0,0 +1,100 @@
+# Hash de Zobrist del estado completo de una partida.
+#
+# El estado es el mismo vector que guarda tacosim.gamelog (StateLayout):
+# fuego, POIs, paredes, daño de paredes, puertas, filas de los agentes
+# (x, y, AP, carga) y contadores. Cada posición i del vector con valor v != 0
+# aporta la llave _key(i, v) y el hash es el XOR de todas, así que cambiar un
+# valor cuesta O(1): se quita la llave vieja y se pone la nueva. Las llaves
+# salen de una función de mezcla (splitmix64) y no de una tabla aleatoria,
+# por lo que dos modelos (o un modelo y una partida reproducida) con el mismo
+# estado dan el mismo hash.
+#
+# TacoRescueModel mantiene model.zobrist al día desde sus mutadores
+# (set_fire, set_poi, set_wall, add_wall_damage, walls_changed, los
+# contadores) y model.grid avisa de los cambios de los agentes.
+import numpy as np
+
+from .gamelog import AGENT_FIELDS, COUNTERS, StateLayout
+from .firefront import DIRECTIONS
+from .maps import WALL_INDEX
+
+MASK = (1 << 64) - 1
+
+
+# Función de mezcla splitmix64 sobre enteros de Python
+def _mix(z):
+  z = (z + 0x9E3779B97F4A7C15) & MASK
+  z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK
+  z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK
+  return z ^ (z >> 31)
+
+
+# La misma mezcla sobre un arreglo uint64 (las multiplicaciones dan la vuelta
+# módulo 2^64)
+def _mix_array(z):
+  z = z + np.uint64(0x9E3779B97F4A7C15)
+  z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+  z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+  return z ^ (z >> np.uint64(31))
+
+
+# Llave de la posición 'index' del vector de estado con valor 'value' (los
+# valores se guardan como int16; el 0 no aporta)
+def _key(index, value):
+  value = int(value) & 0xFFFF
+  if value == 0:
+    return 0
+  return _mix((index << 16) | value)
+
+
+# Función que calcula el hash de un vector de estado (StateLayout.capture o
+# un registro de una partida guardada)
+def state_hash(vec):
+  values = np.asarray(vec).astype(np.uint16).astype(np.uint64)
+  index = np.arange(len(values), dtype=np.uint64)
+  keys = _mix_array((index << np.uint64(16)) | values)
+  keys[values == 0] = 0
+  return int(np.bitwise_xor.reduce(keys)) if len(keys) else 0
+
+
+class ZobristHash:
+  def __init__(self, model):
+    self.model = model
+    self.layout = StateLayout.for_model(model)
+    self._start = {name: sl.start for name, sl in self.layout.slices.items()}
+    self._counter = {name: self._start["counters"] + i for i, name in enumerate(COUNTERS)}
+    self.rebuild()
+
+  # Recalcula el hash desde cero (después de escribir los arreglos sin pasar
+  # por los mutadores del modelo)
+  def rebuild(self):
+    self.value = state_hash(self.layout.capture(self.model))
+
+  def _flip(self, index, old, new):
+    self.value ^= _key(index, old) ^ _key(index, new)
+
+  def fire_changed(self, x, y, old, new):
+    self._flip(self._start["fire"] + x * self.layout.height + y, old, new)
+
+  def poi_changed(self, x, y, old, new):
+    self._flip(self._start["poi"] + x * self.layout.height + y, old, new)
+
+  def wall_changed(self, x, y, side, old, new):
+    self._flip(self._start["walls"] + (y * self.layout.width + x) * 4 + side, old, new)
+
+  def damage_changed(self, x, y, side, old, new):
+    self._flip(self._start["walls_damage"] + (x * self.layout.height + y) * 4 + side, old, new)
+
+  # La puerta de (x, y) en la dirección DIRECTIONS[d] desapareció
+  def door_removed(self, x, y, d):
+    side = WALL_INDEX[DIRECTIONS[d]]
+    self._flip(self._start["doors"] + (y * self.layout.width + x) * 4 + side, 1, 0)
+
+  # Cambió la columna 'field' (ver gamelog.AGENT_FIELDS) del agente en la
+  # fila 'slot'
+  def agent_changed(self, slot, field, old, new):
+    index = self._start["agents"] + slot * len(AGENT_FIELDS) + AGENT_FIELDS.index(field)
+    self._flip(index, old, new)
+
+  def counter_changed(self, name, old, new):
+    self._flip(self._counter[name], old, new)